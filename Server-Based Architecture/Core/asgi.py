@@ -13,4 +13,9 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Core.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported once Django is set up; serves the Server-Sent Events stream without a thread per client
+from Scanner.events import EventStreamApplication  # noqa: E402
+
+application = EventStreamApplication(django_application)
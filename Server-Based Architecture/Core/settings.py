@@ -209,6 +209,25 @@ STATICFILES_FINDERS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Inverted index over stored jobs, rebuilt by `manage.py build_job_index`
+JOB_INDEX_PATH = os.getenv('JOB_INDEX_PATH', os.path.join(BASE_DIR, 'job_index.bin'))
+
+# Background task queue for resume extraction, drained by `manage.py run_task_worker`.
+# Uploads are turned away while TASK_QUEUE_MAX_DEPTH tasks are waiting (0 = unbounded);
+# workers renew the lease of their running tasks every quarter of TASK_LEASE_SECONDS, so a
+# task whose lease was not renewed for that long is assumed lost (its worker died) and retried.
+TASK_WORKER_CONCURRENCY = int(os.getenv('TASK_WORKER_CONCURRENCY', '2'))
+TASK_QUEUE_MAX_DEPTH = int(os.getenv('TASK_QUEUE_MAX_DEPTH', '200'))
+TASK_POLL_SECONDS = float(os.getenv('TASK_POLL_SECONDS', '1'))
+TASK_LEASE_SECONDS = int(os.getenv('TASK_LEASE_SECONDS', '300'))
+TASK_MAX_ATTEMPTS = int(os.getenv('TASK_MAX_ATTEMPTS', '3'))
+
+# Server-Sent Events for pipeline progress (Scanner/events.py). One poller per
+# process reads every watched resume each EVENTS_POLL_SECONDS.
+EVENTS_POLL_SECONDS = float(os.getenv('EVENTS_POLL_SECONDS', '1'))
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv('EVENTS_HEARTBEAT_SECONDS', '15'))
+EVENTS_RETRY_MS = int(os.getenv('EVENTS_RETRY_MS', '3000'))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
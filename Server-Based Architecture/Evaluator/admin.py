@@ -1,3 +1,7 @@
 from django.contrib import admin
+from .models import Job, JobSearchCache, ResumeJob
 # Register your models here.
 
+admin.site.register(JobSearchCache)
+admin.site.register(Job)
+admin.site.register(ResumeJob)
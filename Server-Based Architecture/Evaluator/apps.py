@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class EvaluatorConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'Evaluator'
+
+    def ready(self):
+        # Map the job index when the worker starts, not on the first search
+        from Evaluator.utils.job_index import get_job_index
+        get_job_index()
@@ -0,0 +1,32 @@
+from django.db import models
+from django.db.models.fields.json import KeyTransform
+
+from Evaluator.utils import json_codec
+
+
+class FastJSONField(models.JSONField):
+    """
+    JSONField that encodes and decodes through Evaluator.utils.json_codec, so
+    reads and writes use orjson when it is installed. The stored JSON and every
+    lookup behave exactly as with models.JSONField.
+    """
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        # SQLite returns key transforms of non-string values already converted
+        if isinstance(expression, KeyTransform) and not isinstance(value, str):
+            return value
+        try:
+            return json_codec.loads(value)
+        except json_codec.JSONDecodeError:
+            return value
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if not prepared:
+            value = self.get_prep_value(value)
+        if connection.vendor == "postgresql":
+            from django.db.backends.postgresql.psycopg_any import Jsonb
+
+            return Jsonb(value, dumps=json_codec.dumps)
+        return json_codec.dumps(value)
@@ -0,0 +1,39 @@
+# Evaluator/management/commands/build_job_index.py
+
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from Evaluator.models import Job
+from Evaluator.utils.job_index import JobIndex, get_job_index_path
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the on-disk job search index from the Job table. Workers map the new file '
+        'on their next search. Meant to run from cron after warm_job_cache, e.g. '
+        'python manage.py build_job_index'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=None,
+            help='Where to write the index (default: settings.JOB_INDEX_PATH)'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path'] or get_job_index_path()
+        start = time.perf_counter()
+
+        jobs = Job.objects.only(*Job.QUALIFICATION_FIELDS, 'location', 'is_remote').iterator(chunk_size=500)
+        index = JobIndex.build(jobs, path)
+        index.save()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Indexed {Job.objects.count()} jobs into {path} '
+                f'({os.path.getsize(path) / 1024:.0f} KB) in {time.perf_counter() - start:.1f}s'
+            )
+        )
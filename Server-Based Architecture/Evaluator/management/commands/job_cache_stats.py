@@ -0,0 +1,39 @@
+# Evaluator/management/commands/job_cache_stats.py
+
+from django.core.management.base import BaseCommand
+from Evaluator.models import JobSearchCache
+
+
+class Command(BaseCommand):
+    help = 'Report hit rate and saved RapidAPI calls for the shared job search cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=10,
+            help='Also list the N most requested queries (default: 10)'
+        )
+
+    def handle(self, *args, **options):
+        stats = JobSearchCache.objects.stats()
+
+        self.stdout.write(f"Cached queries:   {stats['entries']}")
+        self.stdout.write(f"Fresh hits:       {stats['hits']}")
+        self.stdout.write(f"Stale hits:       {stats['stale_hits']}")
+        self.stdout.write(f"RapidAPI fetches: {stats['api_fetches']}")
+
+        top = options['top']
+        if top:
+            entries = JobSearchCache.objects.order_by('-hit_count', '-stale_hit_count')[:top]
+            for entry in entries:
+                self.stdout.write(
+                    f"  {entry.hit_count + entry.stale_hit_count:>6} hits  "
+                    f"{entry.fetch_count:>4} fetches  {entry} [{entry.state()}]"
+                )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Hit rate {stats['hit_rate']:.1%}, {stats['api_calls_saved']} RapidAPI calls saved"
+            )
+        )
@@ -0,0 +1,117 @@
+# Evaluator/management/commands/warm_job_cache.py
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from django.utils import timezone
+
+from Evaluator.models import JobSearchCache
+from Evaluator.utils.get_jobs import JOB_SEARCH_PAGES, refresh_job_cache
+from Scanner.models import Resume
+
+
+class Command(BaseCommand):
+    help = (
+        'Refresh the job cache for the most popular (career field, experience level, location) '
+        'combinations before users ask for them. Meant to run from cron, e.g. every 30 minutes: '
+        'python manage.py warm_job_cache --api-calls 100'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--api-calls',
+            type=int,
+            default=50,
+            help=f'RapidAPI quota to spend on this run; each query costs {JOB_SEARCH_PAGES} calls (default: 50)'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=25,
+            help='Consider at most this many of the most popular queries (default: 25)'
+        )
+        parser.add_argument(
+            '--min-resumes',
+            type=int,
+            default=2,
+            help='Only warm queries shared by at least this many resumes (default: 2)'
+        )
+        parser.add_argument(
+            '--refresh-within',
+            type=int,
+            default=60,
+            help='Refresh entries that stop being fresh within this many minutes (default: 60)'
+        )
+
+    def popular_queries(self, limit, min_resumes):
+        """Resume search settings grouped by normalized query, most common first"""
+        rows = (
+            Resume.objects
+            .values('career_field', 'experience_level', 'preferred_location')
+            .annotate(resumes=Count('id'))
+        )
+        queries = {}
+        for row in rows:
+            if not row['career_field'] or not row['experience_level']:
+                continue
+            key = JobSearchCache.objects.query_hash(
+                row['career_field'], row['experience_level'], row['preferred_location']
+            )
+            query = queries.setdefault(key, {**row, 'resumes': 0})
+            query['resumes'] += row['resumes']
+
+        popular = [q for q in queries.values() if q['resumes'] >= min_resumes]
+        popular.sort(key=lambda q: q['resumes'], reverse=True)
+        return popular[:limit]
+
+    def handle(self, *args, **options):
+        budget = options['api_calls']
+        refresh_before = timezone.now() + timedelta(minutes=options['refresh_within']) - JobSearchCache.FRESH_FOR
+        warmed = skipped = 0
+        empty_in_a_row = 0
+
+        for query in self.popular_queries(options['limit'], options['min_resumes']):
+            label = f"{query['experience_level']} {query['career_field']} in {query['preferred_location']}"
+            entry = JobSearchCache.objects.get_entry(
+                query['career_field'], query['experience_level'], query['preferred_location']
+            )
+            if entry and entry.fetched_at > refresh_before:
+                skipped += 1
+                continue
+            if budget < JOB_SEARCH_PAGES:
+                self.stdout.write(self.style.WARNING(f'API budget exhausted before: {label}'))
+                break
+            if entry is None:
+                entry, claimed = JobSearchCache.objects.claim_new_entry(
+                    query['career_field'], query['experience_level'], query['preferred_location']
+                )
+            else:
+                claimed = JobSearchCache.objects.claim_refresh(entry)
+            if not claimed:
+                skipped += 1  # a page view is already refreshing it
+                continue
+
+            budget -= JOB_SEARCH_PAGES
+            jobs = refresh_job_cache(
+                'warm-up', query['career_field'], query['experience_level'], query['preferred_location'], entry
+            )
+            self.stdout.write(f"  {query['resumes']:>5} resumes  {len(jobs):>3} jobs  {label}")
+
+            if jobs:
+                warmed += 1
+                empty_in_a_row = 0
+            else:
+                # Repeated empty answers usually mean the RapidAPI quota is used up;
+                # pages keep serving the last snapshot, so stop spending calls
+                empty_in_a_row += 1
+                if empty_in_a_row >= 2:
+                    self.stdout.write(self.style.WARNING('RapidAPI returned no jobs twice in a row, stopping'))
+                    break
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Warmed {warmed} queries, {skipped} already fresh or in progress, '
+                f'{options["api_calls"] - budget} API calls used'
+            )
+        )
@@ -0,0 +1,363 @@
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.db import models, transaction
+from django.db.models import F, Q, Sum
+from django.utils import timezone
+
+from Evaluator.fields import FastJSONField
+from Evaluator.utils.job_payload import iter_packed_jobs, pack_jobs
+
+logger = logging.getLogger(__name__)
+
+
+class JobSearchCacheManager(models.Manager):
+    """Manager for job search results shared across users with the same query"""
+
+    DEFAULT_LOCATION = "United States"
+
+    def normalize_query(self, career_field, experience_level, location):
+        """Lower-case, trim and collapse whitespace so equivalent queries share an entry"""
+        def clean(value):
+            return " ".join(str(value or "").lower().split())
+        return clean(career_field), clean(experience_level), clean(location) or clean(self.DEFAULT_LOCATION)
+
+    def query_hash(self, career_field, experience_level, location):
+        normalized = self.normalize_query(career_field, experience_level, location)
+        return hashlib.sha256("|".join(normalized).encode("utf-8")).hexdigest()
+
+    def get_entry(self, career_field, experience_level, location):
+        """Cached entry for the query whatever its age, or None"""
+        return self.filter(query_hash=self.query_hash(career_field, experience_level, location)).first()
+
+    def store(self, career_field, experience_level, location, jobs, partial=False):
+        """
+        Save API results for a query and release any refresh claim. Partial results
+        (some pages missed the deadline) are dated as already stale, so they are
+        served but refreshed on the next lookup.
+        """
+        fetched_at = timezone.now()
+        if partial:
+            fetched_at -= self.model.FRESH_FOR
+        normalized = self.normalize_query(career_field, experience_level, location)
+        entry, _ = self.update_or_create(
+            query_hash=self.query_hash(career_field, experience_level, location),
+            defaults={
+                "career_field": normalized[0],
+                "experience_level": normalized[1],
+                "location": normalized[2],
+                # Only the keys Job.from_api and the templates read, compressed
+                "jobs_packed": pack_jobs(jobs, Job.API_KEYS),
+                "jobs": [],
+                "fetched_at": fetched_at,
+                "refreshing_since": None,
+            }
+        )
+        self.filter(pk=entry.pk).update(fetch_count=F("fetch_count") + 1)
+        logger.info(f"[JOB CACHE] Stored {len(jobs)} jobs for {entry}")
+        return entry
+
+    def record_hit(self, entry, stale=False):
+        counter = "stale_hit_count" if stale else "hit_count"
+        self.filter(pk=entry.pk).update(**{counter: F(counter) + 1})
+
+    def claim_refresh(self, entry):
+        """
+        Atomically mark a stale entry as being refreshed. Only the caller that gets
+        True should call the API, so a popular stale query triggers one refresh.
+        """
+        lock_expired = timezone.now() - self.model.REFRESH_LOCK
+        return self.filter(pk=entry.pk).filter(
+            Q(refreshing_since__isnull=True) | Q(refreshing_since__lt=lock_expired)
+        ).update(refreshing_since=timezone.now()) == 1
+
+    def claim_new_entry(self, career_field, experience_level, location):
+        """
+        Get or create the entry for a query nobody has cached yet. A new entry is
+        empty, already expired and claimed for refresh, so only the caller that
+        gets (entry, True) calls the API; the others wait for its result.
+        """
+        normalized = self.normalize_query(career_field, experience_level, location)
+        now = timezone.now()
+        return self.get_or_create(
+            query_hash=self.query_hash(career_field, experience_level, location),
+            defaults={
+                "career_field": normalized[0],
+                "experience_level": normalized[1],
+                "location": normalized[2],
+                "fetched_at": now - self.model.FRESH_FOR - self.model.STALE_FOR,
+                "refreshing_since": now,
+            }
+        )
+
+    def release_refresh(self, entry):
+        self.filter(pk=entry.pk).update(refreshing_since=None)
+
+    def stats(self):
+        """Hit rate and API calls saved across all cached queries"""
+        totals = self.aggregate(
+            hits=Sum("hit_count"),
+            stale_hits=Sum("stale_hit_count"),
+            fetches=Sum("fetch_count"),
+        )
+        hits = totals["hits"] or 0
+        stale_hits = totals["stale_hits"] or 0
+        fetches = totals["fetches"] or 0
+        lookups = hits + stale_hits + fetches
+        return {
+            "entries": self.count(),
+            "hits": hits,
+            "stale_hits": stale_hits,
+            "api_fetches": fetches,
+            "api_calls_saved": hits + stale_hits,
+            "hit_rate": (hits + stale_hits) / lookups if lookups else 0.0,
+        }
+
+
+class JobSearchCache(models.Model):
+    """
+    JSearch results for one normalized (career field, experience level, location) query.
+
+    Entries younger than FRESH_FOR are served as-is. Up to FRESH_FOR + STALE_FOR they
+    are still served while a single background refresh runs (stale-while-revalidate);
+    after that one lookup fetches synchronously and the others are served the
+    expired snapshot meanwhile.
+    """
+    FRESH_FOR = timedelta(hours=6)
+    STALE_FOR = timedelta(hours=24)
+    REFRESH_LOCK = timedelta(minutes=2)
+
+    query_hash = models.CharField(max_length=64, unique=True)
+    career_field = models.CharField(max_length=100)
+    experience_level = models.CharField(max_length=100)
+    location = models.CharField(max_length=100)
+    # Rows written before jobs_packed existed keep their raw payload here
+    jobs = FastJSONField(default=list)
+    jobs_packed = models.BinaryField(null=True, blank=True)
+    fetched_at = models.DateTimeField()
+    refreshing_since = models.DateTimeField(null=True, blank=True)
+    hit_count = models.PositiveIntegerField(default=0)
+    stale_hit_count = models.PositiveIntegerField(default=0)
+    fetch_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = JobSearchCacheManager()
+
+    def __str__(self):
+        return f"{self.experience_level} {self.career_field} in {self.location}"
+
+    def iter_jobs(self):
+        """Cached jobs decoded one at a time"""
+        if self.jobs_packed:
+            return iter_packed_jobs(self.jobs_packed)
+        return iter(self.jobs or [])
+
+    def get_jobs(self):
+        return list(self.iter_jobs())
+
+    def state(self):
+        """'fresh', 'stale' (serve and refresh) or 'expired' (refetch before serving)"""
+        age = timezone.now() - self.fetched_at
+        if age < self.FRESH_FOR:
+            return "fresh"
+        if age < self.FRESH_FOR + self.STALE_FOR:
+            return "stale"
+        return "expired"
+
+
+class JobManager(models.Manager):
+    """Manager for job postings shared by every resume that matched them"""
+
+    def upsert_from_api(self, jobs):
+        """
+        Insert or update JSearch job dicts keyed by provider job id, in one
+        statement. Returns the Job rows in the order given; entries without a
+        job_id are skipped.
+        """
+        rows = {}
+        for job in jobs or []:
+            if isinstance(job, dict) and job.get("job_id"):
+                rows.setdefault(str(job["job_id"]), self.model.from_api(job))
+        if not rows:
+            return []
+
+        self.bulk_create(
+            list(rows.values()),
+            update_conflicts=True,
+            unique_fields=["provider_job_id"],
+            update_fields=self.model.UPDATE_FIELDS,
+        )
+        stored = self.in_bulk(list(rows), field_name="provider_job_id")
+        stored = [stored[job_id] for job_id in rows if job_id in stored]
+
+        # Keep this worker's search index in step with the table
+        from Evaluator.utils.job_index import get_job_index
+        get_job_index().add_jobs(stored)
+        return stored
+
+    def for_resume(self, resume):
+        """Jobs linked to a resume, best match first"""
+        return self.filter(resume_links__resume=resume).order_by("resume_links__rank")
+
+
+class Job(models.Model):
+    """
+    One job posting from JSearch, stored once however many resumes matched it.
+
+    The columns used for filtering and listing are indexed; fields that are only
+    displayed live in `details`. to_api_dict() rebuilds the JSearch-shaped dict
+    the templates and the analyzer already understand.
+    """
+    # JSearch keys kept in `details`; the rest of the raw payload is dropped
+    DETAIL_KEYS = (
+        "employer_logo", "employer_website", "job_publisher", "job_employment_type",
+        "job_apply_link", "apply_options", "job_google_link", "job_posted_at",
+        "job_salary_period", "job_benefits", "job_country",
+    )
+    # Every JSearch key from_api reads; the cache stores nothing else
+    API_KEYS = (
+        "job_id", "job_title", "employer_name", "job_location", "job_city", "job_state",
+        "job_is_remote", "job_posted_at_timestamp", "job_posted_at_datetime_utc",
+        "job_min_salary", "job_max_salary", "job_description", "job_highlights",
+    ) + DETAIL_KEYS
+    # Columns extract_job_qualifications reads
+    QUALIFICATION_FIELDS = ("provider_job_id", "title", "description", "highlights")
+    UPDATE_FIELDS = [
+        "title", "employer_name", "location", "is_remote", "posted_at",
+        "min_salary", "max_salary", "description", "highlights", "details", "updated_at",
+    ]
+
+    provider_job_id = models.CharField(max_length=255, unique=True)
+    title = models.CharField(max_length=255, db_index=True)
+    employer_name = models.CharField(max_length=255, blank=True, db_index=True)
+    location = models.CharField(max_length=255, blank=True, db_index=True)
+    is_remote = models.BooleanField(default=False, db_index=True)
+    posted_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    min_salary = models.FloatField(null=True, blank=True, db_index=True)
+    max_salary = models.FloatField(null=True, blank=True, db_index=True)
+    description = models.TextField(blank=True)
+    highlights = FastJSONField(default=dict, blank=True)
+    details = FastJSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = JobManager()
+
+    def __str__(self):
+        return f"{self.title} at {self.employer_name or 'unknown employer'}"
+
+    @staticmethod
+    def _posted_at(job):
+        timestamp = job.get("job_posted_at_timestamp")
+        if timestamp:
+            try:
+                return datetime.fromtimestamp(int(timestamp), tz=dt_timezone.utc)
+            except (TypeError, ValueError, OverflowError):
+                pass
+        value = job.get("job_posted_at_datetime_utc")
+        if value:
+            try:
+                return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+            except ValueError:
+                pass
+        return None
+
+    @staticmethod
+    def _salary(value):
+        try:
+            return float(value) if value not in (None, "") else None
+        except (TypeError, ValueError):
+            return None
+
+    @classmethod
+    def from_api(cls, job):
+        """Unsaved Job built from one JSearch job dict"""
+        location = job.get("job_location") or ", ".join(
+            part for part in (job.get("job_city"), job.get("job_state")) if part
+        )
+        highlights = job.get("job_highlights")
+        return cls(
+            provider_job_id=str(job["job_id"]),
+            title=(job.get("job_title") or "Untitled Position")[:255],
+            employer_name=(job.get("employer_name") or "")[:255],
+            location=(location or job.get("job_country") or "")[:255],
+            is_remote=bool(job.get("job_is_remote")),
+            posted_at=cls._posted_at(job),
+            min_salary=cls._salary(job.get("job_min_salary")),
+            max_salary=cls._salary(job.get("job_max_salary")),
+            description=job.get("job_description") or "",
+            highlights=highlights if isinstance(highlights, dict) else {},
+            details={key: job[key] for key in cls.DETAIL_KEYS if job.get(key) not in (None, "", [])},
+        )
+
+    def to_api_dict(self):
+        """
+        JSearch-shaped dict for templates and the analyzer. Columns deferred with
+        only()/defer() are left out instead of being loaded one query at a time.
+        """
+        deferred = self.get_deferred_fields()
+        columns = {
+            "job_title": "title",
+            "employer_name": "employer_name",
+            "job_location": "location",
+            "job_is_remote": "is_remote",
+            "job_min_salary": "min_salary",
+            "job_max_salary": "max_salary",
+            "job_description": "description",
+            "job_highlights": "highlights",
+        }
+        data = {} if "details" in deferred else dict(self.details or {})
+        data["job_id"] = self.provider_job_id
+        for key, field in columns.items():
+            if field not in deferred:
+                data[key] = getattr(self, field)
+        if "posted_at" not in deferred and self.posted_at:
+            data["job_posted_at_datetime_utc"] = self.posted_at.isoformat()
+        return data
+
+
+class ResumeJobManager(models.Manager):
+    """Manager for the resume-to-job links"""
+
+    def link_jobs(self, resume, jobs):
+        """Replace a resume's matched jobs with the given JSearch job dicts. Returns how many were linked."""
+        with transaction.atomic():
+            stored = Job.objects.upsert_from_api(jobs)
+            return self.link_job_ids(resume, [job.pk for job in stored])
+
+    def link_job_ids(self, resume, job_ids):
+        """Replace a resume's matched jobs with already stored Job ids, best match first"""
+        with transaction.atomic():
+            self.filter(resume=resume).delete()
+            self.bulk_create([
+                self.model(resume=resume, job_id=job_id, rank=rank) for rank, job_id in enumerate(job_ids)
+            ])
+            # Pages rendered from the previous matches are stale now
+            resume.bump_version()
+        logger.info(f"[JOBS] Linked {len(job_ids)} jobs to resume {resume.pk}")
+        return len(job_ids)
+
+
+class ResumeJob(models.Model):
+    """Link between a resume and the jobs matched for it, in match order"""
+    resume = models.ForeignKey("Scanner.Resume", on_delete=models.CASCADE, related_name="job_links")
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="resume_links")
+    rank = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = ResumeJobManager()
+
+    class Meta:
+        ordering = ["rank"]
+        constraints = [
+            models.UniqueConstraint(fields=["resume", "job"], name="unique_resume_job"),
+        ]
+        indexes = [
+            models.Index(fields=["resume", "rank"]),
+        ]
+
+    def __str__(self):
+        return f"Resume id: {self.resume_id} -> job {self.job_id} (#{self.rank})"
@@ -1,3 +1,930 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+import requests
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from Evaluator.models import Job, JobSearchCache, ResumeJob
+from Evaluator.utils import json_codec
+from Evaluator.utils.Process_Data import process_job_data, process_job_recommendation
+from Evaluator.utils.analyzer_with_claude import analyze_resume_against_jobs, extract_job_qualifications
+from Evaluator.utils.get_jobs import JOB_SEARCH_PAGES, MIN_LOCAL_MATCHES, find_local_jobs, get_cached_jobs
+from Evaluator.utils.job_index import JobIndex, get_job_index
+from Evaluator.utils.job_qualifications import cached_description_qualifications, description_qualifications
+from Evaluator.utils.job_records import JobPosting, Recommendation, parse_jobs
+from Evaluator.utils.job_ranking import get_job_matrix, rank_job_rows, rank_jobs
+from Evaluator.utils.qualification_clusters import collapse_qualifications
+from Evaluator.utils.skill_demand import skill_gap, skill_matcher
+from Evaluator.utils.job_search_client import JobSearchClient
+from Scanner.models import Resume
+
+
+class TestJobSearchCache(TestCase):
+    """Tests for the cross-user job search cache"""
+
+    JOBS = [{"job_id": "1", "job_title": "Software Engineer"}]
+
+    def _age(self, entry, delta):
+        JobSearchCache.objects.filter(pk=entry.pk).update(fetched_at=timezone.now() - delta)
+
+    def test_equivalent_queries_share_an_entry(self):
+        JobSearchCache.objects.store("Software Engineering", "Entry", "Boston,  MA", self.JOBS)
+        entry = JobSearchCache.objects.get_entry(" software engineering", "ENTRY", "boston, ma")
+        self.assertIsNotNone(entry)
+        self.assertEqual(JobSearchCache.objects.get_entry("Software Engineering", "Entry", None), None)
+
+    @patch('Evaluator.utils.get_jobs.fetch_job_pages')
+    def test_miss_fetches_then_hits(self, mock_api):
+        mock_api.return_value = (self.JOBS, {"partial": False})
+
+        first = get_cached_jobs(1, "Software Engineering", "Entry", "Boston, MA")
+        second = get_cached_jobs(2, "Software Engineering", "Entry", "Boston, MA")
+
+        self.assertEqual(first, self.JOBS)
+        self.assertEqual(second, self.JOBS)
+        mock_api.assert_called_once()
+        stats = JobSearchCache.objects.stats()
+        self.assertEqual((stats["hits"], stats["api_fetches"], stats["api_calls_saved"]), (1, 1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    @patch('Evaluator.utils.get_jobs._refresh_in_background')
+    @patch('Evaluator.utils.get_jobs.fetch_job_pages')
+    def test_stale_entry_served_while_one_refresh_runs(self, mock_api, mock_refresh):
+        entry = JobSearchCache.objects.store("Data Science", "Senior", "", self.JOBS)
+        self._age(entry, JobSearchCache.FRESH_FOR + timedelta(minutes=1))
+
+        self.assertEqual(get_cached_jobs(1, "Data Science", "Senior", ""), self.JOBS)
+        self.assertEqual(get_cached_jobs(2, "Data Science", "Senior", ""), self.JOBS)
+
+        mock_api.assert_not_called()
+        mock_refresh.assert_called_once()
+        self.assertEqual(JobSearchCache.objects.stats()["stale_hits"], 2)
+
+    @patch('Evaluator.utils.get_jobs.fetch_job_pages')
+    def test_expired_entry_falls_back_when_api_fails(self, mock_api):
+        entry = JobSearchCache.objects.store("Data Science", "Senior", "", self.JOBS)
+        self._age(entry, JobSearchCache.FRESH_FOR + JobSearchCache.STALE_FOR)
+        mock_api.return_value = ([], {"partial": True})
+
+        self.assertEqual(get_cached_jobs(1, "Data Science", "Senior", ""), self.JOBS)
+        mock_api.assert_called_once()
+
+    @patch('Evaluator.utils.get_jobs.fetch_job_pages')
+    def test_concurrent_lookups_of_an_expired_entry_fetch_once(self, mock_api):
+        entry = JobSearchCache.objects.store("Data Science", "Senior", "", self.JOBS)
+        self._age(entry, JobSearchCache.FRESH_FOR + JobSearchCache.STALE_FOR)
+        fresh_jobs = [{"job_id": "2", "job_title": "Data Scientist"}]
+        during_fetch = []
+
+        def fetch(*args):
+            # A second user asks for the same query while the first fetch runs
+            during_fetch.append(get_cached_jobs(2, "Data Science", "Senior", ""))
+            return fresh_jobs, {"partial": False}
+
+        mock_api.side_effect = fetch
+
+        self.assertEqual(get_cached_jobs(1, "Data Science", "Senior", ""), fresh_jobs)
+        self.assertEqual(during_fetch, [self.JOBS])
+        mock_api.assert_called_once()
+        self.assertEqual(get_cached_jobs(3, "Data Science", "Senior", ""), fresh_jobs)
+
+    @patch('Evaluator.utils.get_jobs.fetch_job_pages')
+    def test_concurrent_misses_wait_for_one_fetch(self, mock_api):
+        mock_api.return_value = (self.JOBS, {"partial": False})
+        # The first lookup has created and claimed the entry and is still fetching
+        entry, created = JobSearchCache.objects.claim_new_entry("Data Science", "Senior", "")
+        self.assertTrue(created)
+
+        def finish_fetch(seconds):
+            JobSearchCache.objects.store("Data Science", "Senior", "", self.JOBS)
+
+        with patch('Evaluator.utils.get_jobs.time.sleep', side_effect=finish_fetch):
+            self.assertEqual(get_cached_jobs(2, "Data Science", "Senior", ""), self.JOBS)
+        mock_api.assert_not_called()
+        self.assertEqual(JobSearchCache.objects.count(), 1)
+
+    def test_entries_store_only_read_keys_compressed(self):
+        raw = dict(self.JOBS[0], job_description="Build things " * 200, job_onet_soc="15113200",
+                   job_latitude=42.36, job_required_experience={"no_experience_required": True})
+        entry = JobSearchCache.objects.store("Software Engineering", "Entry", "Boston, MA", [raw] * 20)
+        entry.refresh_from_db()
+
+        self.assertEqual(entry.jobs, [])
+        self.assertLess(len(bytes(entry.jobs_packed)), len(json.dumps([raw] * 20)) // 20)
+        self.assertEqual(entry.get_jobs()[0], {k: raw[k] for k in ("job_id", "job_title", "job_description")})
+        self.assertEqual(next(entry.iter_jobs())["job_id"], "1")
+
+    def test_legacy_uncompressed_entries_are_still_served(self):
+        entry = JobSearchCache.objects.store("Data Science", "Senior", "", [])
+        JobSearchCache.objects.filter(pk=entry.pk).update(jobs=self.JOBS, jobs_packed=None)
+
+        self.assertEqual(get_cached_jobs(1, "Data Science", "Senior", ""), self.JOBS)
+
+
+class TestJobSearchClient(TestCase):
+    """Tests for the pooled JSearch client"""
+
+    def _response(self, status, body, headers=None):
+        response = requests.Response()
+        response.status_code = status
+        response._content = json.dumps(body).encode("utf-8")
+        response.headers.update(headers or {})
+        return response
+
+    def test_retries_and_timeouts_configured(self):
+        client = JobSearchClient(api_key="key", connect_timeout=2, read_timeout=5, max_retries=4)
+
+        # search() retries itself; the adapter must not retry behind its back
+        self.assertEqual(client.session.get_adapter(JobSearchClient.URL).max_retries.total, 0)
+        self.assertEqual(client.max_retries, 4)
+        self.assertEqual(client.timeout, (2, 5))
+
+    @patch('Evaluator.utils.job_search_client.time.sleep')
+    def test_retry_after_is_capped(self, mock_sleep):
+        client = JobSearchClient(api_key="key", max_retry_after=5)
+        responses = [self._response(429, {}, {"Retry-After": "3600"}), self._response(200, {"data": []})]
+        with patch.object(client.session, "get", side_effect=responses):
+            self.assertEqual(client.search("Entry Developer", "Boston, MA"), {"data": []})
+
+        mock_sleep.assert_called_once_with(5)
+        self.assertEqual(client.latency_summary()["retries"], 1)
+
+    @patch('Evaluator.utils.job_search_client.time.sleep')
+    def test_deadline_bounds_timeouts_and_retries(self, mock_sleep):
+        client = JobSearchClient(api_key="key", read_timeout=10, backoff_factor=2)
+        deadline = time.monotonic() + 1
+        with patch.object(client.session, "get", return_value=self._response(503, {})) as get:
+            with self.assertRaises(requests.HTTPError):
+                client.search("Entry Developer", "Boston, MA", deadline=deadline)
+
+        # A 2 s backoff does not fit in the 1 s left, so there is no retry
+        get.assert_called_once()
+        self.assertLessEqual(max(get.call_args.kwargs["timeout"]), 1)
+        mock_sleep.assert_not_called()
+
+        with patch.object(client.session, "get") as get:
+            with self.assertRaises(requests.Timeout):
+                client.search("Entry Developer", "Boston, MA", deadline=time.monotonic() - 1)
+        get.assert_not_called()
+
+    def test_search_records_latency(self):
+        client = JobSearchClient(api_key=lambda: "lazy-key")
+        with patch.object(client.session, "get", return_value=self._response(200, {"data": []})) as get:
+            self.assertEqual(client.search("Entry Developer", "Boston, MA", size=5), {"data": []})
+
+        kwargs = get.call_args.kwargs
+        self.assertEqual(kwargs["timeout"], client.timeout)
+        self.assertEqual(kwargs["headers"]["x-rapidapi-key"], "lazy-key")
+        self.assertEqual(kwargs["params"]["size"], "5")
+        summary = client.latency_summary()
+        self.assertEqual((summary["calls"], summary["errors"]), (1, 0))
+        self.assertIsNotNone(summary["p95_ms"])
+
+    @patch('Evaluator.utils.job_search_client.time.sleep')
+    def test_http_error_is_raised_and_counted(self, mock_sleep):
+        client = JobSearchClient(api_key="key", max_retries=3)
+        with patch.object(client.session, "get", return_value=self._response(429, {})) as get:
+            with self.assertRaises(requests.HTTPError):
+                client.search("Entry Developer", "Boston, MA")
+
+        self.assertEqual(get.call_count, 4)
+        summary = client.latency_summary()
+        self.assertEqual((summary["errors"], summary["retries"]), (1, 3))
+
+    def test_search_pages_merges_dedupes_and_reports_late_pages(self):
+        client = JobSearchClient(api_key="key")
+        release = threading.Event()
+
+        def fake_search(query, location, page, **kwargs):
+            if page == 3:
+                release.wait(2)  # misses the deadline
+            return {"data": [{"job_id": f"p{page}"}, {"job_id": "shared"}]}
+
+        with patch.object(client, "search", side_effect=fake_search):
+            jobs, report = client.search_pages("Entry Developer", "Boston, MA", pages=3, deadline_seconds=0.2)
+        release.set()
+
+        self.assertEqual([job["job_id"] for job in jobs], ["p1", "shared", "p2"])
+        self.assertEqual(report["pages_ok"], [1, 2])
+        self.assertEqual(report["pages_late"], [3])
+        self.assertTrue(report["partial"])
+
+    def test_search_pages_share_one_bounded_pool_and_pass_the_deadline(self):
+        client = JobSearchClient(api_key="key", pool_maxsize=2)
+        deadlines = []
+
+        def fake_search(query, location, page, deadline=None, **kwargs):
+            deadlines.append(deadline)
+            return {"data": [{"job_id": f"p{page}"}]}
+
+        with patch.object(client, "search", side_effect=fake_search):
+            for _ in range(3):
+                client.search_pages("Entry Developer", "Boston, MA", pages=5, deadline_seconds=5)
+
+        self.assertLessEqual(len(client._executor._threads), 2)
+        self.assertTrue(all(deadline is not None and deadline <= time.monotonic() + 5 for deadline in deadlines))
+
+
+class TestWarmJobCache(TestCase):
+    """Tests for the warm_job_cache management command"""
+
+    JOBS = [{"job_id": "1", "job_title": "Software Engineer"}]
+
+    def setUp(self):
+        user = User.objects.create_user(username="warm_user", password="mypassword")
+        for career_field, level, location, count in [
+            ("Software Engineering", "Entry", "Boston, MA", 3),
+            ("Data Science", "Senior", "New York", 2),
+            ("Nursing", "Entry", "Austin", 1),
+        ]:
+            for _ in range(count):
+                Resume.objects.create(user=user, career_field=career_field, experience_level=level,
+                                      preferred_location=location)
+
+    @patch('Evaluator.utils.get_jobs.fetch_job_pages')
+    def test_warms_popular_queries_within_budget(self, mock_fetch):
+        mock_fetch.return_value = (self.JOBS, {"partial": False})
+
+        call_command("warm_job_cache", api_calls=JOB_SEARCH_PAGES, stdout=StringIO())
+
+        mock_fetch.assert_called_once()
+        self.assertEqual(mock_fetch.call_args.args[1:], ("Software Engineering", "Entry", "Boston, MA"))
+        self.assertIsNotNone(JobSearchCache.objects.get_entry("Software Engineering", "Entry", "Boston, MA"))
+
+    @patch('Evaluator.utils.get_jobs.fetch_job_pages')
+    def test_skips_fresh_entries_and_rare_queries(self, mock_fetch):
+        mock_fetch.return_value = (self.JOBS, {"partial": False})
+        JobSearchCache.objects.store("Software Engineering", "Entry", "Boston, MA", self.JOBS)
+
+        call_command("warm_job_cache", stdout=StringIO())
+
+        queried = [c.args[1] for c in mock_fetch.call_args_list]
+        self.assertEqual(queried, ["Data Science"])
+
+
+class TestJobTable(TestCase):
+    """Tests for the deduplicated Job table and the resume links"""
+
+    JOBS = [
+        {
+            "job_id": f"job-{i}",
+            "job_title": f"Engineer {i}",
+            "employer_name": "Acme",
+            "job_city": "Boston",
+            "job_state": "MA",
+            "job_is_remote": i % 2 == 0,
+            "job_min_salary": 90000,
+            "job_max_salary": 110000,
+            "job_salary_period": "YEAR",
+            "job_posted_at_timestamp": 1700000000,
+            "job_description": "Build services. Bachelor degree in Computer Science required.",
+            "job_highlights": {"Qualifications": [f"3+ years of Python ({i})"]},
+            "job_apply_link": f"https://example.com/{i}",
+            "job_offer_expiration_datetime_utc": "unused",
+        }
+        for i in range(12)
+    ]
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="job_user", password="mypassword")
+        self.client.login(username="job_user", password="mypassword")
+
+    def _resume(self, **fields):
+        return Resume.objects.create(user=self.user, career_field="Software Engineering",
+                                     experience_level="Entry", **fields)
+
+    def test_same_posting_is_stored_once(self):
+        first, second = self._resume(), self._resume()
+        first.set_jobs_matched(self.JOBS)
+        second.set_jobs_matched(self.JOBS[:3])
+
+        self.assertEqual(Job.objects.count(), len(self.JOBS))
+        self.assertEqual(ResumeJob.objects.filter(resume=second).count(), 3)
+        self.assertIsNone(Resume.objects.get(pk=first.pk).jobs_matched)
+
+    def test_round_trip_keeps_display_fields_in_order(self):
+        resume = self._resume()
+        resume.set_jobs_matched(self.JOBS)
+
+        jobs = resume.get_jobs_matched()
+
+        self.assertEqual([job["job_id"] for job in jobs], [job["job_id"] for job in self.JOBS])
+        self.assertEqual(jobs[0]["job_location"], "Boston, MA")
+        self.assertEqual(jobs[0]["job_apply_link"], "https://example.com/0")
+        self.assertEqual(jobs[0]["job_highlights"], {"Qualifications": ["3+ years of Python (0)"]})
+        self.assertNotIn("job_offer_expiration_datetime_utc", jobs[0])
+
+    def test_indexed_columns_are_filled(self):
+        Job.objects.upsert_from_api(self.JOBS[:2])
+        job = Job.objects.get(provider_job_id="job-0")
+        self.assertTrue(job.is_remote)
+        self.assertEqual(job.min_salary, 90000)
+        self.assertEqual(job.posted_at.year, 2023)
+
+    def test_upsert_updates_existing_posting(self):
+        Job.objects.upsert_from_api(self.JOBS[:1])
+        Job.objects.upsert_from_api([{**self.JOBS[0], "job_title": "Senior Engineer"}])
+        self.assertEqual(Job.objects.get(provider_job_id="job-0").title, "Senior Engineer")
+
+    def test_legacy_json_is_moved_to_the_job_table(self):
+        resume = self._resume(jobs_matched=self.JOBS[:2])
+
+        jobs = resume.get_jobs_matched()
+
+        self.assertEqual(len(jobs), 2)
+        self.assertEqual(ResumeJob.objects.filter(resume=resume).count(), 2)
+        self.assertIsNone(Resume.objects.get(pk=resume.pk).jobs_matched)
+
+    def test_deferred_columns_are_not_loaded(self):
+        resume = self._resume()
+        resume.set_jobs_matched(self.JOBS)
+        jobs = resume.get_matched_jobs().only(*Job.QUALIFICATION_FIELDS)
+
+        with self.assertNumQueries(1):
+            qualifications = extract_job_qualifications(jobs)
+
+        self.assertIn("3+ years of Python (11)", qualifications)
+
+    def test_process_job_data_reads_job_rows(self):
+        resume = self._resume()
+        resume.set_jobs_matched(self.JOBS[:1])
+
+        processed = process_job_data(resume.get_matched_jobs())
+
+        self.assertEqual(processed[0]["title"], "Engineer 0")
+        self.assertEqual(processed[0]["company"], "Acme")
+        self.assertEqual(processed[0]["avg_annual_salary_usd"], 100000)
+
+    def test_jobs_page_is_paginated(self):
+        resume = self._resume()
+        resume.set_jobs_matched(self.JOBS)
+        url = reverse("jobs_matched_from_resume_file", args=["job_user", resume.pk])
+
+        response = self.client.get(url, {"page": 2})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["jobs_count"], len(self.JOBS))
+        self.assertEqual([job["job_id"] for job in response.context["jobs_matched"]], ["job-10", "job-11"])
+
+
+class TestJobIndex(TestCase):
+    """Tests for the local inverted index over stored jobs"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "job_index.bin")
+        settings_override = override_settings(JOB_INDEX_PATH=self.path)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        patcher = patch("Evaluator.utils.job_index._job_index", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _jobs(self, title, count, location="Boston, MA", remote=False, start=0):
+        return [
+            {
+                "job_id": f"{title}-{location}-{i}",
+                "job_title": title,
+                "job_location": location,
+                "job_is_remote": remote,
+                "job_highlights": {"Qualifications": ["Experience with Python and SQL"]},
+            }
+            for i in range(start, start + count)
+        ]
+
+    def test_filters_by_field_level_and_location(self):
+        Job.objects.upsert_from_api(
+            self._jobs("Software Engineer", 2)
+            + self._jobs("Senior Software Engineer", 2)
+            + self._jobs("Software Engineer", 2, location="Austin, TX")
+            + self._jobs("Software Engineer", 1, location="Austin, TX", remote=True, start=5)
+            + self._jobs("Registered Nurse", 2)
+        )
+        index = get_job_index()
+
+        boston_entry = index.search("software_engineering", "entry_level", "Boston, MA")
+        self.assertEqual(
+            sorted(Job.objects.filter(pk__in=boston_entry).values_list("location", "is_remote")),
+            [("Austin, TX", True), ("Boston, MA", False), ("Boston, MA", False)],
+        )
+        self.assertEqual(len(index.search("software_engineering", "senior", "Boston, MA")), 5)
+        self.assertEqual(index.search("nursing", "entry_level", "Boston, MA"), [])
+
+    def test_title_matches_rank_first(self):
+        Job.objects.upsert_from_api(
+            [{"job_id": "body", "job_title": "Analyst", "job_highlights": {"Qualifications": ["Python"]}},
+             {"job_id": "title", "job_title": "Python Developer"}]
+        )
+        ranked = get_job_index().search("python")
+        self.assertEqual(list(Job.objects.get(pk=pk).provider_job_id for pk in ranked), ["title", "body"])
+
+    def test_benefits_do_not_make_postings_local_matches(self):
+        jobs = self._jobs("Software Engineer", MIN_LOCAL_MATCHES + 5)
+        for job in jobs:
+            job["job_highlights"]["Benefits"] = ["Dental insurance", "Health insurance", "Public transit"]
+        Job.objects.upsert_from_api(jobs)
+
+        index = get_job_index()
+        self.assertEqual(index.search("dental"), [])
+        self.assertEqual(index.search("public_health"), [])
+        self.assertEqual(find_local_jobs("public_health", None, "Boston, MA"), [])
+
+    def test_local_matches_need_a_title_hit(self):
+        jobs = self._jobs("Registered Nurse", MIN_LOCAL_MATCHES)
+        for job in jobs:
+            job["job_description"] = "Support our software engineering team with patient data."
+        Job.objects.upsert_from_api(jobs)
+
+        self.assertEqual(len(get_job_index().search("software_engineering")), MIN_LOCAL_MATCHES)
+        self.assertEqual(find_local_jobs("software_engineering", None, "Boston, MA"), [])
+
+    def test_saved_index_is_mapped_and_updated_incrementally(self):
+        Job.objects.upsert_from_api(self._jobs("Data Scientist", 3))
+        call_command("build_job_index", stdout=StringIO())
+
+        loaded = JobIndex.load(self.path)
+        self.assertEqual(len(loaded.search("data_science", location="Boston")), 3)
+
+        new_job = Job.objects.upsert_from_api(self._jobs("Data Scientist", 1, start=3))[0]
+        loaded.add_jobs([new_job])
+        self.assertIn(new_job.pk, loaded.search("data_science", location="Boston"))
+
+        loaded.save()
+        self.assertEqual(len(JobIndex.load(self.path).search("data_science", location="Boston")), 4)
+        loaded.close()
+
+    def test_rebuild_reads_every_indexed_field_in_one_query(self):
+        Job.objects.upsert_from_api(self._jobs("Data Scientist", 20))
+
+        # One SELECT for the rows and one COUNT for the summary, however many jobs there are
+        with self.assertNumQueries(2):
+            call_command("build_job_index", stdout=StringIO())
+        self.assertEqual(len(JobIndex.load(self.path).search("data_science")), 20)
+
+    def test_unreadable_index_file_gives_an_empty_index(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not an index")
+        self.assertEqual(JobIndex.load(self.path).search("python"), [])
+
+    @patch('Evaluator.utils.get_jobs.fetch_job_pages')
+    def test_resume_uses_local_matches_without_the_api(self, mock_fetch):
+        Job.objects.upsert_from_api(self._jobs("Software Engineer", MIN_LOCAL_MATCHES))
+        user = User.objects.create_user(username="index_user", password="mypassword")
+        resume = Resume.objects.create(user=user, career_field="software_engineering",
+                                       experience_level="entry_level", preferred_location="Boston, MA")
+
+        self.assertEqual(len(resume.get_jobs_matched()), MIN_LOCAL_MATCHES)
+        mock_fetch.assert_not_called()
+
+    @patch('Evaluator.utils.get_jobs.fetch_job_pages')
+    def test_low_recall_falls_back_to_the_api(self, mock_fetch):
+        Job.objects.upsert_from_api(self._jobs("Software Engineer", MIN_LOCAL_MATCHES - 1))
+        mock_fetch.return_value = (self._jobs("Software Engineer", 3, start=100), {"partial": False})
+        user = User.objects.create_user(username="index_user", password="mypassword")
+        resume = Resume.objects.create(user=user, career_field="software_engineering",
+                                       experience_level="entry_level", preferred_location="Boston, MA")
+
+        self.assertEqual(len(resume.get_jobs_matched()), 3)
+        mock_fetch.assert_called_once()
+
+
+class TestJobRanking(TestCase):
+    """Tests for BM25 ranking of matched jobs against a resume"""
+
+    RESUME = {
+        "skills": ["Python", "Django", "PostgreSQL"],
+        "experience": [{"title": "Backend Developer", "description": "Built REST APIs"}],
+        "education": [{"degree": "BS Computer Science"}],
+    }
+    JOBS = [
+        {"job_id": "nurse", "job_title": "Registered Nurse", "job_description": "Patient care in a busy ward."},
+        {"job_id": "frontend", "job_title": "Frontend Developer",
+         "job_highlights": {"Qualifications": ["React and TypeScript", "Some Python is a plus"]}},
+        {"job_id": "backend", "job_title": "Backend Developer",
+         "job_highlights": {"Qualifications": ["Python and Django", "PostgreSQL", "Docker and Kubernetes"]},
+         "job_description": "Build Django services on AWS."},
+    ]
+
+    def test_best_match_first_with_skill_annotations(self):
+        ranking = rank_jobs(self.RESUME, self.JOBS)
+
+        self.assertEqual([self.JOBS[entry["index"]]["job_id"] for entry in ranking], ["backend", "frontend", "nurse"])
+        best = ranking[0]
+        self.assertEqual(best["match_percent"], 100)
+        self.assertEqual(best["matched_skills"], ["Python", "Django", "PostgreSQL"])
+        self.assertEqual(sorted(best["missing_skills"]), ["AWS", "Docker", "Kubernetes"])
+        self.assertEqual(ranking[-1]["score"], 0.0)
+
+    def test_resume_without_data_keeps_api_order(self):
+        ranking = rank_jobs({}, self.JOBS)
+        self.assertEqual([entry["index"] for entry in ranking], [0, 1, 2])
+        self.assertEqual(rank_jobs(self.RESUME, []), [])
+
+    def test_job_matrix_is_cached_per_job_set(self):
+        loads = []
+
+        def load():
+            loads.append(1)
+            return self.JOBS
+
+        first = get_job_matrix(("test-set", 1), load)
+        self.assertIs(get_job_matrix(("test-set", 1), load), first)
+        self.assertEqual(len(loads), 1)
+
+    def test_jobs_page_is_ranked_against_the_resume(self):
+        cache.clear()
+        user = User.objects.create_user(username="rank_user", password="mypassword")
+        self.client.login(username="rank_user", password="mypassword")
+        resume = Resume.objects.create(user=user, extracted_text=self.RESUME)
+        resume.set_jobs_matched(self.JOBS)
+
+        response = self.client.get(reverse("jobs_matched_from_resume_file", args=["rank_user", resume.pk]))
+
+        jobs = response.context["jobs_matched"]
+        self.assertEqual([job["job_id"] for job in jobs], ["backend", "frontend", "nurse"])
+        self.assertEqual(jobs[0]["matched_skills"], ["Python", "Django", "PostgreSQL"])
+        self.assertContains(response, "Resume match:")
+
+
+class TestJobQualifications(TestCase):
+    """Tests for qualification sentences pulled from job descriptions"""
+
+    DESCRIPTION = ("Join us. 5 years. We need 5+ years of Python experience. "
+                   "A Bachelor's degree is required. Familiar with Docker")
+
+    def test_first_long_sentence_per_keyword_in_keyword_order(self):
+        self.assertEqual(description_qualifications(self.DESCRIPTION), [
+            "A Bachelor's degree is required",
+            "A Bachelor's degree is required",
+            "We need 5+ years of Python experience",
+            "We need 5+ years of Python experience",
+            "Familiar with Docker",
+        ])
+
+    def test_offsets_survive_characters_that_lower_to_two(self):
+        self.assertEqual(description_qualifications("İstanbul office. Master's degree in CS"),
+                         ["Master's degree in CS", "Master's degree in CS"])
+
+    @patch('Evaluator.utils.job_qualifications.description_qualifications', return_value=["cached"])
+    def test_results_are_cached_per_job_and_description(self, mock_extract):
+        cached_description_qualifications("cache-job", self.DESCRIPTION)
+        cached_description_qualifications("cache-job", self.DESCRIPTION)
+        cached_description_qualifications("cache-job", self.DESCRIPTION + " Updated.")
+
+        self.assertEqual(mock_extract.call_count, 2)
+
+
+class TestJobRecords(TestCase):
+    """Tests for the parse-once job and recommendation records"""
+
+    JOB = {
+        "job_id": "rec-1", "job_title": "Engineer", "employer_name": None, "job_is_remote": 1,
+        "job_min_salary": 90000, "job_max_salary": 110000, "job_salary_period": "YEAR",
+        "job_highlights": {"Qualifications": ["Python", None], "Benefits": "not a list"},
+    }
+
+    def test_payload_shapes_parse_to_the_same_posting(self):
+        payloads = [self.JOB, [self.JOB], {"data": [self.JOB]}, json.dumps({"data": [self.JOB]})]
+
+        postings = [parse_jobs(payload) for payload in payloads]
+
+        self.assertTrue(all(parsed == postings[0] for parsed in postings))
+        posting = postings[0][0]
+        self.assertEqual((posting.employer_name, posting.is_remote), ("", True))
+        self.assertEqual(posting.highlights, {"Qualifications": ("Python",)})
+        self.assertEqual(posting.annual_salary, 100000)
+
+    def test_postings_pass_through_and_other_values_are_dropped(self):
+        posting = JobPosting(job_id="kept")
+
+        self.assertEqual(parse_jobs([posting, "junk", 3, None]), [posting])
+        self.assertEqual(parse_jobs("{not json"), [])
+        self.assertFalse(hasattr(posting, "__dict__"))
+
+    def test_recommendation_fields_are_decoded_once(self):
+        recommendations = process_job_recommendation(json.dumps({"data": [{
+            "education": [{"degree": "BS", "field_of_study": "CS"}, {"degree": "MBA"}],
+            "hard_skills": '["Python", "SQL"]',
+            "soft_skills": "Communication",
+            "license": None,
+        }]}))
+
+        self.assertEqual(recommendations, [Recommendation(
+            education=("BS in CS", "MBA"), hard_skills=("Python", "SQL"), soft_skills=("Communication",),
+        )])
+
+
+class TestJsonCodec(TestCase):
+    """Tests for the JSON codec behind FastJSONField"""
+
+    VALUE = {"title": "Café Engineer", "skills": ["SQL", "Python"], "years": 3, "remote": None}
+
+    def test_standard_library_fallback_writes_the_same_text(self):
+        fast = json_codec.dumps(self.VALUE)
+        with patch.object(json_codec, "orjson", None):
+            fallback = json_codec.dumps(self.VALUE)
+            self.assertEqual(json_codec.loads(memoryview(json_codec.dumps_bytes(self.VALUE))), self.VALUE)
+
+        self.assertEqual(fast, fallback)
+
+    def test_fast_json_field_round_trips_and_keeps_lookups(self):
+        Job.objects.upsert_from_api([{
+            "job_id": "codec-1", "job_title": "Café Engineer", "job_publisher": "LinkedIn",
+            "job_highlights": {"Qualifications": ["SQL", "Python"]},
+        }])
+
+        job = Job.objects.get(details__job_publisher="LinkedIn")
+
+        self.assertEqual(job.highlights, {"Qualifications": ["SQL", "Python"]})
+        self.assertTrue(Job.objects.filter(highlights__has_key="Qualifications", title="Café Engineer").exists())
+
+
+class TestQualificationClusters(TestCase):
+    """Tests for collapsing reworded qualifications across postings"""
+
+    def test_rewordings_collapse_with_posting_counts(self):
+        collapsed = collapse_qualifications([
+            (0, "Bachelor's degree in Computer Science"),
+            (1, "BS degree in Computer Science or related field"),
+            (2, "Bachelor's degree in computer science"),
+            (0, "Excellent verbal and written communication skills"),
+            (3, "Strong written and verbal communication skills"),
+            (3, "Ability to work independently"),
+        ], total_jobs=4)
+
+        self.assertEqual([(entry["text"], entry["jobs"], len(entry["wordings"])) for entry in collapsed], [
+            ("Bachelor's degree in Computer Science", 3, 2),
+            ("Strong written and verbal communication skills", 2, 2),
+            ("Ability to work independently", 1, 1),
+        ])
+        self.assertEqual(collapsed[0]["total_jobs"], 4)
+
+    def test_different_requirements_stay_apart(self):
+        collapsed = collapse_qualifications([
+            (0, "3+ years of Python experience"),
+            (1, "Minimum 3 years experience with Python"),
+            (2, "3+ years of Java experience"),
+            (3, "Master's degree in Computer Science"),
+        ])
+
+        self.assertEqual(sorted(entry["jobs"] for entry in collapsed), [1, 1, 2])
+
+    @patch('Evaluator.utils.analyzer_with_claude.chat_with_claude')
+    def test_prompt_carries_one_counted_line_per_requirement(self, mock_chat):
+        mock_chat.return_value = {"recommended_actions": []}
+        jobs = [{"job_id": f"q{i}", "job_highlights": {"Qualifications": [wording]}}
+                for i, wording in enumerate(["Excellent communication skills", "Strong communication skills",
+                                             "Communication skills"])]
+
+        analyze_resume_against_jobs({"skills": ["Python"]}, jobs)
+
+        prompt = mock_chat.call_args.args[0]
+        self.assertEqual(prompt.count("ommunication skills"), 1)
+        self.assertIn("(mentioned in 3/3 postings)", prompt)
+
+
+class TestSkillDemand(TestCase):
+    """Tests for the local skill-demand gap analysis"""
+
+    JOBS = [
+        {"job_title": "Backend Developer",
+         "job_highlights": {"Qualifications": ["3+ years of Python", "Experience with Kubernetes (k8s)",
+                                               "Strong written communication"]},
+         "job_description": "We deploy with Docker on AWS."},
+        {"job_title": "Platform Engineer",
+         "job_highlights": {"Qualifications": ["Kubernetes and Terraform", "Bachelor's degree in CS"]},
+         "job_description": "Python services, Spring Boot a plus."},
+        {"job_title": "Data Engineer", "job_description": "Kafka, Docker and Python pipelines."},
+    ]
+
+    def test_matcher_respects_word_boundaries_and_aliases(self):
+        found = skill_matcher.find("JavaScript and Node.js, excellent HTML, machine\n learning, k8s, ASAP, C++")
+        self.assertEqual(found, ["JavaScript", "C++", "HTML", "Node.js", "Kubernetes", "Machine Learning"])
+        self.assertEqual(skill_matcher.find("Spring Boot services"), ["Spring"])
+
+    def test_everyday_words_are_not_skills(self):
+        jobs = [
+            {"job_title": "Data Analyst",
+             "job_highlights": {"Qualifications": ["React quickly to feedback", "Excel at communication"]},
+             "job_description": "Swift turnaround on reports. Spring 2025 internship; no rust on your SQL."}
+            for _ in range(3)
+        ]
+
+        gap = skill_gap("Skills: SQL", jobs)
+
+        self.assertEqual(gap["missing_technical_skills"], [])
+        self.assertEqual([item["skill"] for item in gap["skill_demand"]], ["SQL"])
+        self.assertEqual(skill_matcher.find("React.js, SwiftUI, Spring Boot, Microsoft Excel, Express.js"),
+                         ["Swift", "Spring", "Express", "React", "Excel"])
+
+    def test_missing_skills_ranked_by_demand_without_resume_skills(self):
+        gap = skill_gap("Skills: Python, Postgres, Docker", self.JOBS)
+
+        self.assertEqual(gap["missing_technical_skills"], ["Kubernetes"])
+        self.assertEqual(gap["resume_skills"], ["Python", "PostgreSQL", "Docker"])
+        demand = {item["skill"]: item["jobs"] for item in gap["skill_demand"]}
+        self.assertEqual(demand["Python"], 3)
+        self.assertEqual(demand["Kubernetes"], 2)
+
+    @patch('Evaluator.utils.analyzer_with_claude.chat_with_claude')
+    def test_model_only_writes_the_narrative(self, mock_chat):
+        mock_chat.return_value = {"recommended_actions": ["Deploy a side project on Kubernetes"],
+                                  "missing_technical_skills": ["ignored"]}
+        resume = {"skills": ["Python", "Docker"], "summary": "x" * 5000,
+                  "experience": [{"title": "Developer", "description": "y" * 5000}]}
+
+        result = analyze_resume_against_jobs(resume, self.JOBS)
+
+        self.assertEqual(result["missing_technical_skills"], ["Kubernetes"])
+        self.assertEqual(result["recommended_actions"], ["Deploy a side project on Kubernetes"])
+        self.assertEqual(result["missing_certifications"], [])
+        prompt = mock_chat.call_args.args[0]
+        self.assertLess(len(prompt), 3000)
+        self.assertIn("Strong written communication", prompt)
+        self.assertNotIn("3+ years of Python", prompt)
+
+    @patch('Evaluator.utils.analyzer_with_claude.chat_with_claude')
+    def test_local_gaps_survive_a_model_failure(self, mock_chat):
+        mock_chat.return_value = {"error": "API Error"}
+
+        result = analyze_resume_against_jobs({"skills": ["Python"]}, self.JOBS)
+
+        # Same demand; Kubernetes is listed under Qualifications, Docker only in descriptions
+        self.assertEqual(result["missing_technical_skills"], ["Kubernetes", "Docker"])
+        self.assertEqual(result["recommended_actions"], [])
+
+
+class TestRecommendationJobs(TestCase):
+    """Tests for skills gap analysis run as a tracked background task"""
+
+    JOBS = [{"job_id": "backend", "job_title": "Backend Engineer",
+             "job_description": "Build APIs", "job_highlights": {"Qualifications": ["Python"]}}]
+
+    def setUp(self):
+        from UserAuth.models import UserProfile
+        cache.clear()
+        self.user = User.objects.create_user(username="rec_user", password="mypassword")
+        UserProfile.objects.create(user=self.user)
+        self.client.login(username="rec_user", password="mypassword")
+        self.resume = Resume.objects.create(user=self.user, extracted_text={"skills": ["Python"]},
+                                            career_field="Software Engineering")
+        self.page_url = reverse("recommendation_skills", args=["rec_user", self.resume.pk])
+        self.progress_url = reverse("recommendation_progress", args=["rec_user", self.resume.pk])
+
+    def _run_worker(self):
+        call_command("run_task_worker", "--once", "--concurrency", "1", stdout=StringIO())
+
+    @patch('Evaluator.views.analyze_resume_against_jobs')
+    def test_page_renders_progress_and_the_worker_reports_each_stage(self, mock_analyze):
+        self.resume.set_jobs_matched(self.JOBS)
+        stages = []
+        mock_analyze.side_effect = lambda *args: stages.append(
+            Resume.objects.get(pk=self.resume.pk).recommendation_status) or {"missing_technical_skills": ["Go"]}
+
+        response = self.client.get(self.page_url)
+        self.assertEqual(response.context["recommendation_progress"], 10)
+        mock_analyze.assert_not_called()
+
+        polled = self.client.get(self.progress_url)
+        self.assertEqual(polled.json()["status"], Resume.RECOMMENDATION_QUEUED)
+        unchanged = self.client.get(self.progress_url, HTTP_IF_NONE_MATCH=polled["ETag"])
+        self.assertEqual(unchanged.status_code, 304)
+
+        self._run_worker()
+
+        self.assertEqual(stages, [Resume.RECOMMENDATION_ANALYZING])
+        self.assertEqual(self.client.get(self.progress_url, HTTP_IF_NONE_MATCH=polled["ETag"]).json()["progress"], 100)
+        response = self.client.get(self.page_url)
+        self.assertEqual(response.context["recommended_skills"], {"missing_technical_skills": ["Go"]})
+
+    def test_failure_is_reported_once_on_the_page(self):
+        with patch('Scanner.models.find_local_jobs', return_value=[]), \
+                patch('Scanner.models.get_cached_jobs', return_value=[]):
+            self.client.get(self.page_url)
+            self._run_worker()
+
+        self.resume.refresh_from_db()
+        self.assertEqual(self.resume.recommendation_status, Resume.RECOMMENDATION_FAILED)
+
+        response = self.client.get(self.page_url)
+        self.assertEqual(response.context["recommended_skills"],
+                         {"error": "No job data found. Please ensure jobs are loaded first."})
+        self.resume.refresh_from_db()
+        self.assertEqual(self.resume.recommendation_status, "")
+
+    @patch('Evaluator.views.analyze_resume_against_jobs')
+    def test_result_is_discarded_when_the_resume_changes_during_analysis(self, mock_analyze):
+        self.resume.set_jobs_matched(self.JOBS)
+        mock_analyze.side_effect = lambda *args: Resume.objects.get(pk=self.resume.pk).set_extracted_text(
+            {"skills": ["Rust"]}) or {"missing_technical_skills": ["Go"]}
+
+        self.client.get(self.page_url)
+        self._run_worker()
+
+        self.resume.refresh_from_db()
+        self.assertIsNone(self.resume.recommendation_skills)
+        self.assertEqual(self.resume.recommendation_status, Resume.RECOMMENDATION_FAILED)
+        self.assertIn("changed while it was being analyzed", self.resume.recommendation_error)
+
+    @patch('Evaluator.views.analyze_resume_against_jobs', return_value={"missing_technical_skills": ["Go"]})
+    def test_re_extraction_while_fetching_jobs_is_caught(self, mock_analyze):
+        job_ids = [job.pk for job in Job.objects.upsert_from_api(self.JOBS)]
+
+        def re_extract_then_find(*args):
+            Resume.objects.get(pk=self.resume.pk).set_extracted_text({"skills": ["Rust"]})
+            return job_ids
+
+        self.client.get(self.page_url)
+        with patch('Scanner.models.find_local_jobs', side_effect=re_extract_then_find):
+            self._run_worker()
+
+        mock_analyze.assert_not_called()
+        self.resume.refresh_from_db()
+        self.assertIsNone(self.resume.recommendation_skills)
+        self.assertEqual(self.resume.recommendation_status, Resume.RECOMMENDATION_FAILED)
+
+    @patch('Evaluator.views.analyze_resume_against_jobs', return_value={"missing_technical_skills": ["Go"]})
+    def test_jobs_linked_by_the_task_itself_are_not_a_conflict(self, mock_analyze):
+        job_ids = [job.pk for job in Job.objects.upsert_from_api(self.JOBS)]
+
+        self.client.get(self.page_url)
+        with patch('Scanner.models.find_local_jobs', return_value=job_ids):
+            self._run_worker()
+
+        self.resume.refresh_from_db()
+        self.assertEqual(self.resume.recommendation_status, Resume.RECOMMENDATION_DONE)
+        self.assertEqual(self.resume.recommendation_skills, {"missing_technical_skills": ["Go"]})
+
+
+class TestPageCache(TestCase):
+    """Tests for the per-resume fragment cache and ETags of the jobs and recommendation pages"""
+
+    JOBS = TestJobTable.JOBS[:3]
+
+    def setUp(self):
+        from UserAuth.models import UserProfile
+        cache.clear()
+        self.user = User.objects.create_user(username="cache_user", password="mypassword")
+        UserProfile.objects.create(user=self.user)
+        self.client.login(username="cache_user", password="mypassword")
+        self.resume = Resume.objects.create(user=self.user, extracted_text={"skills": ["Python"]},
+                                            career_field="Software Engineering")
+        self.resume.set_jobs_matched(self.JOBS)
+
+    @patch('Evaluator.views.rank_job_rows', wraps=rank_job_rows)
+    def test_jobs_fragment_is_reused_until_the_matches_change(self, mock_rank):
+        url = reverse("jobs_matched_from_resume_file", args=["cache_user", self.resume.pk])
+
+        first = self.client.get(url)
+        second = self.client.get(url)
+        self.assertEqual(mock_rank.call_count, 1)
+        self.assertEqual(first["ETag"], second["ETag"])
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 304)
+        self.assertNotEqual(self.client.get(url, {"page": 2})["ETag"], first["ETag"])
+
+        self.resume.set_jobs_matched(self.JOBS[:1])
+        changed = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], first["ETag"])
+        self.assertEqual(changed.content.count(b"Engineer 0"), 1)
+        self.assertNotIn(b"Engineer 1", changed.content)
+
+    def test_recommendation_report_follows_set_recommendation_skills(self):
+        url = reverse("recommendation_skills", args=["cache_user", self.resume.pk])
+        self.resume.set_recommendation_skills({"missing_technical_skills": ["Kubernetes"]})
+
+        first = self.client.get(url)
+        self.assertContains(first, "Kubernetes")
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 304)
+
+        self.resume.set_recommendation_skills({"missing_technical_skills": ["Terraform"]})
+        changed = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertContains(changed, "Terraform")
+        self.assertNotContains(changed, "Kubernetes")
+
+    def test_pending_message_is_never_swallowed_by_a_304(self):
+        from Evaluator.utils.page_cache import not_modified
+        from django.contrib.messages.storage.fallback import FallbackStorage
+        from django.test import RequestFactory
+
+        request = RequestFactory().get("/", HTTP_IF_NONE_MATCH='"abc"')
+        request.session = self.client.session
+        request._messages = FallbackStorage(request)
+        self.assertEqual(not_modified(request, '"abc"').status_code, 304)
+
+        request._messages.add(20, "Resume uploaded")
+        self.assertIsNone(not_modified(request, '"abc"'))
 
-# Create your tests here.
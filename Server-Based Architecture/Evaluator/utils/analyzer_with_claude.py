@@ -5,10 +5,14 @@ import os
 import json
 from Core import settings
 import anthropic
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 import logging
 import time
 from Core.secrets.parameter_store import *
+from Evaluator.utils.job_qualifications import cached_description_qualifications
+from Evaluator.utils.job_records import parse_jobs
+from Evaluator.utils.qualification_clusters import collapse_qualifications, format_collapsed
+from Evaluator.utils.skill_demand import skill_gap, skill_matcher
 
 
 parameter_store = ParameterStoreClient()
@@ -16,6 +20,15 @@ parameter_store = ParameterStoreClient()
 # Get logger for this module
 logger = logging.getLogger(__name__)
 
+# Gap categories still written by the model; missing_technical_skills is computed locally
+NARRATIVE_KEYS = (
+    "missing_education",
+    "missing_certifications",
+    "missing_experience",
+    "missing_soft_skills",
+    "recommended_actions",
+)
+
 
 
 def extract_resume_text_from_data(resume_data: Union[str, Dict]) -> str:
@@ -121,50 +134,40 @@ def extract_resume_text_from_data(resume_data: Union[str, Dict]) -> str:
         return ""
 
 
-def extract_job_qualifications(jobs_list: List[Dict]) -> List[str]:
+def job_qualification_lines(jobs_list) -> List[Tuple[int, str]]:
     """
-    Extract all qualifications from job postings, specifically focusing on the qualifications field.
+    (job number, qualification) for every qualification in the postings, before
+    any de-duplication. Accepts anything parse_jobs does, including a Job
+    queryset iterator read in chunks.
     """
-    logger.info(f"Extracting qualifications from {len(jobs_list)} job postings")
+    logger.info("Extracting qualifications from job postings")
 
-    all_qualifications = []
+    job_lines = []
+    postings = parse_jobs(jobs_list)
 
-    for i, job in enumerate(jobs_list):
-        logger.debug(f"Processing job {i + 1}: {job.get('job_title', 'No title')}")
+    for i, job in enumerate(postings):
+        logger.debug(f"Processing job {i + 1}: {job.title or 'No title'}")
 
         # Extract from job_highlights.Qualifications (primary source)
-        if 'job_highlights' in job and isinstance(job['job_highlights'], dict):
-            qualifications = job['job_highlights'].get('Qualifications', [])
-            if isinstance(qualifications, list):
-                logger.debug(f"Found {len(qualifications)} qualifications in job_highlights")
-                all_qualifications.extend(qualifications)
-
-        # Also extract from job description as backup
-        job_description = job.get('job_description', '')
-        if job_description:
-            # Look for qualification keywords in description
-            qual_keywords = [
-                'bachelor', 'master', 'degree', 'certification', 'certified',
-                'experience', 'years', 'knowledge of', 'proficiency in',
-                'skilled in', 'familiar with', 'expertise in'
-            ]
+        job_lines.extend((i, qual) for qual in job.qualifications)
+
+        # Also extract from job description as backup: one sentence per qualification keyword
+        if job.description:
+            job_lines.extend((i, qual) for qual in cached_description_qualifications(job.job_id, job.description))
 
-            description_lower = job_description.lower()
-            for keyword in qual_keywords:
-                if keyword in description_lower:
-                    # Extract sentences containing qualification keywords
-                    sentences = job_description.split('.')
-                    for sentence in sentences:
-                        if keyword in sentence.lower() and len(sentence.strip()) > 10:
-                            all_qualifications.append(sentence.strip())
-                            break  # Only add one sentence per keyword per job
+    logger.info(f"Extracted {len(job_lines)} total qualifications from {len(postings)} job postings")
+    return job_lines
 
-    logger.info(f"Extracted {len(all_qualifications)} total qualifications")
 
+def extract_job_qualifications(jobs_list) -> List[str]:
+    """
+    Extract all qualifications from job postings, specifically focusing on the qualifications field.
+    Exact repeats (ignoring case) are removed; see collapse_qualifications for near-duplicates.
+    """
     # Remove duplicates while preserving order
     unique_qualifications = []
     seen = set()
-    for qual in all_qualifications:
+    for _, qual in job_qualification_lines(jobs_list):
         qual_lower = qual.lower().strip()
         if qual_lower not in seen and len(qual_lower) > 5:  # Filter out very short qualifications
             seen.add(qual_lower)
@@ -179,73 +182,81 @@ def extract_job_qualifications(jobs_list: List[Dict]) -> List[str]:
     return unique_qualifications
 
 
-def get_qualification_gap_analysis_prompt(resume_text: str, qualifications: List[str]) -> str:
+def get_resume_profile(resume_data: Union[str, Dict], resume_text: str, max_chars: int = 1500) -> str:
     """
-    Generate a focused prompt for analyzing qualification gaps.
+    Short profile of the candidate for the narrative prompt: skills, job titles,
+    education and certifications rather than the full resume text.
     """
-    logger.debug("Generating qualification gap analysis prompt")
-    logger.debug(f"Resume text length: {len(resume_text)} characters")
-    logger.debug(f"Number of qualifications to analyze: {len(qualifications)}")
-
-    # Limit qualifications to avoid token limits (keep most relevant ones)
-    max_qualifications = 50
-    if len(qualifications) > max_qualifications:
-        qualifications = qualifications[:max_qualifications]
-        logger.debug(f"Limited to {max_qualifications} qualifications to stay within token limits")
+    if not isinstance(resume_data, dict):
+        return resume_text[:max_chars]
+
+    lines = []
+    for key in ("career_field", "experience_level"):
+        if resume_data.get(key):
+            lines.append(f"{key.replace('_', ' ').title()}: {resume_data[key]}")
+    skills = resume_data.get("skills")
+    if isinstance(skills, list) and skills:
+        lines.append("Skills: " + ", ".join(str(skill) for skill in skills))
+    for exp in resume_data.get("experience") or []:
+        if isinstance(exp, dict) and exp.get("title"):
+            lines.append(f"Experience: {exp.get('title')} ({exp.get('duration') or 'dates not given'})")
+    for edu in resume_data.get("education") or []:
+        if isinstance(edu, dict) and edu.get("degree"):
+            lines.append(f"Education: {edu.get('degree')}")
+    certifications = resume_data.get("certifications")
+    if isinstance(certifications, list) and certifications:
+        lines.append("Certifications: " + ", ".join(str(cert) for cert in certifications))
+
+    profile = "\n".join(lines) or resume_text
+    return profile[:max_chars]
+
+
+def get_recommended_actions_prompt(resume_profile: str, skill_gap_result: Dict, qualifications: List[str]) -> str:
+    """
+    Prompt for the narrative part of the gap analysis. Technical skill demand is
+    computed locally (skill_demand.skill_gap) and passed in as facts, so the
+    model only sees the non-technical qualification lines.
+    """
+    max_qualifications = 20
+    qualifications = qualifications[:max_qualifications]
+    qualifications_text = "\n".join(f"- {qual}" for qual in qualifications) or "- (none)"
 
-    qualifications_text = "\n".join([f"- {qual}" for qual in qualifications])
+    demand_text = "\n".join(
+        f"- {item['skill']}: asked for by {item['jobs']} postings"
+        for item in skill_gap_result.get("skill_demand", [])
+        if item["skill"] in skill_gap_result.get("missing_technical_skills", [])
+    ) or "- (none)"
 
     prompt = f"""
-You are a career counselor analyzing a candidate's resume against job market requirements. 
+You are a career counselor. A candidate's profile was compared with job postings.
 
-RESUME:
-{resume_text}
+CANDIDATE PROFILE:
+{resume_profile}
 
-JOB MARKET QUALIFICATIONS REQUIRED:
-{qualifications_text}
+TECHNICAL SKILLS THE CANDIDATE LACKS (already measured, do not repeat as a list):
+{demand_text}
 
-Analyze what this candidate is MISSING based on the job qualifications above. Be specific and actionable.
+OTHER QUALIFICATIONS FROM THE POSTINGS (most requested first):
+{qualifications_text}
 
-Return ONLY a clean JSON object with exactly this structure:
+Return ONLY a JSON object with exactly these keys:
 
 {{
-  "missing_technical_skills": [
-    "specific skill name",
-    "another missing skill"
-  ],
-  "missing_education": [
-    "specific degree requirement",
-    "additional education needed"
-  ],
-  "missing_certifications": [
-    "certification name",
-    "another certification"
-  ],
-  "missing_experience": [
-    "specific experience type",
-    "years of experience gap"
-  ],
-  "missing_soft_skills": [
-    "communication skill",
-    "leadership requirement"
-  ],
-  "recommended_actions": [
-    "Take course in X",
-    "Get certified in Y",
-    "Gain experience in Z"
-  ]
+  "missing_education": ["degree or education the candidate lacks"],
+  "missing_certifications": ["certification name"],
+  "missing_experience": ["experience type or years gap"],
+  "missing_soft_skills": ["soft skill"],
+  "recommended_actions": ["Concrete next step, e.g. build a project with X"]
 }}
 
-IMPORTANT RULES:
-- Only include what the candidate is actually MISSING (not what they have)
-- Be specific with skill names and requirements
-- Focus on the most important gaps for career advancement
-- Maximum 8 items per category
+RULES:
+- Only include what the candidate is actually MISSING
+- recommended_actions should address the most demanded missing technical skills first
+- Maximum 5 items per key; use [] when there is no gap
 - Return valid JSON only, no explanations
-- If a category has no gaps, return an empty array []
 """
 
-    logger.debug(f"Generated prompt length: {len(prompt)} characters")
+    logger.debug(f"Generated recommended actions prompt length: {len(prompt)} characters")
     return prompt
 
 
@@ -370,7 +381,7 @@ def chat_with_claude(prompt: str) -> Optional[Dict]:
         return {"error": f"Unexpected error: {str(e)}"}
 
 
-def analyze_resume_against_jobs(resume_data: Union[str, Dict], jobs_data: Dict) -> Optional[Dict]:
+def analyze_resume_against_jobs(resume_data: Union[str, Dict], jobs_data) -> Optional[Dict]:
     """
     Main function to analyze resume against job postings, focusing on qualifications gaps.
     """
@@ -391,62 +402,66 @@ def analyze_resume_against_jobs(resume_data: Union[str, Dict], jobs_data: Dict)
         logger.error("Resume text is empty after conversion")
         return {"error": "Resume text is empty or could not be extracted"}
 
-    # Validate and extract jobs data
+    # Parse the jobs once; everything below reads JobPosting attributes
     try:
-        if not jobs_data or not isinstance(jobs_data, (dict, list)):
-            logger.error("Invalid jobs data format")
-            return {"error": "Invalid job data format"}
-
-        # Handle different jobs data formats
-        if isinstance(jobs_data, list):
-            jobs_list = jobs_data
-        elif isinstance(jobs_data, dict) and 'data' in jobs_data:
-            jobs_list = jobs_data['data']
-        else:
-            logger.error("Jobs data structure not recognized")
-            return {"error": "Unrecognized job data structure"}
-
-        if not jobs_list or not isinstance(jobs_list, list):
-            logger.error("No valid jobs list found")
-            return {"error": "No valid job data found"}
-
-        logger.info(f"Processing {len(jobs_list)} job postings")
-
+        jobs_list = parse_jobs(jobs_data)
     except Exception as e:
         logger.error(f"Error processing jobs data: {str(e)}")
         return {"error": f"Failed to process job data: {str(e)}"}
 
+    if not jobs_list:
+        logger.error("No valid jobs list found")
+        return {"error": "No valid job data found"}
+
+    logger.info(f"Processing {len(jobs_list)} job postings")
+
     try:
         # Extract qualifications from all jobs
-        logger.info("Extracting qualifications from job postings")
-        qualifications = extract_job_qualifications(jobs_list)
+        job_lines = [(job, qual) for job, qual in job_qualification_lines(jobs_list) if len(qual.strip()) > 5]
 
-        if not qualifications:
+        # Technical skill demand is counted locally; it no longer goes through the model
+        gap = skill_gap(resume_text, jobs_list)
+
+        if not job_lines and not gap["skill_demand"]:
             logger.warning("No qualifications extracted from job postings")
             return {"error": "No qualifications found in job postings"}
 
-        # Generate focused prompt
-        logger.info("Generating qualification gap analysis prompt")
-        prompt = get_qualification_gap_analysis_prompt(resume_text, qualifications)
+        # The model only sees qualification lines that name no vocabulary skill,
+        # with rewordings of the same requirement collapsed into one counted line
+        other_qualifications = collapse_qualifications(
+            [(job, qual) for job, qual in job_lines if not skill_matcher.find_indexes(qual)],
+            total_jobs=len(jobs_list),
+        )
+        prompt = get_recommended_actions_prompt(
+            get_resume_profile(resume_data, resume_text), gap,
+            [format_collapsed(entry) for entry in other_qualifications]
+        )
 
-        # Get analysis from Claude
-        logger.info("Sending qualification gap analysis to Claude")
+        logger.info("Sending recommended actions prompt to Claude")
         start_time = time.time()
 
-        result = chat_with_claude(prompt)
+        narrative = chat_with_claude(prompt)
 
         analysis_time = time.time() - start_time
-        logger.info(f"Qualification gap analysis completed in {analysis_time:.2f} seconds")
-
-        # Validate result
-        if result and 'error' not in result:
-            logger.info("✓ Qualification gap analysis completed successfully")
-
-            # Log summary of gaps found
-            if isinstance(result, dict):
-                for category, items in result.items():
-                    if isinstance(items, list) and len(items) > 0:
-                        logger.info(f"Found {len(items)} gaps in {category}")
+        logger.info(f"Recommended actions completed in {analysis_time:.2f} seconds")
+
+        if not narrative or 'error' in narrative:
+            if not gap["missing_technical_skills"]:
+                return narrative or {"error": "No result returned"}
+            # The locally computed gaps are still worth showing
+            logger.warning(f"Narrative analysis failed, returning local skill gaps only: {narrative}")
+            narrative = {}
+
+        result = {
+            "missing_technical_skills": gap["missing_technical_skills"],
+            **{key: narrative.get(key) or [] for key in NARRATIVE_KEYS},
+            "skill_demand": gap["skill_demand"],
+        }
+
+        logger.info("✓ Qualification gap analysis completed successfully")
+        for category, items in result.items():
+            if isinstance(items, list) and len(items) > 0:
+                logger.info(f"Found {len(items)} gaps in {category}")
 
         return result
 
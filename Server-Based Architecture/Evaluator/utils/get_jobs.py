@@ -1,11 +1,52 @@
-import requests
 import logging
+import threading
+import time
+
+from django.db import connection
+from django.utils import timezone
+
 from Core.secrets.parameter_store import *
+from Evaluator.models import Job, JobSearchCache
+from Evaluator.utils.job_index import get_job_index
+from Evaluator.utils.job_search_client import JobSearchClient
 
 logger = logging.getLogger(__name__)
 
 parameter_store = ParameterStoreClient()
-def get_rapid_api_response(user_id,career_field, experience_level, job_location):
+
+
+def get_rapid_api_key():
+    parameter_store_credentials = parameter_store.get_parameters([
+        '/atp-project/django/X_RAPID_API_KEY',
+    ])
+    return parameter_store_credentials.get('/atp-project/django/X_RAPID_API_KEY')
+
+
+# One pooled client per worker process; the key is read from Parameter Store on first use
+job_search_client = JobSearchClient(api_key=get_rapid_api_key)
+
+
+# Pages fetched concurrently per query, and the overall time budget for them
+JOB_SEARCH_PAGES = 5
+JOB_SEARCH_PAGE_SIZE = 10
+JOB_SEARCH_DEADLINE_SECONDS = 8.0
+
+# Local index matches needed before RapidAPI is skipped, and how recently a
+# posting must have been seen by the API to be offered again
+MIN_LOCAL_MATCHES = 10
+LOCAL_MATCH_MAX_AGE = JobSearchCache.FRESH_FOR + JobSearchCache.STALE_FOR
+
+# How long a lookup of a query nobody has cached yet waits for the request
+# already fetching it, and how often it checks
+REFRESH_WAIT_SECONDS = JOB_SEARCH_DEADLINE_SECONDS + 2
+REFRESH_POLL_SECONDS = 0.25
+
+
+def fetch_job_pages(user_id, career_field, experience_level, job_location):
+    """
+    Jobs for a query from RapidAPI as (jobs, report). Several pages are fetched
+    concurrently; report["partial"] is True when some pages missed the deadline.
+    """
     logger.info(f"[{user_id}] attempted to retrieve job from RAPID API."
                 f" {career_field} - {experience_level} - {job_location}")
     location = None
@@ -15,41 +56,137 @@ def get_rapid_api_response(user_id,career_field, experience_level, job_location)
     else:
         location="United States"
 
-    url = "https://jsearch.p.rapidapi.com/search"
-    querystring = {
-        "query": f" {experience_level} {career_field} ",
+    try:
+        return job_search_client.search_pages(
+            query=f" {experience_level} {career_field} ",
+            location=f"{location}",
+            pages=JOB_SEARCH_PAGES,
+            size=JOB_SEARCH_PAGE_SIZE,
+            deadline_seconds=JOB_SEARCH_DEADLINE_SECONDS,
+        )
+
+    except Exception as e:
+        logger.error(f"Error getting response from RAPID API: {e}")
+        return [], {"partial": True}
+    finally:
+        logger.info(f"[JOB SEARCH] Latency summary: {job_search_client.latency_summary()}")
 
-        "page": "1",
-        "num_pages": "1",  # Only 1 page
-        "size": "2",  # Limit to 10 jobs
-        "remote_jobs_only": "false",
-        "location": f"{location}"
-    }
 
+def get_rapid_api_response(user_id,career_field, experience_level, job_location):
+    jobs, _ = fetch_job_pages(user_id, career_field, experience_level, job_location)
+    if not jobs:
+        logger.warning(f"No jobs found for {experience_level} {career_field} in {job_location}")
+    return jobs
 
 
-    try:
-        parameter_store_credentials = parameter_store.get_parameters([
-            '/atp-project/django/X_RAPID_API_KEY',
-        ])
-
-        X_RAPID_API_KEY = parameter_store_credentials.get('/atp-project/django/X_RAPID_API_KEY')
-        headers = {
-            "x-rapidapi-key": X_RAPID_API_KEY,
-            "x-rapidapi-host": "jsearch.p.rapidapi.com"
-        }
-
-        response = requests.get(url, headers=headers, params=querystring)
-        response.raise_for_status()  # Raise an exception for bad status codes
-        data = response.json()
-
-        # Return the actual job data, not a JSON string
-        if data.get('status') == 'OK' and data.get('data'):
-            return data['data']  # This is the list of jobs
-        else:
-            logger.warning(f"No jobs found or API error: {data}")
+def refresh_job_cache(user_id, career_field, experience_level, job_location, entry=None):
+    """Fetch a query from RapidAPI and store it in the shared cache. Returns the jobs."""
+    jobs, report = fetch_job_pages(user_id, career_field, experience_level, job_location)
+    if jobs:
+        # A partial result is stored already stale, so the next lookup refreshes it
+        JobSearchCache.objects.store(career_field, experience_level, job_location, jobs,
+                                     partial=report.get("partial", False))
+        # Every fetched posting becomes searchable locally, not only the linked ones
+        Job.objects.upsert_from_api(jobs)
+    elif entry is not None:
+        # Keep serving the previous snapshot; let the next lookup try again
+        JobSearchCache.objects.release_refresh(entry)
+    return jobs
+
+
+def _refresh_in_background(user_id, career_field, experience_level, job_location, entry):
+    def run():
+        try:
+            refresh_job_cache(user_id, career_field, experience_level, job_location, entry)
+        except Exception as e:
+            logger.error(f"[JOB CACHE] Background refresh failed for {entry}: {e}")
+        finally:
+            connection.close()
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+def _wait_for_refresh(entry):
+    """Jobs stored by the request refreshing an empty entry, or [] if it gives up"""
+    deadline = time.monotonic() + REFRESH_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(REFRESH_POLL_SECONDS)
+        current = JobSearchCache.objects.filter(pk=entry.pk).first()
+        if current is None:
             return []
+        if current.refreshing_since is None:
+            return current.get_jobs()
+    logger.warning(f"[JOB CACHE] Gave up waiting for the refresh of {entry}")
+    return []
+
+
+def get_cached_jobs(user_id, career_field, experience_level, job_location):
+    """
+    Jobs for a query, served from the cross-user JobSearchCache when possible.
+    Fresh entries are returned directly, stale ones are returned while one
+    background refresh runs. Expired entries and misses are fetched from
+    RapidAPI by a single lookup; concurrent lookups get the expired snapshot,
+    or wait for that fetch when there is none.
+    """
+    entry = JobSearchCache.objects.get_entry(career_field, experience_level, job_location)
+    state = entry.state() if entry else "miss"
+    logger.info(f"[JOB CACHE] [{user_id}] {state}: {experience_level} - {career_field} - {job_location}")
+
+    if state == "fresh":
+        JobSearchCache.objects.record_hit(entry)
+        return entry.get_jobs()
+
+    if state == "stale":
+        JobSearchCache.objects.record_hit(entry, stale=True)
+        if JobSearchCache.objects.claim_refresh(entry):
+            _refresh_in_background(user_id, career_field, experience_level, job_location, entry)
+        return entry.get_jobs()
 
+    if entry is None:
+        entry, claimed = JobSearchCache.objects.claim_new_entry(career_field, experience_level, job_location)
+    else:
+        claimed = JobSearchCache.objects.claim_refresh(entry)
+
+    if claimed:
+        jobs = refresh_job_cache(user_id, career_field, experience_level, job_location, entry)
+        if jobs:
+            return jobs
+        # API failed or quota exhausted: an old snapshot beats an empty page
+        logger.warning(f"[JOB CACHE] Serving expired snapshot for {entry}")
+        return entry.get_jobs()
+
+    # Another request is fetching this query
+    jobs = entry.get_jobs()
+    if jobs:
+        JobSearchCache.objects.record_hit(entry, stale=True)
+        return jobs
+    return _wait_for_refresh(entry)
+
+
+def find_local_jobs(career_field, experience_level, job_location):
+    """
+    Ids of stored jobs matching a query, best first, from the in-process index.
+    Only postings with a career field word in their title count: a word in the
+    body alone says too little. Returns [] when fewer than MIN_LOCAL_MATCHES
+    recent postings match, so the caller falls back to the cache and the live API.
+    """
+    try:
+        ranked = get_job_index().search(
+            career_field, experience_level, job_location,
+            limit=JOB_SEARCH_PAGES * JOB_SEARCH_PAGE_SIZE,
+            require_title=True,
+        )
+        # The index is per worker and may lag deletions; the table has the last word
+        recent = set(
+            Job.objects.filter(pk__in=ranked, updated_at__gte=timezone.now() - LOCAL_MATCH_MAX_AGE)
+            .values_list("pk", flat=True)
+        )
     except Exception as e:
-        logger.error(f"Error getting response from RAPID API: {e}")
+        logger.error(f"[JOB INDEX] Local search failed: {e}")
+        return []
+
+    job_ids = [job_id for job_id in ranked if job_id in recent]
+    logger.info(f"[JOB INDEX] {len(job_ids)} local matches for {experience_level} - {career_field} - {job_location}")
+    if len(job_ids) < MIN_LOCAL_MATCHES:
         return []
+    return job_ids
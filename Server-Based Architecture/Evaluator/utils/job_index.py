@@ -0,0 +1,332 @@
+#Evaluator/utils/job_index.py
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+from array import array
+from collections import defaultdict
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# On-disk layout (native byte order, every section 4-byte aligned):
+#   header          magic, term count, posting count
+#   term offsets    n_terms + 1 uint32, byte offsets into the term blob
+#   posting offsets n_terms + 1 uint32, element offsets into the postings
+#   postings        uint32 job ids, sorted within each term
+#   term blob       the sorted terms, utf-8, back to back
+MAGIC = b"JOBIDX01"
+HEADER = struct.Struct("<8sII")
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+STOPWORDS = frozenset({
+    "a", "an", "and", "as", "at", "be", "by", "for", "from", "in", "is", "of", "on",
+    "or", "the", "to", "with", "you", "your", "will", "are", "our", "we",
+})
+# Location words too broad to narrow anything down
+GENERIC_LOCATION_TOKENS = frozenset({"united", "states", "usa", "us", "anywhere", "remote"})
+
+# Title words that place a posting at a seniority; postings with none match any level
+LEVEL_WORDS = {
+    "intern": {"intern", "internship", "trainee", "apprentice"},
+    "entry": {"entry", "junior", "jr", "graduate", "grad", "associate", "beginner"},
+    "senior": {"senior", "sr", "staff", "principal", "lead", "architect", "expert"},
+    "manager": {"manager", "director", "head", "vp", "vice", "chief", "cto", "ceo", "president"},
+}
+# Resume experience_level choice -> title bucket (levels not listed match unlabelled postings only)
+LEVEL_BUCKETS = {
+    "entry_level": "entry", "junior": "entry", "beginner": "entry", "associate": "entry",
+    "intern": "intern", "trainee": "intern",
+    "senior": "senior", "lead": "senior", "principal": "senior", "staff": "senior",
+    "senior_staff": "senior", "architect": "senior", "senior_architect": "senior",
+    "team_lead": "senior", "tech_lead": "senior", "expert": "senior", "senior_consultant": "senior",
+    "manager": "manager", "senior_manager": "manager", "director": "manager",
+    "senior_director": "manager", "vp": "manager", "svp": "manager", "cto": "manager", "ceo": "manager",
+}
+UNLABELLED_LEVEL = "lvl:any"
+
+TITLE_WEIGHT = 3
+BODY_WEIGHT = 1
+# job_highlights sections that describe the work; Benefits ("dental", "health insurance") would match any field
+INDEXED_HIGHLIGHTS = ("Qualifications", "Responsibilities")
+
+
+def tokenize(text):
+    """Lower-case word tokens without stopwords; underscores split, so choice keys tokenize too"""
+    text = str(text or "").lower().replace("_", " ")
+    return [token for token in TOKEN_RE.findall(text) if token not in STOPWORDS]
+
+
+def level_bucket(title_tokens):
+    for bucket, words in LEVEL_WORDS.items():
+        if words.intersection(title_tokens):
+            return bucket
+    return None
+
+
+def job_terms(job):
+    """
+    Index terms for a Job row: title, description, qualification and
+    responsibility words, location, level and remote flag
+    """
+    title_tokens = set(tokenize(job.title))
+    terms = {f"t:{token}" for token in title_tokens}
+
+    terms.update(f"b:{token}" for token in tokenize(job.description))
+    highlights = job.highlights if isinstance(job.highlights, dict) else {}
+    for section in INDEXED_HIGHLIGHTS:
+        items = highlights.get(section)
+        if isinstance(items, list):
+            for item in items:
+                terms.update(f"b:{token}" for token in tokenize(item))
+
+    terms.update(f"loc:{token}" for token in tokenize(job.location))
+    bucket = level_bucket(title_tokens)
+    terms.add(f"lvl:{bucket}" if bucket else UNLABELLED_LEVEL)
+    if job.is_remote:
+        terms.add("remote")
+    return terms
+
+
+class JobIndex:
+    """
+    Inverted index from title, description and qualification words to Job ids.
+
+    A saved index is memory-mapped, so workers share the pages and start
+    without parsing anything; jobs added afterwards are kept in an in-memory
+    delta that search() merges in. save() writes base and delta together.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._mmap = None
+        self._n_terms = 0
+        self._term_offsets = self._posting_offsets = self._postings = None
+        self._blob_start = 0
+        self.loaded_mtime = None
+        # Delta on top of the mapped file
+        self._added = defaultdict(set)
+        self._doc_terms = {}
+        self._replaced = set()
+
+    # ------------------------------------------------------------------ loading
+
+    @classmethod
+    def load(cls, path):
+        """Map a saved index; a missing or unreadable file gives an empty index"""
+        index = cls(path)
+        try:
+            with open(path, "rb") as f:
+                index.loaded_mtime = os.fstat(f.fileno()).st_mtime
+                if os.fstat(f.fileno()).st_size < HEADER.size:
+                    raise ValueError("file too short")
+                index._map(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            logger.info(f"[JOB INDEX] Loaded {index._n_terms} terms from {path}")
+        except FileNotFoundError:
+            logger.info(f"[JOB INDEX] No index at {path}, starting empty")
+        except (OSError, ValueError, struct.error) as e:
+            logger.warning(f"[JOB INDEX] Ignoring unreadable index {path}: {e}")
+            index = cls(path)
+        return index
+
+    def _map(self, mm):
+        magic, n_terms, n_postings = HEADER.unpack_from(mm, 0)
+        if magic != MAGIC:
+            mm.close()
+            raise ValueError("bad magic")
+        view = memoryview(mm)
+        offset = HEADER.size
+        self._term_offsets = view[offset:offset + 4 * (n_terms + 1)].cast("I")
+        offset += 4 * (n_terms + 1)
+        self._posting_offsets = view[offset:offset + 4 * (n_terms + 1)].cast("I")
+        offset += 4 * (n_terms + 1)
+        self._postings = view[offset:offset + 4 * n_postings].cast("I")
+        self._blob_start = offset + 4 * n_postings
+        self._n_terms = n_terms
+        self._mmap = mm
+
+    def _term_at(self, i):
+        start = self._blob_start + self._term_offsets[i]
+        return self._mmap[start:self._blob_start + self._term_offsets[i + 1]]
+
+    def _base_postings(self, term):
+        """Job ids for a term in the mapped file (binary search over the sorted terms)"""
+        if not self._n_terms:
+            return ()
+        key = term.encode("utf-8")
+        lo, hi = 0, self._n_terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == self._n_terms or self._term_at(lo) != key:
+            return ()
+        return self._postings[self._posting_offsets[lo]:self._posting_offsets[lo + 1]]
+
+    # ----------------------------------------------------------------- updating
+
+    def add_jobs(self, jobs):
+        """Index (or re-index) Job rows; called as jobs are stored"""
+        with self._lock:
+            for job in jobs:
+                for term in self._doc_terms.pop(job.pk, ()):
+                    self._added[term].discard(job.pk)
+                terms = job_terms(job)
+                for term in terms:
+                    self._added[term].add(job.pk)
+                self._doc_terms[job.pk] = terms
+                self._replaced.add(job.pk)
+
+    def adopt_delta(self, other):
+        """Carry over jobs another index instance added after its file was mapped"""
+        with other._lock, self._lock:
+            for job_id, terms in other._doc_terms.items():
+                for term in terms:
+                    self._added[term].add(job_id)
+                self._doc_terms[job_id] = terms
+            self._replaced |= other._replaced
+
+    def postings(self, term):
+        """Set of job ids for a term across the mapped file and the delta"""
+        ids = {job_id for job_id in self._base_postings(term) if job_id not in self._replaced}
+        ids.update(self._added.get(term, ()))
+        return ids
+
+    # ------------------------------------------------------------------ queries
+
+    def search(self, career_field, experience_level=None, location=None, limit=50, require_title=False):
+        """
+        Job ids ranked for a career field, best first. A job must mention at least
+        one field word in its title or body (only in its title with require_title),
+        sit at the requested level (or carry no level at all) and be in the
+        location or remote. Title matches weigh more than body matches; newer ids
+        win ties.
+        """
+        field_tokens = set(tokenize(career_field))
+        if not field_tokens:
+            return []
+
+        with self._lock:
+            scores = defaultdict(int)
+            for token in field_tokens:
+                for job_id in self.postings(f"t:{token}"):
+                    scores[job_id] += TITLE_WEIGHT
+                for job_id in self.postings(f"b:{token}"):
+                    scores[job_id] += BODY_WEIGHT
+            if not scores:
+                return []
+
+            candidates = set(scores)
+            if require_title:
+                titled = set()
+                for token in field_tokens:
+                    titled |= self.postings(f"t:{token}")
+                candidates &= titled
+            bucket = LEVEL_BUCKETS.get(str(experience_level or "").lower())
+            if experience_level:
+                allowed = self.postings(UNLABELLED_LEVEL)
+                if bucket:
+                    allowed |= self.postings(f"lvl:{bucket}")
+                candidates &= allowed
+
+            location_tokens = [t for t in tokenize(location) if t not in GENERIC_LOCATION_TOKENS]
+            # "Boston, MA": the city must match; a bare state code is used only when it is all there is
+            required = [t for t in location_tokens if len(t) > 2] or location_tokens
+            if required and candidates:
+                in_location = set(candidates)
+                for token in required:
+                    in_location &= self.postings(f"loc:{token}")
+                candidates = in_location | (candidates & self.postings("remote"))
+
+        ranked = sorted(candidates, key=lambda job_id: (-scores[job_id], -job_id))
+        return ranked[:limit]
+
+    # ------------------------------------------------------------------ writing
+
+    def all_terms(self):
+        """Every term mapped to its sorted job ids, base and delta merged"""
+        merged = {}
+        for i in range(self._n_terms):
+            term = bytes(self._term_at(i)).decode("utf-8")
+            ids = self.postings(term)
+            if ids:
+                merged[term] = ids
+        for term, ids in self._added.items():
+            if ids and term not in merged:
+                merged[term] = set(ids)
+        return {term: sorted(ids) for term, ids in merged.items()}
+
+    def save(self, path=None):
+        """Write the index atomically (temp file + rename) and return the path"""
+        path = path or self.path
+        with self._lock:
+            merged = self.all_terms()
+
+        terms = sorted(merged)
+        encoded = [term.encode("utf-8") for term in terms]
+        term_offsets, posting_offsets, postings = array("I", [0]), array("I", [0]), array("I")
+        for term_bytes, term in zip(encoded, terms):
+            term_offsets.append(term_offsets[-1] + len(term_bytes))
+            postings.extend(merged[term])
+            posting_offsets.append(len(postings))
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(terms), len(postings)))
+            term_offsets.tofile(f)
+            posting_offsets.tofile(f)
+            postings.tofile(f)
+            f.write(b"".join(encoded))
+        os.replace(tmp_path, path)
+        logger.info(f"[JOB INDEX] Saved {len(terms)} terms, {len(postings)} postings to {path}")
+        return path
+
+    @classmethod
+    def build(cls, jobs, path=None):
+        index = cls(path)
+        index.add_jobs(jobs)
+        return index
+
+    def close(self):
+        if self._mmap is not None:
+            for view in (self._term_offsets, self._posting_offsets, self._postings):
+                view.release()
+            self._mmap.close()
+            self._mmap = None
+            self._n_terms = 0
+
+
+_job_index = None
+_job_index_lock = threading.Lock()
+
+
+def get_job_index_path():
+    return getattr(settings, "JOB_INDEX_PATH", os.path.join(settings.BASE_DIR, "job_index.bin"))
+
+
+def get_job_index():
+    """
+    This worker's index, mapped from JOB_INDEX_PATH on first use and re-mapped
+    when build_job_index has written a newer file.
+    """
+    global _job_index
+    path = get_job_index_path()
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        mtime = None
+
+    with _job_index_lock:
+        if _job_index is None or _job_index.path != path or (mtime and mtime != _job_index.loaded_mtime):
+            previous = _job_index
+            _job_index = JobIndex.load(path)
+            if previous is not None and previous.path == path:
+                # Keep what this worker indexed since the last load; rebuilds catch it up for good
+                _job_index.adopt_delta(previous)
+        return _job_index
@@ -0,0 +1,28 @@
+#Evaluator/utils/job_payload.py
+import gzip
+import io
+
+from Evaluator.utils.json_codec import dumps_bytes, loads
+
+# Same layout as the Lambda side (lambda5/job_store.py): gzip over minified JSON lines, one job per line
+GZIP_LEVEL = 6
+
+
+def compact_job(job, keys):
+    """Only the given keys of a JSearch job dict, with empty values left out"""
+    return {key: job[key] for key in keys if job.get(key) not in (None, "", [], {})}
+
+
+def pack_jobs(jobs, keys):
+    """Compress JSearch job dicts to gzipped JSON lines, keeping only `keys`"""
+    lines = b"\n".join(dumps_bytes(compact_job(job, keys)) for job in jobs)
+    return gzip.compress(lines, compresslevel=GZIP_LEVEL)
+
+
+def iter_packed_jobs(blob):
+    """Decode packed jobs one at a time, decompressing only as far as the caller reads"""
+    if not blob:
+        return
+    with gzip.GzipFile(fileobj=io.BytesIO(bytes(blob))) as lines:
+        for line in lines:
+            yield loads(line)
@@ -0,0 +1,71 @@
+#Evaluator/utils/job_qualifications.py
+import threading
+from collections import OrderedDict
+
+# Phrases that mark a description sentence as a qualification, in the order they are reported
+QUALIFICATION_KEYWORDS = (
+    "bachelor", "master", "degree", "certification", "certified",
+    "experience", "years", "knowledge of", "proficiency in",
+    "skilled in", "familiar with", "expertise in",
+)
+MIN_SENTENCE_LENGTH = 10
+
+CACHE_SIZE = 4096
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _lower_same_length(text):
+    """Lower-cased text whose offsets line up with the original"""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # A few characters lower-case to two ("İ"); leave those as they are
+    return "".join(char if len(char.lower()) != 1 else char.lower() for char in text)
+
+
+def description_qualifications(description):
+    """
+    The first sentence (over 10 characters, sentences split on periods)
+    mentioning each qualification keyword, in keyword order.
+
+    The description is lower-cased once and each keyword is located with
+    str.find; only the sentence around a hit is cut out, so the description
+    is never re-split or re-lowered per keyword.
+    """
+    if not description:
+        return []
+    lowered = _lower_same_length(description)
+    found = []
+    for keyword in QUALIFICATION_KEYWORDS:
+        position = lowered.find(keyword)
+        while position >= 0:
+            start = lowered.rfind(".", 0, position) + 1
+            end = lowered.find(".", position)
+            if end < 0:
+                end = len(lowered)
+            sentence = description[start:end].strip()
+            if len(sentence) > MIN_SENTENCE_LENGTH:
+                found.append(sentence)
+                break
+            position = lowered.find(keyword, end)
+    return found
+
+
+def cached_description_qualifications(job_id, description):
+    """description_qualifications from a per-process LRU keyed by job id and description hash"""
+    if not job_id or not description:
+        return description_qualifications(description)
+    key = (job_id, hash(description))
+    with _cache_lock:
+        found = _cache.get(key)
+        if found is not None:
+            _cache.move_to_end(key)
+            return found
+
+    found = description_qualifications(description)
+    with _cache_lock:
+        _cache[key] = found
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return found
@@ -0,0 +1,272 @@
+#Evaluator/utils/job_ranking.py
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+
+import numpy as np
+from scipy import sparse
+
+from Evaluator.utils.job_index import STOPWORDS, TOKEN_RE, tokenize
+from Evaluator.utils.job_records import JobPosting, parse_jobs
+from Evaluator.utils.skill_demand import job_skill_matrix, skill_matcher
+
+logger = logging.getLogger(__name__)
+
+# BM25 parameters
+K1 = 1.5
+B = 0.75
+
+# How much each part of the resume counts toward the query
+SKILLS_WEIGHT = 3.0
+EXPERIENCE_TITLE_WEIGHT = 1.5
+EXPERIENCE_DESCRIPTION_WEIGHT = 0.5
+EDUCATION_WEIGHT = 1.0
+
+
+def job_text(job):
+    """Title, highlights and description of a JobPosting as one string"""
+    parts = [job.title]
+    for items in job.highlights.values():
+        parts.extend(items)
+    parts.append(job.description)
+    return " ".join(parts)
+
+
+def _as_list(value):
+    if isinstance(value, list):
+        return value
+    if isinstance(value, str) and value.strip():
+        return [part.strip() for part in value.split(",") if part.strip()]
+    return []
+
+
+def resume_skills(resume_data):
+    return [str(skill).strip() for skill in _as_list((resume_data or {}).get("skills")) if str(skill).strip()]
+
+
+def resume_skill_text(resume_data):
+    """Skills, experience, education and certifications of a resume as one string"""
+    resume_data = resume_data if isinstance(resume_data, dict) else {}
+    parts = []
+    for key in ("skills", "certifications", "experience", "education"):
+        for entry in _as_list(resume_data.get(key)):
+            parts.extend(str(value) for value in (entry.values() if isinstance(entry, dict) else [entry]) if value)
+    return " \n ".join(parts)
+
+
+def resume_query(resume_data):
+    """Weighted term counts for the resume's skills, experience and education"""
+    resume_data = resume_data if isinstance(resume_data, dict) else {}
+    query = Counter()
+
+    def add(text, weight):
+        for token in tokenize(text):
+            query[token] += weight
+
+    for skill in resume_skills(resume_data):
+        add(skill, SKILLS_WEIGHT)
+    for entry in _as_list(resume_data.get("experience")):
+        if isinstance(entry, dict):
+            add(entry.get("title"), EXPERIENCE_TITLE_WEIGHT)
+            add(entry.get("description"), EXPERIENCE_DESCRIPTION_WEIGHT)
+        else:
+            add(entry, EXPERIENCE_DESCRIPTION_WEIGHT)
+    for entry in _as_list(resume_data.get("education")):
+        if isinstance(entry, dict):
+            add(" ".join(str(entry.get(key) or "") for key in ("degree", "details")), EDUCATION_WEIGHT)
+        else:
+            add(entry, EDUCATION_WEIGHT)
+    return query
+
+
+def term_matrix(texts):
+    """
+    CSR matrix of term counts (one row per text) and the vocabulary built
+    while tokenizing. This is the only per-document Python loop.
+    """
+    vocabulary = {}
+    indices, data, indptr = [], [], [0]
+    for text in texts:
+        # Same tokens as job_index.tokenize, counted before stopwords are dropped
+        for term, count in Counter(TOKEN_RE.findall(text.lower().replace("_", " "))).items():
+            if term not in STOPWORDS:
+                indices.append(vocabulary.setdefault(term, len(vocabulary)))
+                data.append(count)
+        indptr.append(len(indices))
+    matrix = sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int32)),
+        shape=(len(indptr) - 1, len(vocabulary)),
+    )
+    return matrix, vocabulary
+
+
+def bm25_weights(tf, k1=K1, b=B):
+    """BM25 term weights for every (document, term) entry of a count matrix, in one pass over tf.data"""
+    n_docs = tf.shape[0]
+    df = np.bincount(tf.indices, minlength=tf.shape[1])
+    idf = np.log1p((n_docs - df + 0.5) / (df + 0.5)).astype(np.float32)
+    doc_len = np.asarray(tf.sum(axis=1), dtype=np.float32).ravel()
+    avg_len = float(doc_len.mean()) if n_docs else 0.0
+    avg_len = avg_len or 1.0
+
+    rows = np.repeat(np.arange(n_docs), np.diff(tf.indptr))
+    norm = k1 * (1.0 - b + b * doc_len[rows] / avg_len)
+    weights = tf.copy()
+    weights.data = (tf.data * (k1 + 1.0) / (tf.data + norm) * idf[tf.indices]).astype(np.float32)
+    return weights
+
+
+def phrase_matrix(phrases, vocabulary):
+    """
+    Phrase-by-term incidence for the phrases whose words all occur in the
+    vocabulary, plus each phrase's word count. A phrase counts as present in a
+    document when all of its words are.
+    """
+    rows, cols, lengths, kept = [], [], [], []
+    for phrase in phrases:
+        terms = set(tokenize(phrase))
+        if not terms or any(term not in vocabulary for term in terms):
+            continue
+        row = len(kept)
+        rows.extend([row] * len(terms))
+        cols.extend(vocabulary[term] for term in terms)
+        lengths.append(len(terms))
+        kept.append(phrase)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32), (rows, cols)), shape=(len(kept), len(vocabulary))
+    )
+    return matrix, np.asarray(lengths, dtype=np.float32), kept
+
+
+def phrases_present(presence, phrases, vocabulary):
+    """Boolean (documents x phrases) matrix and the phrases it covers"""
+    matrix, lengths, kept = phrase_matrix(phrases, vocabulary)
+    if not kept:
+        return np.zeros((presence.shape[0], 0), dtype=bool), kept
+    hits = (presence @ matrix.T).toarray()
+    return hits >= lengths, kept
+
+
+class JobMatrix:
+    """
+    Everything about a job set that does not depend on the resume: BM25
+    weights, term presence and which vocabulary skills each posting mentions.
+    Built once per job set and reused for every resume ranked against it.
+    """
+
+    def __init__(self, jobs):
+        jobs = parse_jobs(jobs)
+        tf, self.vocabulary = term_matrix(job_text(job) for job in jobs)
+        self.size = tf.shape[0]
+        self.weights = bm25_weights(tf)
+        self.presence = tf.copy()
+        self.presence.data[:] = 1.0
+
+        # Jobs x vocabulary skills, columns ordered by how many postings ask for the skill
+        job_skills, _ = job_skill_matrix(jobs)
+        by_demand = np.argsort(-job_skills.sum(axis=0), kind="stable")
+        self.job_skills = job_skills[:, by_demand]
+        self.skill_names = [skill_matcher.skill_names[i] for i in by_demand]
+
+
+MATRIX_CACHE_SIZE = 64
+_matrix_cache = OrderedDict()
+_matrix_cache_lock = threading.Lock()
+
+
+def get_job_matrix(cache_key, load_jobs):
+    """JobMatrix for a job set from the per-process LRU; load_jobs() is only called on a miss"""
+    with _matrix_cache_lock:
+        matrix = _matrix_cache.get(cache_key)
+        if matrix is not None:
+            _matrix_cache.move_to_end(cache_key)
+            return matrix
+
+    matrix = JobMatrix(load_jobs())
+    with _matrix_cache_lock:
+        _matrix_cache[cache_key] = matrix
+        while len(_matrix_cache) > MATRIX_CACHE_SIZE:
+            _matrix_cache.popitem(last=False)
+    return matrix
+
+
+def _row_lists(hits, labels):
+    """Per-row lists of labels for the True cells of a boolean matrix, in column order"""
+    rows = [[] for _ in range(hits.shape[0])]
+    row_index, column_index = np.nonzero(hits)
+    for row, column in zip(row_index.tolist(), column_index.tolist()):
+        rows[row].append(labels[column])
+    return rows
+
+
+def rank_jobs(resume_data, jobs):
+    """
+    Score JSearch-style job dicts (or a prebuilt JobMatrix) against a resume
+    with BM25 and return one entry per job, best first:
+        {"index", "score", "match_percent", "matched_skills", "missing_skills"}
+    `index` points back into `jobs`. matched_skills are the resume's own skills
+    found in the posting; missing_skills are vocabulary skills the posting
+    mentions that the resume does not, most demanded across the set first.
+    Ties keep the incoming order.
+    """
+    start = time.perf_counter()
+    matrix = jobs if isinstance(jobs, JobMatrix) else JobMatrix(jobs or [])
+    if not matrix.size:
+        return []
+    vocabulary = matrix.vocabulary
+
+    query = resume_query(resume_data)
+    query_vector = np.zeros(len(vocabulary), dtype=np.float32)
+    for term, weight in query.items():
+        column = vocabulary.get(term)
+        if column is not None:
+            query_vector[column] = weight
+    scores = matrix.weights @ query_vector
+
+    # Resume skills present in each posting
+    skill_hits, found_skills = phrases_present(matrix.presence, resume_skills(resume_data), vocabulary)
+    matched = _row_lists(skill_hits, found_skills)
+
+    # Vocabulary skills in each posting, less those the resume already shows
+    on_resume = set(skill_matcher.find(resume_skill_text(resume_data)))
+    covered = np.array([name in on_resume for name in matrix.skill_names], dtype=bool)
+    missing = _row_lists(matrix.job_skills & ~covered, matrix.skill_names)
+
+    order = np.argsort(-scores, kind="stable").tolist()
+    top = float(scores[order[0]])
+    percents = (np.rint(100 * scores / top) if top > 0 else np.zeros_like(scores)).astype(int).tolist()
+    scores = scores.tolist()
+    ranked = [
+        {
+            "index": i,
+            "score": scores[i],
+            "match_percent": percents[i],
+            "matched_skills": matched[i],
+            "missing_skills": missing[i],
+        }
+        for i in order
+    ]
+
+    logger.info(f"[JOB RANKING] Ranked {matrix.size} jobs over {len(vocabulary)} terms "
+                f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+    return ranked
+
+
+def rank_job_rows(resume_data, jobs):
+    """
+    Rank a Job queryset against a resume. Returns (job_ids, ranking) where
+    ranking[n]["index"] points into job_ids. The job-side matrix is cached per
+    (id, updated_at) set, so descriptions are only loaded and tokenized when
+    the set changes.
+    """
+    job_keys = tuple(jobs.values_list("pk", "updated_at"))
+    job_ids = [pk for pk, _ in job_keys]
+
+    def load_jobs():
+        rows = jobs.model.objects.only(*jobs.model.QUALIFICATION_FIELDS).in_bulk(job_ids)
+        # Keep positions aligned with job_ids even if a row vanished in between
+        return [JobPosting.from_row(rows[pk]) if pk in rows else JobPosting() for pk in job_ids]
+
+    matrix = get_job_matrix(job_keys, load_jobs)
+    return job_ids, rank_jobs(resume_data, matrix)
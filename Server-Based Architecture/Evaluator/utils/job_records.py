@@ -0,0 +1,213 @@
+#Evaluator/utils/job_records.py
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from Evaluator.utils.json_codec import JSONDecodeError, loads
+
+logger = logging.getLogger(__name__)
+
+QUALIFICATIONS = "Qualifications"
+
+
+def _decoded_list(value):
+    """A list as given, a JSON-encoded list decoded, any other non-empty string as one item"""
+    if isinstance(value, (list, tuple)):
+        return value
+    if isinstance(value, str):
+        value = value.strip()
+        if value.startswith("["):
+            try:
+                decoded = loads(value)
+                if isinstance(decoded, list):
+                    return decoded
+            except JSONDecodeError:
+                pass
+        return [value] if value else []
+    return []
+
+
+def _string_list(value):
+    return tuple(str(item) for item in _decoded_list(value) if item not in (None, ""))
+
+
+def _highlights(value):
+    """JSearch job_highlights as {section: (item, ...)}; sections that are not lists are dropped"""
+    if not isinstance(value, dict):
+        return {}
+    return {str(section): _string_list(items) for section, items in value.items() if isinstance(items, list)}
+
+
+@dataclass(slots=True)
+class JobPosting:
+    """
+    One job posting, parsed once from a JSearch dict or a Job row. Downstream
+    code reads attributes and can rely on their types: strings are never None
+    and highlights is always a dict of string tuples.
+    """
+    job_id: str = ""
+    title: str = ""
+    employer_name: str = ""
+    location: str = ""
+    is_remote: bool = False
+    min_salary: Optional[float] = None
+    max_salary: Optional[float] = None
+    salary_period: Optional[str] = None
+    posted_at: Optional[str] = None
+    employment_type: Optional[str] = None
+    apply_link: Optional[str] = None
+    google_link: Optional[str] = None
+    description: str = ""
+    highlights: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+
+    @classmethod
+    def from_api(cls, job):
+        """From a JSearch /search result dict"""
+        return cls(
+            job_id=str(job.get("job_id") or ""),
+            title=str(job.get("job_title") or ""),
+            employer_name=str(job.get("employer_name") or ""),
+            location=str(job.get("job_location") or ""),
+            is_remote=bool(job.get("job_is_remote")),
+            min_salary=job.get("job_min_salary"),
+            max_salary=job.get("job_max_salary"),
+            salary_period=job.get("job_salary_period"),
+            posted_at=job.get("job_posted_at_datetime_utc") or job.get("job_posted_at"),
+            employment_type=job.get("job_employment_type"),
+            apply_link=job.get("job_apply_link"),
+            google_link=job.get("job_google_link"),
+            description=str(job.get("job_description") or ""),
+            highlights=_highlights(job.get("job_highlights")),
+        )
+
+    @classmethod
+    def from_row(cls, job):
+        """
+        From a Job row. Only loaded columns are read (a deferred column is
+        missing from the instance __dict__), so rows fetched with only()/defer()
+        never trigger a query per column.
+        """
+        values = job.__dict__
+        details = values.get("details") or {}
+        posted_at = values.get("posted_at")
+        return cls(
+            job_id=values.get("provider_job_id") or "",
+            title=values.get("title") or "",
+            employer_name=values.get("employer_name") or "",
+            location=values.get("location") or "",
+            is_remote=bool(values.get("is_remote")),
+            min_salary=values.get("min_salary"),
+            max_salary=values.get("max_salary"),
+            salary_period=details.get("job_salary_period"),
+            posted_at=posted_at.isoformat() if posted_at else details.get("job_posted_at"),
+            employment_type=details.get("job_employment_type"),
+            apply_link=details.get("job_apply_link"),
+            google_link=details.get("job_google_link"),
+            description=values.get("description") or "",
+            highlights=_highlights(values.get("highlights")),
+        )
+
+    @property
+    def qualifications(self):
+        return self.highlights.get(QUALIFICATIONS, ())
+
+    @property
+    def annual_salary(self):
+        """Midpoint of the posted salary range when it is yearly (or the period is unknown)"""
+        salaries = [value for value in (self.min_salary, self.max_salary) if value is not None]
+        if not salaries or self.salary_period not in (None, "YEAR"):
+            return None
+        return sum(salaries) / len(salaries)
+
+    def highlight_text(self, section=None, exclude=None):
+        """One highlights section, or every section but `exclude`, joined into one string"""
+        if section:
+            sections = [self.highlights.get(section, ())]
+        else:
+            sections = [items for name, items in self.highlights.items() if name != exclude]
+        return " \n ".join(item for items in sections for item in items)
+
+
+def parse_jobs(payload):
+    """
+    The one place job data is coerced into JobPostings. Accepts a JSON string,
+    a JSearch response ({"data": [...]}), a single job dict, a list of job
+    dicts, Job rows (a queryset, its iterator or a Paginator page) or
+    JobPostings, which pass through unchanged. Anything else is dropped.
+    """
+    if isinstance(payload, (str, bytes)):
+        try:
+            payload = loads(payload)
+        except JSONDecodeError as e:
+            logger.error(f"[JOB RECORDS] Failed to parse jobs JSON: {e}")
+            return []
+    if isinstance(payload, dict):
+        if "data" in payload:
+            return parse_jobs(payload["data"])
+        payload = [payload]
+    if not payload or not hasattr(payload, "__iter__"):
+        return []
+
+    postings = []
+    for job in payload:
+        if isinstance(job, JobPosting):
+            postings.append(job)
+        elif isinstance(job, dict):
+            postings.append(JobPosting.from_api(job))
+        elif hasattr(job, "_meta"):
+            postings.append(JobPosting.from_row(job))
+    return postings
+
+
+def _education(value):
+    """Education entries as strings; {"degree", "field_of_study"} dicts become "degree in field" """
+    entries = []
+    for entry in _decoded_list(value):
+        if isinstance(entry, dict):
+            degree, field_of_study = entry.get("degree", ""), entry.get("field_of_study", "")
+            entry = f"{degree} in {field_of_study}" if degree and field_of_study else degree or field_of_study
+        if entry:
+            entries.append(str(entry))
+    return tuple(entries)
+
+
+@dataclass(slots=True)
+class Recommendation:
+    """Skills and credentials recommended for a resume, each a tuple of strings"""
+    education: Tuple[str, ...] = ()
+    hard_skills: Tuple[str, ...] = ()
+    soft_skills: Tuple[str, ...] = ()
+    certifications: Tuple[str, ...] = ()
+    license: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_api(cls, result):
+        """From a result dict whose fields may be lists or JSON-encoded lists"""
+        return cls(
+            education=_education(result.get("education")),
+            hard_skills=_string_list(result.get("hard_skills")),
+            soft_skills=_string_list(result.get("soft_skills")),
+            certifications=_string_list(result.get("certifications")),
+            license=_string_list(result.get("license")),
+        )
+
+
+def parse_recommendations(payload):
+    """
+    Recommendations from a JSON string, a single flat result (with hard_skills
+    and soft_skills) or a {"data": [...]} list of results.
+    """
+    if isinstance(payload, (str, bytes)):
+        try:
+            payload = loads(payload)
+        except JSONDecodeError as e:
+            logger.error(f"[JOB RECORDS] Failed to parse recommendations JSON: {e}")
+            return []
+    if not isinstance(payload, dict):
+        return []
+    if "hard_skills" in payload and "soft_skills" in payload:
+        return [Recommendation.from_api(payload)]
+    results = payload.get("data")
+    if not isinstance(results, list):
+        return []
+    return [Recommendation.from_api(result) for result in results if isinstance(result, dict)]
@@ -0,0 +1,190 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+class JobSearchClient:
+    """
+    JSearch (RapidAPI) client on one pooled requests.Session.
+
+    Connections are kept alive between calls, every request has connect/read
+    timeouts, and connection errors and 429/5xx responses are retried a bounded
+    number of times with exponential backoff (honouring Retry-After up to
+    max_retry_after seconds). Given a deadline, a call shrinks its timeouts to
+    fit and starts no retry it could not finish, so concurrent page fetches end
+    with it. Per-call latency is recorded so slow upstream periods show up in
+    the logs.
+    """
+    URL = "https://jsearch.p.rapidapi.com/search"
+    HOST = "jsearch.p.rapidapi.com"
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self, api_key, connect_timeout=3.05, read_timeout=10, max_retries=3,
+                 backoff_factor=0.5, max_retry_after=5, pool_maxsize=10, latency_window=500):
+        # api_key may be a string or a zero-argument callable, resolved on first use
+        self._api_key_source = api_key
+        self._api_key = None if callable(api_key) else api_key
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_retry_after = max_retry_after
+
+        # Retries are done in search() so they can be fitted into a deadline
+        adapter = requests.adapters.HTTPAdapter(max_retries=0, pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        # One bounded pool for every search_pages call, no larger than the connection pool
+        self._executor = ThreadPoolExecutor(max_workers=pool_maxsize, thread_name_prefix="job-search")
+
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=latency_window)
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+
+    @property
+    def api_key(self):
+        # Only a successful lookup is kept, so a Parameter Store hiccup is retried next call
+        if not self._api_key and callable(self._api_key_source):
+            self._api_key = self._api_key_source()
+        return self._api_key
+
+    def _timeouts(self, deadline):
+        """(connect, read) timeouts for one attempt, cut to what is left before deadline"""
+        if deadline is None:
+            return self.timeout
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise requests.Timeout("job search deadline passed")
+        return tuple(min(timeout, remaining) for timeout in self.timeout)
+
+    def _retry_delay(self, retries, response=None):
+        delay = self.backoff_factor * (2 ** retries)
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, min(int(retry_after), self.max_retry_after))
+        return delay
+
+    def _may_retry(self, retries, delay, deadline):
+        if retries >= self.max_retries:
+            return False
+        return deadline is None or time.monotonic() + delay < deadline
+
+    def search(self, query, location, page=1, num_pages=1, size=10, remote_jobs_only=False, deadline=None):
+        """
+        Run one JSearch query and return the decoded JSON body. Raises on HTTP
+        errors. deadline is a time.monotonic() value the call must finish by.
+        """
+        params = {
+            "query": query,
+            "page": str(page),
+            "num_pages": str(num_pages),
+            "size": str(size),
+            "remote_jobs_only": "true" if remote_jobs_only else "false",
+            "location": location,
+        }
+        headers = {
+            "x-rapidapi-key": self.api_key,
+            "x-rapidapi-host": self.HOST,
+        }
+
+        start = time.perf_counter()
+        status, retries = None, 0
+        try:
+            while True:
+                try:
+                    response = self.session.get(self.URL, headers=headers, params=params,
+                                                timeout=self._timeouts(deadline))
+                except (requests.ConnectionError, requests.Timeout):
+                    delay = self._retry_delay(retries)
+                    if not self._may_retry(retries, delay, deadline):
+                        raise
+                else:
+                    status = response.status_code
+                    delay = self._retry_delay(retries, response)
+                    if status not in self.RETRY_STATUSES or not self._may_retry(retries, delay, deadline):
+                        break
+                retries += 1
+                time.sleep(delay)
+            response.raise_for_status()
+            return response.json()
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            latency_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self.calls += 1
+                self.retries += retries
+                self._latencies.append(latency_ms)
+            logger.info(f"[JOB SEARCH] page={page} status={status} retries={retries} "
+                        f"latency_ms={latency_ms:.0f}")
+
+    def search_pages(self, query, location, pages=5, size=10, deadline_seconds=8.0, remote_jobs_only=False):
+        """
+        Fetch pages 1..pages concurrently under one overall deadline.
+
+        Returns (jobs, report): jobs from the pages that answered in time, in page
+        order and de-duplicated by job_id, and a report of which pages were late
+        or failed. Late pages are abandoned, so the result may be partial.
+        """
+        deadline = time.monotonic() + deadline_seconds
+        futures = {
+            self._executor.submit(self.search, query, location, page=page, num_pages=1, size=size,
+                                  remote_jobs_only=remote_jobs_only, deadline=deadline): page
+            for page in range(1, pages + 1)
+        }
+        done, late = wait(futures, timeout=deadline_seconds)
+        # Pages still queued are dropped; running ones give up at the same deadline
+        for future in late:
+            future.cancel()
+
+        pages_data, failed = {}, []
+        for future in done:
+            page = futures[future]
+            try:
+                pages_data[page] = future.result().get("data") or []
+            except Exception as e:
+                logger.warning(f"[JOB SEARCH] page={page} failed: {e}")
+                failed.append(page)
+
+        jobs, seen = [], set()
+        for page in sorted(pages_data):
+            for job in pages_data[page]:
+                job_id = job.get("job_id") if isinstance(job, dict) else None
+                if job_id is not None:
+                    if job_id in seen:
+                        continue
+                    seen.add(job_id)
+                jobs.append(job)
+
+        report = {
+            "pages_requested": pages,
+            "pages_ok": sorted(pages_data),
+            "pages_failed": sorted(failed),
+            "pages_late": sorted(futures[f] for f in late),
+            "partial": bool(failed or late),
+        }
+        logger.info(f"[JOB SEARCH] {len(jobs)} unique jobs from {len(pages_data)}/{pages} pages "
+                    f"(late={report['pages_late']}, failed={report['pages_failed']})")
+        return jobs, report
+
+    def latency_summary(self):
+        """Call counts plus p50/p95/max latency (ms) over the recent window"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            summary = {"calls": self.calls, "errors": self.errors, "retries": self.retries}
+        if not latencies:
+            return {**summary, "p50_ms": None, "p95_ms": None, "max_ms": None}
+
+        def percentile(p):
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 1)
+
+        return {**summary, "p50_ms": percentile(0.50), "p95_ms": percentile(0.95), "max_ms": round(latencies[-1], 1)}
@@ -0,0 +1,38 @@
+#Evaluator/utils/json_codec.py
+import json
+
+# orjson when it is installed; otherwise the standard library, configured to write the same text
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+JSONDecodeError = json.JSONDecodeError  # orjson's decode error subclasses it
+
+
+def dumps_bytes(value):
+    """Minified UTF-8 JSON"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # integers over 64 bits and other values only the standard library encodes
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def dumps(value):
+    """Minified JSON text"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def loads(data):
+    """Parse JSON from str, bytes or a memoryview"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(bytes(data) if isinstance(data, memoryview) else data)
@@ -0,0 +1,95 @@
+#Evaluator/utils/page_cache.py
+import hashlib
+import logging
+import threading
+import time
+
+from django.contrib import messages
+from django.core.cache import cache
+from django.middleware.csrf import get_token
+from django.utils.cache import get_conditional_response, patch_cache_control, quote_etag
+from django.utils.safestring import mark_safe
+
+logger = logging.getLogger(__name__)
+
+# Keys carry Resume.version, so a write makes old fragments unreachable; the timeout only reclaims space
+FRAGMENT_TIMEOUT = 60 * 60 * 24
+
+_stats_lock = threading.Lock()
+_stats = {}
+
+
+def fragment_key(name, resume, *parts):
+    """Cache key of one rendered fragment of a resume's page at its current version"""
+    suffix = "".join(f":{part}" for part in parts)
+    return f"resume-fragment:{name}:{resume.pk}:v{resume.version}{suffix}"
+
+
+def page_etag(request, key):
+    """
+    ETag of a page built around a fragment. The header renders a CSRF token,
+    so the session's CSRF secret is part of it: a new login gets a fresh page.
+    """
+    # get_token() picks the secret for a first visit now, so this ETag matches the cookie sent with the page
+    get_token(request)
+    csrf_secret = request.META.get("CSRF_COOKIE", "")
+    return quote_etag(hashlib.sha256(f"{key}|{csrf_secret}".encode("utf-8")).hexdigest()[:32])
+
+
+def not_modified(request, etag):
+    """304 response when the browser already has this page, otherwise None"""
+    # A pending flash message has to be rendered, which a 304 would not do
+    if len(messages.get_messages(request)):
+        return None
+    return get_conditional_response(request, etag=etag)
+
+
+def revalidate(response, etag):
+    """Let browsers keep the page but always ask whether it is still current"""
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def cached_fragment(name, key, render):
+    """
+    The fragment stored under key, or render() it, store it and return it.
+    render() may return None when there is nothing to show; that is not cached.
+    """
+    fragment = cache.get(key)
+    if fragment is not None:
+        _record(name, hit=True)
+        return mark_safe(fragment)
+
+    start = time.perf_counter()
+    fragment = render()
+    elapsed = time.perf_counter() - start
+    if fragment is None:
+        return None
+    cache.set(key, str(fragment), FRAGMENT_TIMEOUT)
+    _record(name, hit=False, render_seconds=elapsed)
+    logger.info(f"[PAGE CACHE] Rendered {key} in {elapsed * 1000:.1f} ms")
+    return mark_safe(fragment)
+
+
+def _record(name, hit, render_seconds=0.0):
+    with _stats_lock:
+        stats = _stats.setdefault(name, {"hits": 0, "misses": 0, "render_seconds": 0.0})
+        if hit:
+            stats["hits"] += 1
+        else:
+            stats["misses"] += 1
+            stats["render_seconds"] += render_seconds
+
+
+def stats():
+    """
+    Hits, misses and render time saved per fragment in this process. Saved
+    time assumes each hit would have cost the average measured miss.
+    """
+    with _stats_lock:
+        report = {}
+        for name, stats in _stats.items():
+            average = stats["render_seconds"] / stats["misses"] if stats["misses"] else 0.0
+            report[name] = {**stats, "average_render_seconds": average, "saved_seconds": average * stats["hits"]}
+        return report
@@ -0,0 +1,167 @@
+#Evaluator/utils/qualification_clusters.py
+import logging
+import time
+import zlib
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+from Evaluator.utils.job_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Words that change the wording of a requirement but not what it asks for
+FILLER_WORDS = frozenset({
+    "minimum", "least", "required", "requirement", "requirements", "preferred", "plus",
+    "strong", "solid", "proven", "demonstrated", "excellent", "good", "ability", "must",
+    "have", "has", "having", "working", "professional", "related", "relevant", "including",
+    "etc", "e", "g", "s", "such", "this", "that", "in", "with", "of", "or", "field", "fields",
+    "able", "willing", "willingness", "hold", "up", "per", "well", "legally", "any",
+})
+# Abbreviations folded into the word they stand for
+SYNONYMS = {
+    "bs": "bachelor", "ba": "bachelor", "bsc": "bachelor", "undergraduate": "bachelor",
+    "ms": "master", "msc": "master", "ma": "master",
+    "yr": "year", "yrs": "year", "experienced": "experience",
+    "comp": "computer", "cs": "computer science",
+    "one": "1", "two": "2", "three": "3", "four": "4", "five": "5",
+    "six": "6", "seven": "7", "eight": "8", "nine": "9", "ten": "10",
+}
+
+# MinHash: NUM_PERM hash functions in BANDS bands of ROWS; lines sharing a band are candidates
+NUM_PERM = 128
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+# Lines whose signatures agree on this share of hashes are the same requirement.
+# Above 0.6, so "Bachelor's degree in CS" and "Master's degree in CS" stay apart.
+SIMILARITY = 0.7
+MERSENNE_PRIME = (1 << 31) - 1
+
+_rng = np.random.default_rng(20240601)
+_HASH_A = _rng.integers(1, MERSENNE_PRIME, NUM_PERM, dtype=np.int64)
+_HASH_B = _rng.integers(0, MERSENNE_PRIME, NUM_PERM, dtype=np.int64)
+
+
+def _normalize(token):
+    token = token.rstrip("+")
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        token = token[:-1]
+    return SYNONYMS.get(token, token)
+
+
+def shingles(text):
+    """
+    Normalized word set of a qualification line: no stopwords or filler words,
+    "3+" read as "3", plurals and common abbreviations folded.
+    """
+    words = set()
+    for token in tokenize(text):
+        if token not in FILLER_WORDS:
+            words.update(_normalize(token).split())
+    return words
+
+
+def minhash_signatures(shingle_sets):
+    """
+    (lines x NUM_PERM) MinHash signatures, computed for every shingle of every
+    line at once. Lines without shingles get a row of -1, which matches nothing.
+    """
+    lengths = np.fromiter((len(s) for s in shingle_sets), dtype=np.int64, count=len(shingle_sets))
+    signatures = np.full((len(shingle_sets), NUM_PERM), -1, dtype=np.int64)
+    if not lengths.sum():
+        return signatures
+
+    values = np.fromiter(
+        (zlib.crc32(shingle.encode("utf-8")) for s in shingle_sets for shingle in s),
+        dtype=np.int64, count=int(lengths.sum()),
+    ) % MERSENNE_PRIME
+    hashed = (values[:, None] * _HASH_A + _HASH_B) % MERSENNE_PRIME
+
+    present = lengths > 0
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))[present]
+    signatures[present] = np.minimum.reduceat(hashed, starts, axis=0)
+    return signatures
+
+
+def near_duplicate_groups(signatures, threshold=SIMILARITY):
+    """
+    Component label per line. LSH bands propose candidate pairs (each line
+    paired with the first line in its bucket), pairs whose signatures agree on
+    at least `threshold` of the hashes are linked, and connected components
+    become the groups.
+    """
+    n = signatures.shape[0]
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    valid = signatures[:, 0] >= 0
+    rows, cols = [], []
+    for band in range(BANDS):
+        block = signatures[:, band * ROWS:(band + 1) * ROWS]
+        _, first, inverse = np.unique(block, axis=0, return_index=True, return_inverse=True)
+        leader = first[inverse.ravel()]
+        candidate = (leader != np.arange(n)) & valid
+        members, leaders = np.flatnonzero(candidate), leader[candidate]
+        agreement = (signatures[members] == signatures[leaders]).mean(axis=1)
+        keep = agreement >= threshold
+        rows.append(members[keep])
+        cols.append(leaders[keep])
+
+    rows, cols = np.concatenate(rows), np.concatenate(cols)
+    graph = sparse.csr_matrix((np.ones(len(rows), dtype=np.int8), (rows, cols)), shape=(n, n))
+    _, labels = connected_components(graph, directed=False)
+    return labels
+
+
+def collapse_qualifications(job_lines, total_jobs=None):
+    """
+    Collapse near-duplicate qualification lines across postings.
+
+    job_lines is an iterable of (job_number, line). Returns one entry per group,
+    most widely requested first:
+        {"text", "jobs", "total_jobs", "wordings"}
+    `text` is the most common wording in the group (shortest on ties), `jobs`
+    the number of distinct postings asking for it and `wordings` every
+    distinct phrasing that was folded in.
+    """
+    start = time.perf_counter()
+    job_lines = [(job, line.strip(" .;")) for job, line in job_lines if line and line.strip(" .;")]
+    if total_jobs is None:
+        total_jobs = len({job for job, _ in job_lines})
+    if not job_lines:
+        return []
+
+    # Exact repeats collapse before hashing
+    wordings = {}
+    for job, line in job_lines:
+        entry = wordings.setdefault(line.lower(), {"text": line, "jobs": set(), "count": 0})
+        if entry["text"].islower() and not line.islower():
+            entry["text"] = line  # show the capitalized form of a repeat
+        entry["jobs"].add(job)
+        entry["count"] += 1
+    wordings = list(wordings.values())
+
+    labels = near_duplicate_groups(minhash_signatures([shingles(w["text"]) for w in wordings]))
+
+    groups = {}
+    for label, wording in zip(labels.tolist(), wordings):
+        groups.setdefault(label, []).append(wording)
+
+    collapsed = []
+    for members in groups.values():
+        best = min(members, key=lambda w: (-len(w["jobs"]), -w["count"], len(w["text"])))
+        collapsed.append({
+            "text": best["text"],
+            "jobs": len(set().union(*(w["jobs"] for w in members))),
+            "total_jobs": total_jobs,
+            "wordings": [w["text"] for w in members],
+        })
+    collapsed.sort(key=lambda entry: (-entry["jobs"], -len(entry["wordings"]), len(entry["text"])))
+
+    logger.info(f"[QUALIFICATIONS] Collapsed {len(job_lines)} lines ({len(wordings)} distinct) "
+                f"into {len(collapsed)} in {(time.perf_counter() - start) * 1000:.1f} ms")
+    return collapsed
+
+
+def format_collapsed(entry):
+    return f"{entry['text']} (mentioned in {entry['jobs']}/{entry['total_jobs']} postings)"
@@ -0,0 +1,164 @@
+#Evaluator/utils/skill_demand.py
+import logging
+import re
+import time
+
+import numpy as np
+
+from Evaluator.utils.job_records import QUALIFICATIONS, parse_jobs
+from Evaluator.utils.skill_vocabulary import TECHNICAL_SKILLS
+
+logger = logging.getLogger(__name__)
+
+# Characters that continue a word, so "java" does not match inside "javascript"
+WORD_CHARS = "a-z0-9+#"
+WHITESPACE_RE = re.compile(r"\s+")
+# Keeps a match from spanning two texts scanned together
+TEXT_SEPARATOR = "\n\x00\n"
+
+# Postings that must mention a skill before it is reported as missing
+MIN_DEMAND = 2
+MAX_MISSING_SKILLS = 8
+
+
+def _build_trie(phrases):
+    root = {}
+    for phrase in phrases:
+        node = root
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return root
+
+
+def _trie_pattern(node):
+    """
+    Regex for a trie node. Shared prefixes are written once, so the engine
+    never retries an alias from the start, and optional tails make the
+    longest alias win ("spring boot" over "spring").
+    """
+    is_end = "" in node
+    branches = [
+        (r"\s+" if char == " " else re.escape(char)) + _trie_pattern(child)
+        for char, child in sorted(node.items()) if char
+    ]
+    if not branches:
+        return ""
+    if len(branches) == 1 and not is_end:
+        return branches[0]
+    pattern = "(?:" + "|".join(branches) + ")"
+    return pattern + "?" if is_end else pattern
+
+
+class SkillMatcher:
+    """
+    Finds vocabulary skills in free text in one regex pass.
+
+    Every alias of every skill is compiled into a single trie-shaped pattern
+    with word-boundary guards, so matching runs inside the regex engine
+    instead of looping over the vocabulary in Python.
+    """
+
+    def __init__(self, vocabulary=TECHNICAL_SKILLS):
+        self.skill_names = list(vocabulary)
+        self.alias_index = {}
+        for index, aliases in enumerate(vocabulary.values()):
+            for alias in aliases:
+                self.alias_index.setdefault(WHITESPACE_RE.sub(" ", alias.lower().strip()), index)
+
+        body = _trie_pattern(_build_trie(self.alias_index))
+        self.pattern = re.compile(f"(?<![{WORD_CHARS}])({body})(?![{WORD_CHARS}])")
+
+    def _index(self, alias):
+        index = self.alias_index.get(alias)
+        return index if index is not None else self.alias_index[WHITESPACE_RE.sub(" ", alias)]
+
+    def find_indexes(self, text):
+        """Set of skill indexes (into skill_names) mentioned in the text"""
+        if not text:
+            return set()
+        return {self._index(alias) for alias in self.pattern.findall(str(text).lower())}
+
+    def find(self, text):
+        """Canonical names of the skills mentioned in the text, in vocabulary order"""
+        return [self.skill_names[index] for index in sorted(self.find_indexes(text))]
+
+    def find_in_each(self, texts):
+        """
+        (rows, cols) of every skill mention across many texts, found in a single
+        regex pass over the texts joined together.
+        """
+        texts = [str(text or "").lower() for text in texts]
+        if not texts:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+        starts = np.cumsum([0] + [len(text) + len(TEXT_SEPARATOR) for text in texts[:-1]])
+        positions, cols = [], []
+        for match in self.pattern.finditer(TEXT_SEPARATOR.join(texts)):
+            positions.append(match.start())
+            cols.append(self._index(match.group(1)))
+        rows = np.searchsorted(starts, positions, side="right") - 1
+        return rows, np.asarray(cols, dtype=np.intp)
+
+
+skill_matcher = SkillMatcher()
+
+
+def job_skill_matrix(jobs, matcher=skill_matcher):
+    """
+    Two boolean (jobs x skills) matrices for a list of JobPostings: skills
+    mentioned anywhere in a posting (highlights or description), and skills
+    listed under its Qualifications.
+    """
+    shape = (len(jobs), len(matcher.skill_names))
+    required = np.zeros(shape, dtype=bool)
+    rows, cols = matcher.find_in_each(job.highlight_text(QUALIFICATIONS) for job in jobs)
+    required[rows, cols] = True
+
+    mentioned = required.copy()
+    rows, cols = matcher.find_in_each(
+        job.highlight_text(exclude=QUALIFICATIONS) + " \n " + job.description for job in jobs
+    )
+    mentioned[rows, cols] = True
+    return mentioned, required
+
+
+def skill_gap(resume_text, jobs, matcher=skill_matcher, limit=MAX_MISSING_SKILLS, min_demand=MIN_DEMAND):
+    """
+    Count how many postings ask for each vocabulary skill and subtract the
+    skills the resume already shows. Returns:
+        {"missing_technical_skills": [...], "resume_skills": [...], "skill_demand": [...]}
+    missing_technical_skills is ranked by the number of postings mentioning the
+    skill, then by how many list it under Qualifications.
+    """
+    start = time.perf_counter()
+    jobs = parse_jobs(jobs)
+    mentioned, required = job_skill_matrix(jobs, matcher)
+    demand = mentioned.sum(axis=0)
+    required_count = required.sum(axis=0)
+
+    has_skill = np.zeros(len(matcher.skill_names), dtype=bool)
+    has_skill[list(matcher.find_indexes(resume_text))] = True
+
+    # Most demanded first; lexsort takes its primary key last
+    order = np.lexsort((-required_count, -demand))
+    order = order[demand[order] > 0]
+    missing = order[~has_skill[order] & (demand[order] >= min_demand)][:limit]
+
+    n_jobs = max(len(jobs), 1)
+    result = {
+        "missing_technical_skills": [matcher.skill_names[i] for i in missing],
+        "resume_skills": [matcher.skill_names[i] for i in np.flatnonzero(has_skill)],
+        "skill_demand": [
+            {
+                "skill": matcher.skill_names[i],
+                "jobs": int(demand[i]),
+                "share": round(float(demand[i]) / n_jobs, 2),
+                "on_resume": bool(has_skill[i]),
+            }
+            for i in order[:limit * 2]
+        ],
+    }
+    logger.info(f"[SKILL DEMAND] {len(jobs)} jobs, {int((demand > 0).sum())} skills in demand, "
+                f"{len(result['missing_technical_skills'])} missing, "
+                f"{(time.perf_counter() - start) * 1000:.1f} ms")
+    return result
@@ -0,0 +1,115 @@
+#Evaluator/utils/skill_vocabulary.py
+
+# Technical skills recognised in job postings and resumes.
+# Canonical name -> phrases that mean it (matched case-insensitively on word boundaries).
+# Skills named after an everyday word ("react quickly", "excel at", "Spring 2025") list only
+# phrases that cannot be plain English; a bare "React" is not counted.
+TECHNICAL_SKILLS = {
+    # Languages
+    "Python": ["python"],
+    "Java": ["java"],
+    "JavaScript": ["javascript", "js", "ecmascript"],
+    "TypeScript": ["typescript"],
+    "C": ["c programming", "ansi c"],
+    "C++": ["c++", "cpp"],
+    "C#": ["c#", "csharp"],
+    "Go": ["golang", "go programming", "go language"],
+    "Rust": ["rust programming", "rust language", "rustlang"],
+    "Ruby": ["ruby"],
+    "PHP": ["php"],
+    "Kotlin": ["kotlin"],
+    "Swift": ["swiftui", "swift programming", "swift language", "ios swift"],
+    "Scala": ["scala"],
+    "R": ["r programming", "r language", "rstudio"],
+    "MATLAB": ["matlab"],
+    "Bash": ["bash", "shell scripting", "shell script"],
+    "PowerShell": ["powershell"],
+    "SQL": ["sql"],
+    "HTML": ["html", "html5"],
+    "CSS": ["css", "css3"],
+
+    # Frameworks and libraries
+    "Django": ["django"],
+    "Flask": ["flask"],
+    "FastAPI": ["fastapi"],
+    "Spring": ["spring boot", "spring framework", "spring mvc"],
+    "Node.js": ["node.js", "nodejs", "node js"],
+    "Express": ["express.js", "expressjs"],
+    "React": ["react.js", "reactjs", "react native", "react hooks"],
+    "Angular": ["angular", "angularjs"],
+    "Vue.js": ["vue", "vue.js", "vuejs"],
+    "Next.js": ["next.js", "nextjs"],
+    ".NET": [".net", "dotnet", "asp.net"],
+    "Ruby on Rails": ["ruby on rails"],
+    "jQuery": ["jquery"],
+    "Pandas": ["pandas"],
+    "NumPy": ["numpy"],
+    "scikit-learn": ["scikit-learn", "sklearn", "scikit learn"],
+    "TensorFlow": ["tensorflow"],
+    "PyTorch": ["pytorch"],
+    "Keras": ["keras"],
+    "Spark": ["apache spark", "pyspark", "spark sql"],
+    "Hadoop": ["hadoop"],
+    "Kafka": ["kafka"],
+    "Airflow": ["airflow"],
+    "GraphQL": ["graphql"],
+    "REST APIs": ["rest api", "rest apis", "restful", "restful api"],
+
+    # Data stores
+    "PostgreSQL": ["postgresql", "postgres"],
+    "MySQL": ["mysql"],
+    "SQL Server": ["sql server", "mssql"],
+    "Oracle": ["oracle database", "oracle db", "pl/sql"],
+    "MongoDB": ["mongodb", "mongo"],
+    "Redis": ["redis"],
+    "Elasticsearch": ["elasticsearch", "elastic search"],
+    "DynamoDB": ["dynamodb"],
+    "Cassandra": ["cassandra"],
+    "Snowflake": ["snowflake"],
+    "BigQuery": ["bigquery"],
+
+    # Cloud and infrastructure
+    "AWS": ["aws", "amazon web services"],
+    "Azure": ["azure", "microsoft azure"],
+    "GCP": ["gcp", "google cloud", "google cloud platform"],
+    "Docker": ["docker"],
+    "Kubernetes": ["kubernetes", "k8s"],
+    "Terraform": ["terraform"],
+    "Ansible": ["ansible"],
+    "Jenkins": ["jenkins"],
+    "CI/CD": ["ci/cd", "continuous integration", "continuous delivery", "continuous deployment"],
+    "Git": ["git", "github", "gitlab"],
+    "Linux": ["linux", "unix"],
+    "Nginx": ["nginx"],
+    "Serverless": ["serverless", "aws lambda", "lambda functions"],
+    "Microservices": ["microservices", "microservice"],
+
+    # Data and ML
+    "Machine Learning": ["machine learning", "ml"],
+    "Deep Learning": ["deep learning"],
+    "Natural Language Processing": ["natural language processing", "nlp"],
+    "Computer Vision": ["computer vision"],
+    "Data Analysis": ["data analysis", "data analytics"],
+    "Data Visualization": ["data visualization", "data visualisation"],
+    "Statistics": ["statistics", "statistical analysis", "statistical modeling"],
+    "ETL": ["etl", "data pipelines", "data pipeline"],
+    "Tableau": ["tableau"],
+    "Power BI": ["power bi", "powerbi"],
+    "Excel": ["microsoft excel", "ms excel", "excel vba", "excel spreadsheets", "advanced excel"],
+    "LLMs": ["llm", "llms", "large language models", "generative ai"],
+
+    # Practices and tooling
+    "Agile": ["agile", "scrum", "kanban"],
+    "Unit Testing": ["unit testing", "unit tests", "test automation", "automated testing"],
+    "Selenium": ["selenium"],
+    "Jira": ["jira"],
+    "Object-Oriented Programming": ["object-oriented", "object oriented", "oop"],
+    "Data Structures": ["data structures"],
+    "Algorithms": ["algorithms"],
+    "System Design": ["system design", "distributed systems"],
+    "Networking": ["tcp/ip", "networking", "dns"],
+    "Cybersecurity": ["cybersecurity", "information security", "network security"],
+    "Figma": ["figma"],
+    "Salesforce": ["salesforce"],
+    "SAP": ["sap"],
+}
@@ -1,14 +1,25 @@
 import logging
 from django.shortcuts import render, redirect, get_object_or_404
+from django.template.loader import render_to_string
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.core.paginator import Paginator
+from django.http import JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, quote_etag
 from Evaluator.utils.analyzer_with_claude import *
-from Scanner.models import Resume
+from Evaluator.models import Job
+from Evaluator.utils.job_records import parse_jobs
+from Evaluator.utils.job_ranking import rank_job_rows
+from Evaluator.utils.page_cache import cached_fragment, fragment_key, not_modified, page_etag, revalidate
+from Scanner.models import Resume, ResumeTask, StaleResume
 from UserAuth.models import UserProfile
 
 # Set up logger
 logger = logging.getLogger(__name__)
 
+JOBS_PER_PAGE = 10
+STALE_RESUME_MESSAGE = "Your resume changed while it was being analyzed. Please run the analysis again."
+
 
 @login_required()
 def jobs_matched_page_from_resume_file(request, username, resume_id):
@@ -20,27 +31,51 @@ def jobs_matched_page_from_resume_file(request, username, resume_id):
         return redirect("login")
 
     try:
-        resume_file = Resume.objects.get(pk=resume_id, user=request.user)
+        # The JSON columns are only read when the jobs fragment has to be rendered
+        resume_file = Resume.objects.metadata().get(pk=resume_id, user=request.user)
     except Resume.DoesNotExist:
         messages.error(request, "Resume not found.")
         return redirect("home")
 
-    # Get jobs data
-    jobs_matched = resume_file.get_jobs_matched()
-
-    # Debug logging
-    logger.info(f"Jobs data type: {type(jobs_matched)}")
-    logger.info(f"Number of jobs: {len(jobs_matched) if jobs_matched else 0}")
-
-    if jobs_matched and len(jobs_matched) > 0:
-        logger.info(f"First job keys: {list(jobs_matched[0].keys())}")
+    # Links jobs on first use, which bumps the resume version before it goes into the key
+    matched_jobs = resume_file.get_matched_jobs()
+    key = fragment_key("jobs", resume_file, request.GET.get("page", "1")[:10])
+    etag = page_etag(request, key)
+    response = not_modified(request, etag)
+    if response is not None:
+        return response
+
+    def render_jobs():
+        # Rank every linked job against the resume, then load full rows for one page only
+        job_ids, ranking = rank_job_rows(build_comprehensive_resume_data(resume_file), matched_jobs)
+        paginator = Paginator(ranking, JOBS_PER_PAGE)
+        page_obj = paginator.get_page(request.GET.get("page"))
+        page_jobs = Job.objects.in_bulk([job_ids[entry["index"]] for entry in page_obj])
+
+        jobs_matched = []
+        for entry in page_obj:
+            job = page_jobs.get(job_ids[entry["index"]])
+            if job is not None:
+                jobs_matched.append({
+                    **job.to_api_dict(),
+                    "match_percent": entry["match_percent"],
+                    "matched_skills": entry["matched_skills"],
+                    "missing_skills": entry["missing_skills"],
+                })
+
+        logger.info(f"Number of jobs: {paginator.count} (page {page_obj.number} of {paginator.num_pages})")
+        return render_to_string("partials/jobs_matched_list.html", {
+            "jobs_matched": jobs_matched,
+            "jobs_count": paginator.count,
+            "page_obj": page_obj,
+        }, request)
 
     context = {
         "resume_file": resume_file,
-        "jobs_matched": jobs_matched,
+        "jobs_fragment": cached_fragment("jobs", key, render_jobs),
         "resume_id": resume_id,
     }
-    return render(request, "jobs_matched_from_resume_file_page.html", context)
+    return revalidate(render(request, "jobs_matched_from_resume_file_page.html", context), etag)
 
 
 def build_comprehensive_resume_data(resume_file):
@@ -57,6 +92,13 @@ def build_comprehensive_resume_data(resume_file):
         logger.warning(f"[RESUME DATA] Extracted text is not a dict, converting: {type(resume_data)}")
         resume_data = {}
 
+    # Fall back to the plain text stored at upload when the structured extraction is missing
+    if not resume_data:
+        raw_text = resume_file.get_raw_text()
+        if raw_text:
+            logger.info(f"[RESUME DATA] Using stored raw text ({len(raw_text)} chars)")
+            resume_data = {"text": raw_text}
+
     # Add career field and experience level (HIGH PRIORITY)
     if resume_file.career_field:
         resume_data["career_field"] = resume_file.career_field
@@ -75,70 +117,89 @@ def build_comprehensive_resume_data(resume_file):
     return resume_data
 
 
-def normalize_jobs_data(jobs_data):
+def generate_recommendations(resume_file, set_stage=None):
     """
-    Normalize jobs data to ensure consistent structure for analysis.
-    Expected output: List of job dictionaries
+    Run the skills gap analysis for a resume and save it. Reports each stage
+    through set_stage(status) and returns the result, or {"error": message}.
+    Runs in the task worker (see Scanner/tasks.py).
     """
-    logger.info("[JOBS DATA] Starting normalization")
-    logger.debug(f"Input jobs data type: {type(jobs_data)}")
-
-    if not jobs_data:
-        logger.warning("Jobs data is None or empty")
-        return []
-
-    # Case 1: jobs_data is already a list of jobs
-    if isinstance(jobs_data, list):
-        logger.info(f"Jobs data is already a list with {len(jobs_data)} jobs")
-        return jobs_data
-
-    # Case 2: jobs_data is a dict with 'data' key containing list
-    if isinstance(jobs_data, dict) and 'data' in jobs_data:
-        data = jobs_data['data']
-        if isinstance(data, list):
-            logger.info(f"Extracted {len(data)} jobs from 'data' key")
-            return data
-        elif isinstance(data, str):
-            # Try to parse JSON string
-            try:
-                import json
-                parsed_data = json.loads(data)
-                if isinstance(parsed_data, list):
-                    logger.info(f"Parsed JSON string to list with {len(parsed_data)} jobs")
-                    return parsed_data
-                else:
-                    logger.warning(f"Parsed JSON is not a list: {type(parsed_data)}")
-                    return [parsed_data] if parsed_data else []
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse JSON string: {e}")
-                return []
-
-    # Case 3: jobs_data is a string (JSON)
-    if isinstance(jobs_data, str):
-        try:
-            import json
-            parsed_data = json.loads(jobs_data)
-            if isinstance(parsed_data, list):
-                logger.info(f"Parsed JSON string to list with {len(parsed_data)} jobs")
-                return parsed_data
-            elif isinstance(parsed_data, dict) and 'data' in parsed_data:
-                return normalize_jobs_data(parsed_data)  # Recursive call
-            else:
-                return [parsed_data] if parsed_data else []
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse jobs JSON string: {e}")
-            return []
-
-    # Case 4: Single job object
-    if isinstance(jobs_data, dict):
-        # Check if this looks like a single job
-        job_indicators = ['job_title', 'job_description', 'employer_name', 'job_highlights']
-        if any(key in jobs_data for key in job_indicators):
-            logger.info("Jobs data appears to be a single job - wrapping in list")
-            return [jobs_data]
-
-    logger.error(f"Unknown jobs data structure: {type(jobs_data)}")
-    return []
+    set_stage = set_stage or (lambda status: None)
+
+    # The result is saved only if the resume is still at the version of the data analyzed,
+    # so read both in one query before anything else
+    resume_file.refresh_from_db(fields=["extracted_text", "version"])
+    analyzed_version = resume_file.version
+
+    # Build comprehensive resume data
+    logger.debug("Building comprehensive resume data")
+    extracted_resume_data = build_comprehensive_resume_data(resume_file)
+
+    # Validate data before analysis
+    if not extracted_resume_data:
+        logger.error("No resume data available for analysis")
+        return {"error": "No resume data found. Please upload a resume first."}
+
+    logger.info(f"Resume data keys: {list(extracted_resume_data.keys())}")
+    logger.info(f"Career field: {extracted_resume_data.get('career_field', 'Not set')}")
+    logger.info(f"Experience level: {extracted_resume_data.get('experience_level', 'Not set')}")
+
+    # Get jobs data, parsed once into JobPostings; may call RapidAPI on first use
+    set_stage(Resume.RECOMMENDATION_FETCHING_JOBS)
+    logger.debug("Getting jobs data")
+    # Only the columns the qualification extractor reads, streamed in chunks
+    matched_jobs = resume_file.get_matched_jobs().only(*Job.QUALIFICATION_FIELDS)
+    job_postings = parse_jobs(matched_jobs.iterator(chunk_size=100))
+    logger.info(f"Job postings: {len(job_postings)} jobs")
+    # Linking jobs just now moved the version on from analyzed_version and kept it known;
+    # it is unknown only if something else wrote in between, like a re-extraction
+    if resume_file.known_version() is None:
+        logger.warning(f"[RECOMMENDATION] Resume {resume_file.id} changed while fetching jobs")
+        return {"error": STALE_RESUME_MESSAGE}
+    analyzed_version = resume_file.known_version()
+
+    if not job_postings:
+        logger.error("No jobs data available for analysis")
+        return {"error": "No job data found. Please ensure jobs are loaded first."}
+
+    # Log sample job data
+    sample_job = job_postings[0]
+    logger.info(f"Sample job title: {sample_job.title or 'No title'}")
+    logger.info(f"Job highlights keys: {list(sample_job.highlights)}")
+    logger.info(f"Sample qualifications count: {len(sample_job.qualifications)}")
+
+    # Run analysis on the parsed postings
+    set_stage(Resume.RECOMMENDATION_ANALYZING)
+    logger.info("Starting qualification gap analysis")
+    result = analyze_resume_against_jobs(extracted_resume_data, job_postings)
+
+    if not result or 'error' in result:
+        error_msg = result.get('error', 'Unknown error') if result else 'No result returned'
+        logger.warning(f"[RECOMMENDATION] Analysis failed: {error_msg}")
+        return {"error": error_msg}
+
+    # Save successful results
+    try:
+        resume_file.set_recommendation_skills(result, expected_version=analyzed_version)
+    except StaleResume:
+        logger.warning(f"[RECOMMENDATION] Resume {resume_file.id} changed during the analysis; result discarded")
+        return {"error": STALE_RESUME_MESSAGE}
+    logger.info(f"[RECOMMENDATION] Successfully saved recommendations for resume_id={resume_file.id}")
+
+    # Log summary of recommendations
+    if isinstance(result, dict):
+        for category, items in result.items():
+            if isinstance(items, list) and len(items) > 0:
+                logger.info(f"Found {len(items)} recommendations in {category}")
+    return result
+
+
+def queue_recommendations(resume_file):
+    """Start a background analysis unless one is already running"""
+    if resume_file.recommendation_in_progress():
+        return
+    # Status first, so a fast worker's later stages are never overwritten by "queued"
+    resume_file.set_recommendation_status(Resume.RECOMMENDATION_QUEUED)
+    ResumeTask.objects.enqueue(resume_file, ResumeTask.RECOMMEND)
 
 
 @login_required()
@@ -154,99 +215,54 @@ def recommendation_skills_page(request, username, resume_id):
 
     try:
         user_profile = UserProfile.objects.get(user=request.user)
-        resume_file = get_object_or_404(Resume, id=resume_id, user__username=username)
-
-        # Check if recommendations already exist
-        existing_recommendations = resume_file.get_recommendation_skills()
-        if existing_recommendations and not request.GET.get('refresh'):
-            logger.info(f"[RECOMMENDATION] Using existing recommendations for resume_id={resume_id}")
-            context = {
-                "recommended_skills": existing_recommendations,
-                "resume": resume_file,
-                "user_profile": user_profile
-            }
-            return render(request, "recommended_skills.html", context)
-
-        # Generate new recommendations
-        logger.info(f"[RECOMMENDATION] Generating new recommendations for resume_id={resume_id}")
-
-        try:
-            # Build comprehensive resume data
-            logger.debug("Building comprehensive resume data")
-            extracted_resume_data = build_comprehensive_resume_data(resume_file)
-
-            # Get and normalize jobs data
-            logger.debug("Getting jobs data")
-            raw_jobs_data = resume_file.get_jobs_matched()
-            normalized_jobs_data = normalize_jobs_data(raw_jobs_data)
-
-            # Debug logging
-            logger.info(f"Resume data type: {type(extracted_resume_data)}")
-            logger.info(f"Normalized jobs data: {len(normalized_jobs_data)} jobs")
-
-            if extracted_resume_data:
-                logger.info(f"Resume data keys: {list(extracted_resume_data.keys())}")
-                logger.info(f"Career field: {extracted_resume_data.get('career_field', 'Not set')}")
-                logger.info(f"Experience level: {extracted_resume_data.get('experience_level', 'Not set')}")
-
-            if normalized_jobs_data:
-                # Log sample job data
-                sample_job = normalized_jobs_data[0]
-                logger.info(f"Sample job keys: {list(sample_job.keys())}")
-                logger.info(f"Sample job title: {sample_job.get('job_title', 'No title')}")
-
-                # Check for job_highlights structure
-                if 'job_highlights' in sample_job:
-                    highlights = sample_job['job_highlights']
-                    logger.info(
-                        f"Job highlights keys: {list(highlights.keys()) if isinstance(highlights, dict) else 'Not a dict'}")
-                    if isinstance(highlights, dict) and 'Qualifications' in highlights:
-                        qualifications = highlights['Qualifications']
-                        logger.info(
-                            f"Sample qualifications count: {len(qualifications) if isinstance(qualifications, list) else 'Not a list'}")
-
-            # Validate data before analysis
-            if not extracted_resume_data:
-                logger.error("No resume data available for analysis")
-                messages.error(request, "No resume data found. Please upload a resume first.")
-                return redirect("home")
-
-            if not normalized_jobs_data:
-                logger.error("No jobs data available for analysis")
-                messages.error(request, "No job data found. Please ensure jobs are loaded first.")
-                return redirect("jobs_matched_from_resume_file", username=username, resume_id=resume_id)
-
-            # Run analysis with normalized data
-            logger.info("Starting qualification gap analysis")
-            result = analyze_resume_against_jobs(extracted_resume_data, normalized_jobs_data)
-
-            if result and 'error' not in result:
-                # Save successful results
-                resume_file.set_recommendation_skills(result)
-                logger.info(f"[RECOMMENDATION] Successfully saved recommendations for resume_id={resume_id}")
-
-                # Log summary of recommendations
-                if isinstance(result, dict):
-                    for category, items in result.items():
-                        if isinstance(items, list) and len(items) > 0:
-                            logger.info(f"Found {len(items)} recommendations in {category}")
-
-            else:
-                error_msg = result.get('error', 'Unknown error') if result else 'No result returned'
-                logger.warning(f"[RECOMMENDATION] Analysis failed: {error_msg}")
-                messages.error(request, f"Analysis failed: {error_msg}")
-                result = {"error": error_msg}
-
-        except Exception as e:
-            logger.error(f"[RECOMMENDATION] Exception during analysis: {str(e)}", exc_info=True)
-            messages.error(request, f"Failed to analyze resume: {str(e)}")
-            result = {"error": str(e)}
-
+        resume_file = get_object_or_404(
+            Resume.objects.metadata(), id=resume_id, user__username=username
+        )
         context = {
-            "recommended_skills": result,
             "resume": resume_file,
             "user_profile": user_profile
         }
+
+        if request.GET.get('refresh'):
+            logger.info(f"[RECOMMENDATION] Queueing new recommendations for resume_id={resume_id}")
+            queue_recommendations(resume_file)
+
+        elif resume_file.recommendation_status == Resume.RECOMMENDATION_FAILED:
+            # Reported once; the next visit shows the previous results or starts over
+            error_msg = resume_file.recommendation_error or "Unknown error"
+            resume_file.set_recommendation_status("")
+            messages.error(request, f"Analysis failed: {error_msg}")
+            context["recommended_skills"] = {"error": error_msg}
+            return render(request, "recommended_skills.html", context)
+
+        elif not resume_file.recommendation_in_progress():
+            # Existing recommendations come from the fragment cache, or from a 304
+            key = fragment_key("recommendations", resume_file)
+            etag = page_etag(request, key)
+            response = not_modified(request, etag)
+            if response is not None:
+                return response
+
+            def render_report():
+                existing_recommendations = resume_file.get_recommendation_skills()
+                if not existing_recommendations:
+                    return None
+                return render_to_string("partials/recommended_skills_report.html", {
+                    "recommended_skills": existing_recommendations,
+                    "resume": resume_file,
+                }, request)
+
+            report = cached_fragment("recommendations", key, render_report)
+            if report is not None:
+                logger.info(f"[RECOMMENDATION] Using existing recommendations for resume_id={resume_id}")
+                context["report_fragment"] = report
+                return revalidate(render(request, "recommended_skills.html", context), etag)
+
+            logger.info(f"[RECOMMENDATION] Queueing recommendations for resume_id={resume_id}")
+            queue_recommendations(resume_file)
+
+        # Rendered right away; the page polls recommendation_progress until the worker is done
+        context["recommendation_progress"] = resume_file.get_recommendation_progress()
         return render(request, "recommended_skills.html", context)
 
     except UserProfile.DoesNotExist:
@@ -257,4 +273,40 @@ def recommendation_skills_page(request, username, resume_id):
     except Exception as e:
         logger.error(f"[RECOMMENDATION] Unexpected error in view: {str(e)}", exc_info=True)
         messages.error(request, f"An error occurred: {str(e)}")
-        return redirect("home")
\ No newline at end of file
+        return redirect("home")
+
+
+@login_required()
+def recommendation_progress(request, username, resume_id):
+    """
+    Analysis stage for the recommendation page to poll. One indexed row read;
+    the ETag changes only with the stage, so unchanged polls get a bodyless 304.
+    """
+    if request.user.username != username:
+        return JsonResponse({"error": "Not found"}, status=404)
+
+    row = (
+        Resume.objects
+        .filter(pk=resume_id, user=request.user)
+        .values("recommendation_status", "recommendation_updated_at")
+        .first()
+    )
+    if row is None:
+        return JsonResponse({"error": "Not found"}, status=404)
+
+    status = row["recommendation_status"]
+    updated_at = row["recommendation_updated_at"]
+    version = int(updated_at.timestamp() * 1000) if updated_at else 0
+    etag = quote_etag(f"{status or 'idle'}-{version}")
+
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = JsonResponse({
+            "status": status,
+            "stage": dict(Resume.RECOMMENDATION_STATUS_CHOICES).get(status, ""),
+            "progress": Resume.RECOMMENDATION_PROGRESS.get(status, 0),
+        })
+    response["ETag"] = etag
+    # Always revalidate; the ETag makes that cheap
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -2,4 +2,17 @@ from django.contrib import admin
 from .models import Resume
 # Register your models here.
 
-admin.site.register(Resume)
\ No newline at end of file
+
+@admin.register(Resume)
+class ResumeAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "career_field", "experience_level", "recommendation_status", "uploaded_at")
+    list_filter = ("career_field", "recommendation_status")
+    list_select_related = ("user",)
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        # Only the change form shows the JSON columns; the change list reads metadata rows
+        changelist = f"{self.opts.app_label}_{self.opts.model_name}_changelist"
+        if request.resolver_match and request.resolver_match.url_name == changelist:
+            queryset = queryset.defer(*Resume.LARGE_FIELDS)
+        return queryset
@@ -0,0 +1,292 @@
+#Scanner/events.py
+import asyncio
+import io
+import logging
+from collections import defaultdict, namedtuple
+from importlib import import_module
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.core.handlers.asgi import ASGIRequest
+from django.db import close_old_connections
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.urls import Resolver404, resolve
+
+from Evaluator.models import Job
+from Evaluator.utils import json_codec
+from .models import Resume, ResumeTask
+
+logger = logging.getLogger(__name__)
+
+PREVIEW_SKILLS = 15
+PREVIEW_JOBS = 5
+
+# Everything a subscriber can see change about a resume, read for all subscribed resumes at once
+PipelineState = namedtuple("PipelineState", "extraction has_data recommendation recommendation_version")
+
+
+def format_event(name, payload):
+    """One Server-Sent Events message, encoded once and shared by every subscriber"""
+    return f"event: {name}\ndata: {json_codec.dumps(payload)}\n\n"
+
+
+def read_states(resume_ids):
+    """PipelineState for each existing resume id: two queries however many resumes are watched"""
+    rows = (
+        Resume.objects
+        .filter(pk__in=resume_ids)
+        .annotate(has_data=ExpressionWrapper(Q(extracted_text__isnull=False), output_field=BooleanField()))
+        .values_list("pk", "has_data", "recommendation_status", "recommendation_updated_at")
+    )
+    extraction = dict(
+        ResumeTask.objects
+        .filter(resume_id__in=resume_ids, kind=ResumeTask.EXTRACT)
+        .order_by("created_at", "pk")
+        .values_list("resume_id", "status")
+    )  # later tasks overwrite earlier ones: the latest status per resume
+    return {
+        pk: PipelineState(
+            extraction=extraction.get(pk) or (ResumeTask.DONE if has_data else ""),
+            has_data=has_data,
+            recommendation=status,
+            recommendation_version=updated_at,
+        )
+        for pk, has_data, status, updated_at in rows
+    }
+
+
+def resume_preview(resume_id):
+    """Name and first skills of freshly extracted resume data"""
+    data = Resume.objects.filter(pk=resume_id).values_list("extracted_text", flat=True).first()
+    if not isinstance(data, dict):
+        return {"name": "", "skills": []}
+    skills = data.get("skills") or []
+    if isinstance(skills, str):
+        skills = [s.strip() for s in skills.split(",") if s.strip()]
+    return {"name": data.get("name") or "", "skills": [str(skill) for skill in skills[:PREVIEW_SKILLS]]}
+
+
+def jobs_preview(resume_id):
+    """Best matched jobs, available once the analysis is past fetching them"""
+    jobs = Job.objects.for_resume(resume_id).values("title", "employer_name", "location")[:PREVIEW_JOBS]
+    return {"jobs": list(jobs)}
+
+
+def skills_preview(resume_id):
+    recommendation = Resume.objects.filter(pk=resume_id).values_list("recommendation_skills", flat=True).first()
+    if not isinstance(recommendation, dict):
+        return {"missing_technical_skills": []}
+    return {"missing_technical_skills": list(recommendation.get("missing_technical_skills") or [])[:PREVIEW_SKILLS]}
+
+
+def pipeline_events(resume_id, before, after):
+    """Messages for the transition from before (None when first seen) to after, in order"""
+    events = []
+    if before is None or before.extraction != after.extraction:
+        events.append(("extraction", {"status": after.extraction}))
+    if after.has_data and (before is None or not before.has_data):
+        events.append(("resume", resume_preview(resume_id)))
+
+    if before is None or (before.recommendation, before.recommendation_version) != (
+            after.recommendation, after.recommendation_version):
+        events.append(("recommendation", {
+            "status": after.recommendation,
+            "stage": dict(Resume.RECOMMENDATION_STATUS_CHOICES).get(after.recommendation, ""),
+            "progress": Resume.RECOMMENDATION_PROGRESS.get(after.recommendation, 0),
+        }))
+        jobs_ready = (Resume.RECOMMENDATION_ANALYZING, Resume.RECOMMENDATION_DONE)
+        if after.recommendation in jobs_ready and (before is None or before.recommendation not in jobs_ready):
+            events.append(("jobs", jobs_preview(resume_id)))
+        if after.recommendation == Resume.RECOMMENDATION_DONE:
+            events.append(("skills", skills_preview(resume_id)))
+    return [(name, format_event(name, payload)) for name, payload in events]
+
+
+def changed_events(changes):
+    """{resume_id: [(name, message), ...]} for [(resume_id, before, after), ...]"""
+    return {resume_id: pipeline_events(resume_id, before, after) for resume_id, before, after in changes}
+
+
+class PipelineBroker:
+    """
+    Fans resume pipeline progress out to Server-Sent Events subscribers.
+
+    One poller task per process reads the state of every watched resume in a
+    couple of queries each EVENTS_POLL_SECONDS, however many clients are
+    connected, and pushes pre-formatted messages to each subscriber's queue.
+    The latest message of each kind is kept per resume and replayed to late
+    subscribers, so a new connection starts from the current state.
+    """
+
+    GONE = None  # queued to subscribers when their resume is deleted
+
+    def __init__(self):
+        self.subscribers = defaultdict(set)
+        self.states = {}
+        self.latest = {}
+        self.poller = None
+        self.ticks = 0
+
+    def subscribe(self, resume_id):
+        queue = asyncio.Queue()
+        self.subscribers[resume_id].add(queue)
+        for message in self.latest.get(resume_id, {}).values():
+            queue.put_nowait(message)
+        loop = asyncio.get_running_loop()
+        if self.poller is None or self.poller.done() or self.poller.get_loop() is not loop:
+            self.poller = loop.create_task(self.poll())
+        return queue
+
+    def unsubscribe(self, resume_id, queue):
+        queues = self.subscribers.get(resume_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            # Nobody is watching: forget the resume so the poller stops reading it
+            del self.subscribers[resume_id]
+            self.states.pop(resume_id, None)
+            self.latest.pop(resume_id, None)
+
+    def subscriber_count(self):
+        return sum(len(queues) for queues in self.subscribers.values())
+
+    def publish(self, resume_id, messages):
+        latest = self.latest.setdefault(resume_id, {})
+        for name, message in messages:
+            if name == "recommendation":
+                # Partial results belong to the run they came from; a new run starts without them
+                latest.pop("jobs", None)
+                latest.pop("skills", None)
+            latest[name] = message
+            for queue in self.subscribers.get(resume_id, ()):
+                queue.put_nowait(message)
+
+    async def poll(self):
+        while self.subscribers:
+            try:
+                await self.tick()
+            except Exception as error:
+                # A database hiccup must not end the stream for everyone; reconnect on the next tick
+                logger.error(f"[EVENTS] Poll failed: {error}")
+                await sync_to_async(close_old_connections)()
+            await asyncio.sleep(settings.EVENTS_POLL_SECONDS)
+
+    async def tick(self):
+        resume_ids = list(self.subscribers)
+        states = await sync_to_async(read_states)(resume_ids)
+        self.ticks += 1
+
+        for resume_id in resume_ids:
+            if resume_id not in states and resume_id in self.subscribers:
+                for queue in self.subscribers.pop(resume_id):
+                    queue.put_nowait(self.GONE)
+                self.states.pop(resume_id, None)
+                self.latest.pop(resume_id, None)
+
+        changes = [
+            (resume_id, self.states.get(resume_id), state)
+            for resume_id, state in states.items()
+            if self.states.get(resume_id) != state
+        ]
+        if not changes:
+            return
+        events = await sync_to_async(changed_events)(changes)
+        for resume_id, messages in events.items():
+            if resume_id in self.subscribers:
+                self.states[resume_id] = states[resume_id]
+                self.publish(resume_id, messages)
+
+
+broker = PipelineBroker()
+
+
+async def resume_event_stream(resume_id):
+    """Server-Sent Events for one resume until the client goes away or the resume is deleted"""
+    queue = broker.subscribe(resume_id)
+    try:
+        # EventSource reconnects after this many milliseconds if the connection drops
+        yield f"retry: {settings.EVENTS_RETRY_MS}\n\n"
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), timeout=settings.EVENTS_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                # Keeps proxies from closing an idle connection
+                yield ": keepalive\n\n"
+                continue
+            if message is broker.GONE:
+                yield format_event("gone", {})
+                return
+            yield message
+    finally:
+        broker.unsubscribe(resume_id, queue)
+
+
+def stream_allowed(scope, username, resume_id):
+    """True when the session in the request cookies belongs to the owner of the resume"""
+    request = ASGIRequest(scope, io.BytesIO())
+    session_store = import_module(settings.SESSION_ENGINE).SessionStore
+    request.session = session_store(request.COOKIES.get(settings.SESSION_COOKIE_NAME))
+    user = get_user(request)
+    return (
+        user.is_authenticated
+        and user.username == username
+        and Resume.objects.filter(pk=resume_id, user=user).exists()
+    )
+
+
+class EventStreamApplication:
+    """
+    ASGI application that serves the resume_events URL itself and hands every
+    other request to Django (see Core/asgi.py).
+
+    Django's ASGI handler runs a request's sync code (sessions, the ORM) on a
+    thread kept for that request until the response ends, so every open stream
+    would park a thread. Here the session and ownership check runs once on the
+    shared sync thread and a waiting client costs a coroutine and a queue.
+    """
+
+    def __init__(self, application):
+        self.application = application
+
+    async def __call__(self, scope, receive, send):
+        match = None
+        if scope["type"] == "http" and scope["method"] == "GET":
+            try:
+                match = resolve(scope["path"])
+            except Resolver404:
+                pass
+        if match is None or match.url_name != "resume_events":
+            return await self.application(scope, receive, send)
+
+        username, resume_id = match.kwargs["username"], match.kwargs["resume_id"]
+        if not await sync_to_async(stream_allowed)(scope, username, resume_id):
+            await send({"type": "http.response.start", "status": 404,
+                        "headers": [(b"content-type", b"application/json")]})
+            await send({"type": "http.response.body", "body": b'{"error":"Not found"}'})
+            return
+
+        await send({"type": "http.response.start", "status": 200, "headers": [
+            (b"content-type", b"text/event-stream"),
+            (b"cache-control", b"no-cache"),
+            (b"x-accel-buffering", b"no"),
+        ]})
+
+        async def stream():
+            async for message in resume_event_stream(resume_id):
+                await send({"type": "http.response.body", "body": message.encode(), "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+
+        async def disconnected():
+            while (await receive())["type"] != "http.disconnect":
+                pass
+
+        # Whichever ends first (resume deleted, or the client went away) cancels the other
+        tasks = [asyncio.ensure_future(stream()), asyncio.ensure_future(disconnected())]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
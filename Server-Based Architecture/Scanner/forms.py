@@ -8,6 +8,8 @@ from .models import Resume
 from django import forms
 from .models import Resume
 
+SUPPORTED_RESUME_EXTENSIONS = ('.pdf', '.docx')
+
 
 class ResumeForm(forms.ModelForm):
     class Meta:
@@ -17,7 +19,7 @@ class ResumeForm(forms.ModelForm):
             "resume_file": forms.FileInput(attrs={
                 "id": "fileInput",
                 "name": "resume_file",
-                "accept": ".pdf,.doc,.docx",  # Updated to accept PDF, DOC, and DOCX files
+                "accept": ",".join(SUPPORTED_RESUME_EXTENSIONS),
                 "style": "display: none;",
                 "required": True
             }),
@@ -65,13 +67,12 @@ class ResumeForm(forms.ModelForm):
         """Custom validation for resume file to ensure only PDF and DOCX files are allowed"""
         file = self.cleaned_data.get('resume_file')
         if file:
-            # Get file extension
+            # Get file extension; legacy .doc is a binary format we cannot read
             file_name = file.name.lower()
-            valid_extensions = ['.pdf', '.doc', '.docx']
 
-            if not any(file_name.endswith(ext) for ext in valid_extensions):
+            if not file_name.endswith(SUPPORTED_RESUME_EXTENSIONS):
                 raise forms.ValidationError(
-                    "Only PDF, DOC, and DOCX files are allowed. Please upload a valid resume file."
+                    "Only PDF and DOCX files are allowed. Please upload a valid resume file."
                 )
 
             # Check file size (optional - limit to 10MB)
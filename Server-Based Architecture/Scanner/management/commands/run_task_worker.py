@@ -0,0 +1,165 @@
+# Scanner/management/commands/run_task_worker.py
+
+import logging
+import os
+import socket
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from Scanner.models import ResumeTask
+from Scanner.tasks import run_task
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        'Run queued resume tasks (text extraction) outside the web process. '
+        'Started by the Procfile worker entry: python manage.py run_task_worker'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=settings.TASK_WORKER_CONCURRENCY,
+            help=f'Worker threads claiming tasks in parallel (default: {settings.TASK_WORKER_CONCURRENCY})'
+        )
+        parser.add_argument(
+            '--poll',
+            type=float,
+            default=settings.TASK_POLL_SECONDS,
+            help=f'Seconds to sleep when the queue is empty (default: {settings.TASK_POLL_SECONDS})'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once the queue is empty instead of polling for new tasks'
+        )
+        parser.add_argument(
+            '--max-tasks',
+            type=int,
+            default=0,
+            help='Exit after running this many tasks, 0 for no limit (default: 0)'
+        )
+
+    def handle(self, *args, **options):
+        self.stop = threading.Event()
+        self.finished = threading.Event()
+        self.lock = threading.Lock()
+        self.processed = self.failed = 0
+        self.running = set()
+        self.max_tasks = options['max_tasks']
+        self.poll = options['poll']
+        self.once = options['once']
+        # Leases are renewed, and stale ones looked for, several times per lease
+        self.interval = settings.TASK_LEASE_SECONDS / 4
+        concurrency = max(1, options['concurrency'])
+        name = f"{socket.gethostname()}:{os.getpid()}"
+
+        self.housekeeping()
+        self.stdout.write(
+            f"Task worker {name} running {concurrency} thread(s), "
+            f"{ResumeTask.objects.depth()} task(s) queued"
+        )
+
+        heartbeat = threading.Thread(target=self.heartbeat, daemon=True)
+        heartbeat.start()
+        try:
+            if concurrency == 1:
+                # Tasks run in the main thread, which does the housekeeping between them
+                self.work(f"{name}:0")
+            else:
+                threads = [
+                    threading.Thread(target=self.work, args=(f"{name}:{n}", True), daemon=True)
+                    for n in range(concurrency)
+                ]
+                for thread in threads:
+                    thread.start()
+                try:
+                    while any(thread.is_alive() for thread in threads):
+                        for thread in threads:
+                            thread.join(timeout=self.interval)
+                        if not self.stop.is_set():
+                            self.housekeeping()
+                except KeyboardInterrupt:
+                    self.stdout.write("Stopping after the running tasks finish...")
+                    self.stop.set()
+                    for thread in threads:
+                        thread.join()
+        finally:
+            self.finished.set()
+            heartbeat.join()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Task worker {name} ran {self.processed} task(s), {self.failed} failed")
+        )
+
+    def housekeeping(self):
+        """Recover tasks left running by a dead worker and drop old finished ones"""
+        ResumeTask.objects.requeue_stale(settings.TASK_LEASE_SECONDS, settings.TASK_MAX_ATTEMPTS)
+        ResumeTask.objects.prune()
+        self.next_housekeeping = time.monotonic() + self.interval
+
+    def heartbeat(self):
+        """Renew the lease of this worker's running tasks, so a long task is not taken for a lost one"""
+        while not self.finished.wait(self.interval):
+            with self.lock:
+                running = list(self.running)
+            if not running:
+                continue
+            try:
+                ResumeTask.objects.renew_leases(running)
+            except Exception as error:
+                # A missed beat only matters if every beat in a lease is missed
+                logger.error(f"[TASK QUEUE] Lease renewal failed: {error}")
+            finally:
+                connection.close()
+
+    def take_slot(self):
+        """Count one more task against --max-tasks; False once the limit is reached"""
+        with self.lock:
+            if self.max_tasks and self.processed >= self.max_tasks:
+                self.stop.set()
+                return False
+            self.processed += 1
+            return True
+
+    def work(self, worker, threaded=False):
+        try:
+            while not self.stop.is_set():
+                if threaded:
+                    close_old_connections()
+                elif time.monotonic() >= self.next_housekeeping:
+                    self.housekeeping()
+                task = ResumeTask.objects.claim(worker)
+                if task is None:
+                    if self.once:
+                        return
+                    self.stop.wait(self.poll)
+                    continue
+                if not self.take_slot():
+                    # Over the limit: hand the task back for the next worker
+                    ResumeTask.objects.filter(pk=task.pk).update(
+                        status=ResumeTask.QUEUED, worker="", started_at=None, attempts=task.attempts - 1
+                    )
+                    return
+                started = time.monotonic()
+                with self.lock:
+                    self.running.add(task.pk)
+                try:
+                    run_task(task)
+                finally:
+                    with self.lock:
+                        self.running.discard(task.pk)
+                if task.status == ResumeTask.FAILED:
+                    with self.lock:
+                        self.failed += 1
+                self.stdout.write(f"[{worker}] {task} in {time.monotonic() - started:.1f}s")
+        finally:
+            if threaded:
+                connection.close()
@@ -0,0 +1,38 @@
+# Scanner/management/commands/task_queue_stats.py
+
+from django.core.management.base import BaseCommand
+from Scanner.models import ResumeTask
+
+
+class Command(BaseCommand):
+    help = 'Report queue depth, running tasks and busy workers for the resume task queue'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--failures',
+            type=int,
+            default=5,
+            help='Also list the N most recent failed tasks (default: 5)'
+        )
+
+    def handle(self, *args, **options):
+        stats = ResumeTask.objects.stats()
+
+        self.stdout.write(f"Queued:        {stats['queued']} (max depth {stats['max_depth'] or 'unbounded'})")
+        self.stdout.write(f"Running:       {stats['running']}")
+        self.stdout.write(f"Done:          {stats['done']}")
+        self.stdout.write(f"Failed:        {stats['failed']}")
+        self.stdout.write(f"Oldest wait:   {stats['oldest_wait']:.0f}s")
+        for worker in stats['workers']:
+            self.stdout.write(f"  busy worker thread {worker}")
+
+        failures = options['failures']
+        if failures:
+            for task in ResumeTask.objects.filter(status=ResumeTask.FAILED).order_by('-finished_at')[:failures]:
+                self.stdout.write(f"  {task.finished_at:%Y-%m-%d %H:%M}  {task}: {task.error}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{stats['queued']} queued, {stats['running']} running on {len(stats['workers'])} worker thread(s)"
+            )
+        )
@@ -1,9 +1,19 @@
 import logging
+import hashlib
+import zlib
+from datetime import timedelta
 
+from django.conf import settings
 from django.db import models
+from django.db.models import Count, F
+from django.db.models.expressions import Combinable
 from django.contrib.auth.models import User
+from django.utils import timezone
 
-from Evaluator.utils.get_jobs import get_rapid_api_response
+from Evaluator.fields import FastJSONField
+from Evaluator.models import Job, ResumeJob
+from Evaluator.utils import json_codec
+from Evaluator.utils.get_jobs import find_local_jobs, get_cached_jobs
 from .static_lists import career_fields, level_choices
 import logging
 
@@ -11,13 +21,61 @@ logger = logging.getLogger(__name__)
 
 # Create your models here.
 
+class StaleResume(Exception):
+    """Raised by Resume.update_fields when the resume changed since the expected version"""
+
+
+class ResumeManager(models.Manager):
+    """Manager for uploaded resumes"""
+
+    def metadata(self):
+        """
+        Resumes without their large JSON columns, for listings and for pages
+        that never read them. Accessing a deferred field still works but costs
+        a query per resume.
+        """
+        return self.defer(*self.model.LARGE_FIELDS)
+
+
 class Resume(models.Model):
+    # Stages of the background skills gap analysis (the "recommend" ResumeTask)
+    RECOMMENDATION_QUEUED = "queued"
+    RECOMMENDATION_FETCHING_JOBS = "fetching_jobs"
+    RECOMMENDATION_ANALYZING = "analyzing"
+    RECOMMENDATION_DONE = "done"
+    RECOMMENDATION_FAILED = "failed"
+    RECOMMENDATION_STATUS_CHOICES = [
+        (RECOMMENDATION_QUEUED, "Waiting for an analyzer"),
+        (RECOMMENDATION_FETCHING_JOBS, "Finding matching jobs"),
+        (RECOMMENDATION_ANALYZING, "Comparing your resume to the jobs"),
+        (RECOMMENDATION_DONE, "Analysis complete"),
+        (RECOMMENDATION_FAILED, "Analysis failed"),
+    ]
+    RECOMMENDATION_ACTIVE = (RECOMMENDATION_QUEUED, RECOMMENDATION_FETCHING_JOBS, RECOMMENDATION_ANALYZING)
+    RECOMMENDATION_PROGRESS = {
+        RECOMMENDATION_QUEUED: 10,
+        RECOMMENDATION_FETCHING_JOBS: 35,
+        RECOMMENDATION_ANALYZING: 70,
+        RECOMMENDATION_DONE: 100,
+        RECOMMENDATION_FAILED: 100,
+    }
+
     user = models.ForeignKey(User, blank=True, null=True, on_delete=models.CASCADE)
     resume_file = models.FileField(upload_to="UserResumes/", blank=True, null=True)
-    extracted_text = models.JSONField(null=True, blank=True)
+    extracted_text = FastJSONField(null=True, blank=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
-    jobs_matched = models.JSONField(null=True, blank=True)
-    recommendation_skills = models.JSONField(null=True, blank=True)
+    jobs_matched = FastJSONField(null=True, blank=True)
+    recommendation_skills = FastJSONField(null=True, blank=True)
+    recommendation_status = models.CharField(
+        max_length=20,
+        choices=RECOMMENDATION_STATUS_CHOICES,
+        blank=True,
+        default=""
+    )
+    recommendation_error = models.TextField(blank=True, default="")
+    recommendation_updated_at = models.DateTimeField(null=True, blank=True)
+    # Bumped whenever extracted data, matched jobs or recommendations change; keys the cached page fragments
+    version = models.PositiveIntegerField(default=0)
 
 
     career_field = models.CharField(
@@ -36,12 +94,33 @@ class Resume(models.Model):
 
     preferred_location = models.CharField(max_length=100, blank=True, null=True)
 
+    objects = ResumeManager()
+
+    # Bulky JSON columns; listings load resumes without them (see ResumeManager.metadata)
+    LARGE_FIELDS = ("extracted_text", "jobs_matched", "recommendation_skills")
+    # Writing any of these makes cached pages of the resume stale, so it bumps version
+    VERSIONED_FIELDS = ("extracted_text", "recommendation_skills")
+
     def __str__(self):
         return f"{self.user.first_name} {self.user.last_name} Resume id: {self.id}"
 
     def get_extracted_text(self):
         return self.extracted_text
 
+    def get_raw_text(self):
+        """Plain text read from the uploaded file, or None if it was never stored"""
+        try:
+            return self.raw_text.get_text()
+        except ResumeText.DoesNotExist:
+            return None
+
+    def set_raw_text(self, new_raw_text):
+        try:
+            return ResumeText.objects.store_for_resume(self, new_raw_text)
+        except Exception as error:
+            logger.error(f"Error setting raw_text for resume {self.pk}: {error}")
+            return error
+
     def get_preferred_location(self):
         try:
             return self.preferred_location
@@ -63,29 +142,59 @@ class Resume(models.Model):
             print(f"FAILED TRYING TO GET THE USER: {e}")
             return None
 
+    def update_fields(self, expected_version=None, **changes):
+        """
+        Write changes to this resume in a single UPDATE and apply them to the
+        instance without reading the row back. Changing a VERSIONED_FIELDS
+        field bumps version. With expected_version the write only happens if
+        version is still that value (and moves it on by one), otherwise
+        StaleResume is raised and nothing is written. Expressions such as F()
+        are read back lazily, on first access of the field.
+        """
+        values = dict(changes)
+        rows = self.__class__.objects.filter(pk=self.pk)
+        if expected_version is not None:
+            rows = rows.filter(version=expected_version)
+            values.setdefault("version", expected_version + 1)
+        elif any(name in self.VERSIONED_FIELDS for name in changes):
+            values.setdefault("version", F("version") + 1)
+
+        if not rows.update(**values):
+            if expected_version is not None:
+                raise StaleResume(f"Resume {self.pk} changed since version {expected_version}")
+            raise self.DoesNotExist(f"Resume {self.pk} does not exist")
+
+        for name, value in values.items():
+            if isinstance(value, Combinable):
+                # Only the database knows the result; drop it so the next access reloads it
+                self.__dict__.pop(self._meta.get_field(name).attname, None)
+            else:
+                setattr(self, name, value)
+
     def set_career_field(self, new_career_field):
-        try:
-            self.__class__.objects.filter(pk=self.pk).update(career_field=new_career_field)
-            self.refresh_from_db()
-        except Exception as error:
-            print(error)
-            return error
+        self.update_fields(career_field=new_career_field)
 
     def set_preferred_location(self, new_preferred_location):
-        try:
-            self.__class__.objects.filter(pk=self.pk).update(preferred_location=new_preferred_location)
-            self.refresh_from_db()
-        except Exception as error:
-            print(error)
-            return error
+        self.update_fields(preferred_location=new_preferred_location)
 
     def set_experience_level(self, new_experience_level):
-        try:
-            self.__class__.objects.filter(pk=self.pk).update(experience_level=new_experience_level)
-            self.refresh_from_db()
-        except Exception as error:
-            print(error)
-            return error
+        self.update_fields(experience_level=new_experience_level)
+
+    def known_version(self):
+        """The version this instance holds, or None when only the database knows it"""
+        return self.__dict__.get("version")
+
+    def bump_version(self):
+        """Make cached renderings of this resume's pages stale (see Evaluator/utils/page_cache.py)"""
+        known = self.known_version()
+        if known is not None:
+            try:
+                # Nobody wrote since this instance read the version, so the new one stays known
+                self.update_fields(expected_version=known)
+                return
+            except StaleResume:
+                pass
+        self.update_fields(version=F("version") + 1)
 
     @staticmethod
     def delete_resume_by_id(old_id):
@@ -97,20 +206,25 @@ class Resume(models.Model):
             return False
 
     def set_extracted_text(self, new_extracted_text):
-        try:
-            self.__class__.objects.filter(pk=self.pk).update(extracted_text=new_extracted_text)
-            self.refresh_from_db()
-        except Exception as error:
-            print(error)
-            return error
+        self.update_fields(extracted_text=new_extracted_text)
 
-    def set_recommendation_skills(self, recommendation):
-        try:
-            self.__class__.objects.filter(pk=self.pk).update(recommendation_skills=recommendation)
-            self.refresh_from_db()
-        except Exception as error:
-            print(error)
-            return error
+    def set_recommendation_skills(self, recommendation, expected_version=None):
+        self.update_fields(expected_version=expected_version, recommendation_skills=recommendation)
+
+    def set_recommendation_status(self, status, error=""):
+        """Record the analysis stage; recommendation_updated_at versions it for conditional GETs"""
+        self.update_fields(
+            recommendation_status=status,
+            recommendation_error=error,
+            recommendation_updated_at=timezone.now(),
+        )
+
+    def recommendation_in_progress(self):
+        return self.recommendation_status in self.RECOMMENDATION_ACTIVE
+
+    def get_recommendation_progress(self):
+        """Percent complete of the current analysis, for the progress bar"""
+        return self.RECOMMENDATION_PROGRESS.get(self.recommendation_status, 0)
 
     def get_recommendation_skills(self):
         try:
@@ -119,42 +233,284 @@ class Resume(models.Model):
             print(error)
 
     def set_jobs_matched(self, new_jobs_matched):
-        """Store jobs data as JSON in the database"""
+        """Link the matched jobs to this resume; each posting is stored once in the Job table"""
+        # Ensure we're storing a list, not a string
+        if isinstance(new_jobs_matched, str):
+            new_jobs_matched = json_codec.loads(new_jobs_matched)
+
+        linked = ResumeJob.objects.link_jobs(self, new_jobs_matched)
+        # Drop the legacy per-resume copy of the raw payload
+        if self.jobs_matched is not None:
+            self.update_fields(jobs_matched=None)
+        logger.info(f"Successfully stored {linked} jobs for resume {self.pk}")
+
+    def get_matched_jobs(self):
+        """Job queryset for this resume in match order, fetching and linking jobs on first use"""
         try:
-            # Ensure we're storing a list, not a string
-            if isinstance(new_jobs_matched, str):
-                import json
-                new_jobs_matched = json.loads(new_jobs_matched)
+            if not self.job_links.exists():
+                # Resumes saved before the Job table still carry the raw payload; move it over
+                if self.jobs_matched:
+                    self.set_jobs_matched(self.jobs_matched)
+                    return Job.objects.for_resume(self)
 
-            self.__class__.objects.filter(pk=self.pk).update(jobs_matched=new_jobs_matched)
-            self.refresh_from_db()
-            logger.info(f"Successfully stored {len(new_jobs_matched)} jobs for resume {self.pk}")
+                # Stored postings answer most queries; RapidAPI only when recall is too low
+                local_job_ids = find_local_jobs(self.career_field, self.experience_level, self.preferred_location)
+                if local_job_ids:
+                    ResumeJob.objects.link_job_ids(self, local_job_ids)
+                    return Job.objects.for_resume(self)
 
-        except Exception as error:
-            logger.error(f"Error setting jobs_matched: {error}")
-            return error
+                jobs_data = get_cached_jobs(
+                    user_id=self.user.id,
+                    career_field=self.career_field,
+                    experience_level=self.experience_level,
+                    job_location=self.preferred_location
+                )
+                if jobs_data:
+                    self.set_jobs_matched(jobs_data)
+
+            return Job.objects.for_resume(self)
+
+        except Exception as e:
+            logger.error(f"Error getting jobs for resume {self.id}: {e}")
+            return Job.objects.none()
 
     def get_jobs_matched(self):
-        """Get matching jobs for this resume"""
+        """Get matching jobs for this resume as JSearch-style dicts"""
+        return [job.to_api_dict() for job in self.get_matched_jobs()]
+
+
+class ResumeTextManager(models.Manager):
+    """Manager for the plain text stored alongside each Resume"""
+
+    def store_for_resume(self, resume, text):
+        """Compress and store the text for a resume, replacing any previous copy"""
+        text = text or ""
+        encoded = text.encode("utf-8")
+        record, _ = self.update_or_create(
+            resume=resume,
+            defaults={
+                "content": zlib.compress(encoded, ResumeText.COMPRESSION_LEVEL),
+                "content_hash": hashlib.sha256(encoded).hexdigest(),
+                "char_count": len(text),
+            }
+        )
+        # Keep the resume's cached reverse relation in step with what was just written
+        resume.raw_text = record
+        logger.info(f"Stored {len(text)} chars of raw text for resume {resume.pk} "
+                    f"({len(record.content)} bytes compressed)")
+        return record
+
+    def find_extracted_data(self, resume):
+        """
+        Extracted data of the most recent other resume whose stored text has the same
+        content hash, or None. Identical text gives identical extraction output.
+        """
         try:
-            # If jobs are already stored, return them
-            if self.jobs_matched:
-                return self.jobs_matched
-
-            # Otherwise, fetch new jobs
-            jobs_data = get_rapid_api_response(
-                user_id=self.user.id,
-                career_field=self.career_field,
-                experience_level=self.experience_level,
-                job_location=self.preferred_location
+            content_hash = resume.raw_text.content_hash
+        except ResumeText.DoesNotExist:
+            return None
+        return (
+            Resume.objects
+            .filter(raw_text__content_hash=content_hash, extracted_text__isnull=False)
+            .exclude(pk=resume.pk)
+            .order_by("-uploaded_at")
+            .values_list("extracted_text", flat=True)
+            .first()
+        )
+
+
+class ResumeText(models.Model):
+    """
+    Raw text extracted from a Resume file at upload time.
+
+    Kept out of the Resume row so listing pages never pull it in; reprocessing,
+    gap analysis and local validators read it from here instead of re-opening
+    and re-parsing the file from storage.
+    """
+    COMPRESSION_LEVEL = 6
+
+    resume = models.OneToOneField(Resume, on_delete=models.CASCADE, related_name="raw_text")
+    content = models.BinaryField()
+    content_hash = models.CharField(max_length=64, db_index=True)
+    char_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = ResumeTextManager()
+
+    def __str__(self):
+        return f"Raw text for resume id: {self.resume_id} ({self.char_count} chars)"
+
+    def get_text(self):
+        return zlib.decompress(bytes(self.content)).decode("utf-8")
+
+
+class ResumeTaskManager(models.Manager):
+    """
+    Manager for the database-backed task queue drained by `manage.py run_task_worker`.
+
+    Workers claim tasks with a conditional UPDATE (queued -> running), so several
+    worker threads or processes can share the table on SQLite and PostgreSQL alike.
+    """
+
+    RETENTION = timedelta(days=7)
+
+    def active(self):
+        return self.filter(status__in=(ResumeTask.QUEUED, ResumeTask.RUNNING))
+
+    def depth(self):
+        """Tasks waiting for a worker"""
+        return self.filter(status=ResumeTask.QUEUED).count()
+
+    def is_full(self):
+        """True once TASK_QUEUE_MAX_DEPTH tasks are waiting (0 means unbounded)"""
+        max_depth = settings.TASK_QUEUE_MAX_DEPTH
+        return bool(max_depth) and self.depth() >= max_depth
+
+    def enqueue(self, resume, kind, **arguments):
+        """Queue a task for a resume; a task of the same kind still queued or running is returned instead"""
+        existing = self.active().filter(resume=resume, kind=kind).order_by("-created_at").first()
+        if existing is not None:
+            return existing
+        task = self.create(resume=resume, kind=kind, arguments=arguments)
+        logger.info(f"[TASK QUEUE] Queued {kind} task {task.pk} for resume {resume.pk}")
+        return task
+
+    def latest_for(self, resume, kind):
+        """Most recent task of a kind for a resume, or None"""
+        return self.filter(resume=resume, kind=kind).order_by("-created_at", "-pk").first()
+
+    def claim(self, worker):
+        """Oldest queued task, marked running for this worker, or None when the queue is empty"""
+        while True:
+            task_id = (
+                self.filter(status=ResumeTask.QUEUED)
+                .order_by("created_at", "pk")
+                .values_list("pk", flat=True)
+                .first()
+            )
+            if task_id is None:
+                return None
+            claimed = self.filter(pk=task_id, status=ResumeTask.QUEUED).update(
+                status=ResumeTask.RUNNING,
+                worker=worker,
+                started_at=timezone.now(),
+                attempts=F("attempts") + 1,
+            )
+            if claimed:
+                return self.get(pk=task_id)
+            # Another worker took it between the read and the update; try the next one
+
+    def renew_leases(self, task_ids):
+        """Heartbeat from a live worker: its running tasks start a fresh lease now"""
+        return self.filter(pk__in=task_ids, status=ResumeTask.RUNNING).update(started_at=timezone.now())
+
+    def requeue_stale(self, lease_seconds, max_attempts):
+        """
+        Give tasks whose worker died (no lease renewal for lease_seconds) back
+        to the queue, or fail them once they have used up max_attempts. Returns
+        (requeued, failed).
+        """
+        stale = self.filter(
+            status=ResumeTask.RUNNING,
+            started_at__lt=timezone.now() - timedelta(seconds=lease_seconds),
+        )
+        expired = stale.filter(attempts__gte=max_attempts)
+        # Analyses report their stage on the resume; a lost one must not look busy forever
+        analyzed_resume_ids = list(expired.filter(kind=ResumeTask.RECOMMEND).values_list("resume_id", flat=True))
+        failed = expired.update(
+            status=ResumeTask.FAILED,
+            error=ResumeTask.TIMEOUT_MESSAGE,
+            finished_at=timezone.now(),
+        )
+        if analyzed_resume_ids:
+            Resume.objects.filter(pk__in=analyzed_resume_ids).update(
+                recommendation_status=Resume.RECOMMENDATION_FAILED,
+                recommendation_error=ResumeTask.TIMEOUT_MESSAGE,
+                recommendation_updated_at=timezone.now(),
             )
+        requeued = stale.filter(attempts__lt=max_attempts).update(
+            status=ResumeTask.QUEUED, worker="", started_at=None
+        )
+        if requeued or failed:
+            logger.warning(f"[TASK QUEUE] Requeued {requeued} and failed {failed} stale tasks")
+        return requeued, failed
 
-            # Store the jobs data in the database
-            if jobs_data:
-                self.set_jobs_matched(jobs_data)
+    def prune(self):
+        """Delete finished tasks older than RETENTION; returns how many were removed"""
+        deleted, _ = self.filter(
+            status__in=(ResumeTask.DONE, ResumeTask.FAILED),
+            finished_at__lt=timezone.now() - self.RETENTION,
+        ).delete()
+        return deleted
 
-            return jobs_data
+    def stats(self):
+        """Queue depth, tasks per status, busy workers and the age of the oldest waiting task"""
+        by_status = dict(self.values_list("status").annotate(total=Count("pk")).order_by())
+        oldest = self.filter(status=ResumeTask.QUEUED).order_by("created_at").values_list("created_at", flat=True).first()
+        running = self.filter(status=ResumeTask.RUNNING)
+        return {
+            "queued": by_status.get(ResumeTask.QUEUED, 0),
+            "running": by_status.get(ResumeTask.RUNNING, 0),
+            "done": by_status.get(ResumeTask.DONE, 0),
+            "failed": by_status.get(ResumeTask.FAILED, 0),
+            "workers": sorted(running.values_list("worker", flat=True).distinct()),
+            "oldest_wait": (timezone.now() - oldest).total_seconds() if oldest else 0.0,
+            "max_depth": settings.TASK_QUEUE_MAX_DEPTH,
+        }
 
-        except Exception as e:
-            logger.error(f"Error getting jobs for resume {self.id}: {e}")
-            return []
+
+class ResumeTask(models.Model):
+    """
+    One unit of background work on a resume (text extraction or skills gap
+    analysis), run by `manage.py run_task_worker` instead of inside the HTTP
+    request.
+
+    Pages read the status through a small JSON endpoint while the task is
+    queued or running; error holds the message shown to the user on failure.
+    """
+    EXTRACT = "extract"
+    RECOMMEND = "recommend"
+    KIND_CHOICES = [(EXTRACT, "Extract resume data"), (RECOMMEND, "Analyze skills gap")]
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [(QUEUED, "Queued"), (RUNNING, "Running"), (DONE, "Done"), (FAILED, "Failed")]
+
+    TIMEOUT_MESSAGE = "Resume processing timed out. Please try uploading again or contact support."
+
+    resume = models.ForeignKey(Resume, on_delete=models.CASCADE, related_name="tasks")
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    arguments = FastJSONField(default=dict, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+    worker = models.CharField(max_length=100, blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Start of the current lease: set when claimed and renewed by the worker's heartbeat
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    objects = ResumeTaskManager()
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "created_at"])]
+
+    def __str__(self):
+        return f"{self.kind} task {self.pk} for resume id: {self.resume_id} [{self.status}]"
+
+    @property
+    def is_active(self):
+        return self.status in (self.QUEUED, self.RUNNING)
+
+    def queue_position(self):
+        """1-based place in line while queued, otherwise None"""
+        if self.status != self.QUEUED:
+            return None
+        return self.__class__.objects.filter(status=self.QUEUED, created_at__lt=self.created_at).count() + 1
+
+    def finish(self, status, error=""):
+        self.__class__.objects.filter(pk=self.pk).update(status=status, error=error, finished_at=timezone.now())
+        self.status, self.error = status, error
@@ -0,0 +1,90 @@
+#Scanner/tasks.py
+import logging
+import os
+
+from Evaluator.views import generate_recommendations
+from .models import Resume, ResumeTask
+from .views import extract_text_from_resume
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {}
+
+
+class TaskFailed(Exception):
+    """Raised by a handler with the message to show the user"""
+
+
+def task_handler(kind):
+    def register(handler):
+        HANDLERS[kind] = handler
+        return handler
+    return register
+
+
+def extraction_error_message(resume):
+    file_extension = os.path.splitext(resume.resume_file.name.lower())[1]
+    if file_extension == '.pdf':
+        return (
+            "Failed to process PDF resume. This could be due to a timeout or "
+            "the PDF containing scanned images without selectable text."
+        )
+    if file_extension == '.docx':
+        return (
+            "Failed to process DOCX resume. This could be due to a timeout or "
+            "the document not containing any text."
+        )
+    return "Only PDF and DOCX files are supported."
+
+
+@task_handler(ResumeTask.EXTRACT)
+def extract_resume(task):
+    """Claude extraction of the stored resume text, saved on the resume"""
+    resume = task.resume
+    extracted_data = extract_text_from_resume(resume, use_cache=task.arguments.get("use_cache", True))
+
+    if not extracted_data or extracted_data == -1:
+        raise TaskFailed(extraction_error_message(resume))
+
+    if isinstance(extracted_data, dict) and "error" in extracted_data:
+        if "timeout" in extracted_data["error"].lower():
+            raise TaskFailed(ResumeTask.TIMEOUT_MESSAGE)
+        raise TaskFailed(f"Resume processing failed: {extracted_data['error']}")
+
+    resume.set_extracted_text(extracted_data)
+
+
+@task_handler(ResumeTask.RECOMMEND)
+def recommend_skills(task):
+    """Skills gap analysis against the matched jobs, each stage recorded on the resume"""
+    resume = task.resume
+    try:
+        result = generate_recommendations(resume, resume.set_recommendation_status)
+    except Exception as error:
+        logger.exception(f"[TASK QUEUE] Analysis raised for resume {resume.pk}: {error}")
+        result = {"error": f"Failed to analyze resume: {error}"}
+
+    if "error" in result:
+        resume.set_recommendation_status(Resume.RECOMMENDATION_FAILED, result["error"])
+        raise TaskFailed(result["error"])
+
+    resume.set_recommendation_status(Resume.RECOMMENDATION_DONE)
+
+
+def run_task(task):
+    """Run a claimed task and record how it ended; never raises"""
+    handler = HANDLERS.get(task.kind)
+    try:
+        if handler is None:
+            raise TaskFailed(f"Unknown task kind: {task.kind}")
+        handler(task)
+    except TaskFailed as error:
+        logger.warning(f"[TASK QUEUE] Task {task.pk} failed: {error}")
+        task.finish(ResumeTask.FAILED, str(error))
+    except Exception as error:
+        logger.exception(f"[TASK QUEUE] Task {task.pk} raised: {error}")
+        task.finish(ResumeTask.FAILED, f"Error processing resume: {error}")
+    else:
+        logger.info(f"[TASK QUEUE] Task {task.pk} ({task.kind}) done for resume {task.resume_id}")
+        task.finish(ResumeTask.DONE)
+    return task
@@ -1,8 +1,10 @@
 import json
+import threading
+import time
 from unittest.mock import Mock, patch, MagicMock
 from django.contrib.auth.models import User
-from django.test import RequestFactory
-from io import BytesIO
+from django.test import RequestFactory, TestCase, override_settings
+from io import BytesIO, StringIO
 
 
 class TestParseResumeJson:
@@ -172,14 +174,14 @@ class TestValidateResume:
         assert result is False
 
 
-class TestExtractTextFromPdf:
-    """Tests for extract_text_from_pdf function"""
+class TestExtractTextFromDocument:
+    """Tests for extract_text_from_document function"""
     
     @patch('views.PyPDF2.PdfReader')
     @patch('views.extract_resume_basic_data_fast')
     def test_successful_extraction(self, mock_claude, mock_pdf_reader):
         """Test successful PDF text extraction"""
-        from views import extract_text_from_pdf
+        from views import extract_text_from_document
         
         # Mock PDF reader
         mock_page = Mock()
@@ -196,10 +198,12 @@ class TestExtractTextFromPdf:
         # Mock resume model
         mock_resume = Mock()
         mock_resume.id = 1
+        mock_resume.get_raw_text.return_value = None
+        mock_resume.resume_file.name = "resume.pdf"
         mock_resume.resume_file.open.return_value.__enter__ = Mock(return_value=BytesIO(b"fake pdf"))
         mock_resume.resume_file.open.return_value.__exit__ = Mock(return_value=False)
         
-        result = extract_text_from_pdf(mock_resume)
+        result = extract_text_from_document(mock_resume)
         
         assert result["name"] == "John Doe"
         assert result["email"] == "john@example.com"
@@ -208,7 +212,7 @@ class TestExtractTextFromPdf:
     @patch('views.PyPDF2.PdfReader')
     def test_empty_pdf_text(self, mock_pdf_reader):
         """Test handling of scanned PDF with no text"""
-        from views import extract_text_from_pdf
+        from views import extract_text_from_document
         
         # Mock PDF reader returning empty text
         mock_page = Mock()
@@ -218,10 +222,12 @@ class TestExtractTextFromPdf:
         # Mock resume model
         mock_resume = Mock()
         mock_resume.id = 1
+        mock_resume.get_raw_text.return_value = None
+        mock_resume.resume_file.name = "resume.pdf"
         mock_resume.resume_file.open.return_value.__enter__ = Mock(return_value=BytesIO(b"fake pdf"))
         mock_resume.resume_file.open.return_value.__exit__ = Mock(return_value=False)
         
-        result = extract_text_from_pdf(mock_resume)
+        result = extract_text_from_document(mock_resume)
         
         assert result == -1
     
@@ -229,7 +235,7 @@ class TestExtractTextFromPdf:
     @patch('views.extract_resume_basic_data_fast')
     def test_claude_error_response(self, mock_claude, mock_pdf_reader):
         """Test handling of Claude AI error response"""
-        from views import extract_text_from_pdf
+        from views import extract_text_from_document
         
         # Mock PDF reader
         mock_page = Mock()
@@ -242,10 +248,12 @@ class TestExtractTextFromPdf:
         # Mock resume model
         mock_resume = Mock()
         mock_resume.id = 1
+        mock_resume.get_raw_text.return_value = None
+        mock_resume.resume_file.name = "resume.pdf"
         mock_resume.resume_file.open.return_value.__enter__ = Mock(return_value=BytesIO(b"fake pdf"))
         mock_resume.resume_file.open.return_value.__exit__ = Mock(return_value=False)
         
-        result = extract_text_from_pdf(mock_resume)
+        result = extract_text_from_document(mock_resume)
         
         assert result == -1
 
@@ -305,7 +313,7 @@ class TestGetJobsForResume:
 class TestExtractTextFromResume:
     """Tests for extract_text_from_resume function"""
     
-    @patch('views.extract_text_from_pdf')
+    @patch('views.extract_text_from_document')
     def test_pdf_extraction(self, mock_extract_pdf):
         """Test PDF file extraction"""
         from views import extract_text_from_resume
@@ -319,21 +327,37 @@ class TestExtractTextFromResume:
         result = extract_text_from_resume(mock_resume)
         
         assert result == {"name": "John Doe"}
-        mock_extract_pdf.assert_called_once_with(mock_resume)
+        mock_extract_pdf.assert_called_once_with(mock_resume, use_cache=True)
     
+    @patch('views.extract_text_from_document')
+    def test_docx_extraction(self, mock_extract_document):
+        """Test DOCX files share the same extraction path"""
+        from views import extract_text_from_resume
+
+        mock_extract_document.return_value = {"name": "John Doe"}
+
+        mock_resume = Mock()
+        mock_resume.id = 1
+        mock_resume.resume_file.name = "resume.docx"
+
+        result = extract_text_from_resume(mock_resume)
+
+        assert result == {"name": "John Doe"}
+        mock_extract_document.assert_called_once_with(mock_resume, use_cache=True)
+
     def test_non_pdf_file(self):
-        """Test rejection of non-PDF files"""
+        """Test rejection of unsupported files (legacy .doc)"""
         from views import extract_text_from_resume
         
         mock_resume = Mock()
         mock_resume.id = 1
-        mock_resume.resume_file.name = "resume.docx"
+        mock_resume.resume_file.name = "resume.doc"
         
         result = extract_text_from_resume(mock_resume)
         
         assert result == -1
     
-    @patch('views.extract_text_from_pdf')
+    @patch('views.extract_text_from_document')
     def test_extraction_exception(self, mock_extract_pdf):
         """Test handling of extraction exceptions"""
         from views import extract_text_from_resume
@@ -348,3 +372,497 @@ class TestExtractTextFromResume:
         
         assert result == -1
 
+
+class TestResumeRawText(TestCase):
+    """Tests for the raw text stored alongside a Resume"""
+
+    def setUp(self):
+        from Scanner.models import Resume
+        self.user = User.objects.create_user(username="raw_text_user", password="mypassword")
+        self.resume = Resume.objects.create(user=self.user)
+
+    def test_missing_raw_text(self):
+        """Test that a resume without stored text returns None"""
+        self.assertIsNone(self.resume.get_raw_text())
+
+    def test_round_trip_is_compressed(self):
+        """Test that stored text reads back unchanged and is compressed"""
+        text = "John Doe\nSKILLS\nPython, Django\n" * 50
+        record = self.resume.set_raw_text(text)
+
+        self.assertEqual(self.resume.get_raw_text(), text)
+        self.assertEqual(record.char_count, len(text))
+        self.assertLess(len(record.content), len(text.encode("utf-8")))
+
+    def test_store_replaces_previous_text(self):
+        """Test that storing text again replaces the previous row"""
+        self.resume.set_raw_text("first version")
+        self.resume.set_raw_text("second version")
+
+        from Scanner.models import ResumeText
+        self.assertEqual(ResumeText.objects.filter(resume=self.resume).count(), 1)
+        self.assertEqual(self.resume.get_raw_text(), "second version")
+
+    @patch('Scanner.views.extract_resume_basic_data_fast')
+    def test_extraction_reads_stored_text(self, mock_claude):
+        """Test that extraction sends the stored text to Claude"""
+        from Scanner.views import extract_text_from_document
+
+        self.resume.set_raw_text("Stored resume text")
+        mock_claude.return_value = {"name": "John Doe"}
+
+        result = extract_text_from_document(self.resume)
+
+        self.assertEqual(result, {"name": "John Doe"})
+        mock_claude.assert_called_once_with("Stored resume text", timeout_seconds=20)
+
+    @patch('Scanner.views.extract_resume_basic_data_fast')
+    def test_identical_text_reuses_extraction(self, mock_claude):
+        """Test that identical text reuses an earlier extraction unless use_cache is False"""
+        from Scanner.models import Resume
+        from Scanner.views import extract_text_from_document
+
+        earlier = Resume.objects.create(user=self.user, extracted_text={"name": "Cached"})
+        earlier.set_raw_text("Same resume text")
+        self.resume.set_raw_text("Same resume text")
+
+        self.assertEqual(extract_text_from_document(self.resume), {"name": "Cached"})
+        mock_claude.assert_not_called()
+
+        mock_claude.return_value = {"name": "Fresh"}
+        self.assertEqual(extract_text_from_document(self.resume, use_cache=False), {"name": "Fresh"})
+
+
+class TestIterPdfPages(TestCase):
+    """Tests for the lazy, budgeted PDF page iterator"""
+
+    def _pages(self, texts):
+        pages = []
+        for text in texts:
+            page = Mock()
+            page.extract_text.return_value = text
+            pages.append(page)
+        return pages
+
+    @patch('Scanner.views.PyPDF2.PdfReader')
+    def test_budget_stops_early(self, mock_pdf_reader):
+        """Test that pages past the character budget are never extracted"""
+        from Scanner.views import read_pdf_text
+
+        pages = self._pages(["a" * 100, "b" * 100, "c" * 100])
+        mock_pdf_reader.return_value.pages = pages
+
+        result = read_pdf_text(BytesIO(b"fake pdf"), char_budget=150)
+
+        self.assertEqual(result, "a" * 100 + "b" * 50)
+        pages[2].extract_text.assert_not_called()
+
+    @patch('Scanner.views.PyPDF2.PdfReader')
+    def test_no_budget_reads_everything(self, mock_pdf_reader):
+        """Test that every page is read when there is no budget"""
+        from Scanner.views import read_pdf_text
+
+        pages = self._pages(["one ", "two ", "three"])
+        mock_pdf_reader.return_value.pages = pages
+
+        self.assertEqual(read_pdf_text(BytesIO(b"fake pdf")), "one two three")
+
+
+class TestDocxExtraction(TestCase):
+    """Tests for the DOCX extractors (python-docx and streaming)"""
+
+    def _docx(self):
+        from docx import Document
+        from docx.opc.constants import RELATIONSHIP_TYPE as RT
+        from docx.oxml import OxmlElement
+        from docx.oxml.ns import qn
+        doc = Document()
+        doc.add_heading("Experience", level=2)
+        p = doc.add_paragraph("Built ")
+        p.add_run("services").bold = True
+        hyperlink = OxmlElement("w:hyperlink")
+        hyperlink.set(qn("r:id"), p.part.relate_to("https://example.com", RT.HYPERLINK, is_external=True))
+        run = OxmlElement("w:r")
+        run.append(OxmlElement("w:t"))
+        run[0].text = " portfolio"
+        hyperlink.append(run)
+        p._p.append(hyperlink)
+        numPr = doc.add_paragraph("Python", style="List Bullet")._p.get_or_add_pPr().get_or_add_numPr()
+        numPr.get_or_add_ilvl().val = 1
+        numPr.get_or_add_numId().val = 3
+        table = doc.add_table(rows=2, cols=2)
+        table.cell(0, 0).text = "Skill"
+        table.cell(0, 0).merge(table.cell(0, 1))
+        table.cell(1, 1).text = "Django"
+        buffer = BytesIO()
+        doc.save(buffer)
+        buffer.seek(0)
+        return buffer
+
+    def test_matches_python_docx_output(self):
+        """Test that extract_all returns the same paragraphs and tables as python-docx"""
+        from docx import Document
+        from Scanner.utils.conversion import extract_all, extract_paragraphs, extract_tables
+
+        docx_file = self._docx()
+        doc = Document(docx_file)
+        expected_paragraphs = extract_paragraphs(doc)
+        data = extract_all(docx_file)
+
+        self.assertEqual(data["tables"], extract_tables(doc))
+        self.assertEqual(data["paragraphs"], expected_paragraphs)
+        self.assertEqual(data["paragraphs"][0]["heading_level"], 2)
+
+    def test_hyperlink_runs_carry_target(self):
+        """Test that runs inside a hyperlink carry its target"""
+        from docx import Document
+        from Scanner.utils.conversion import extract_paragraphs
+
+        runs = extract_paragraphs(Document(self._docx()))[1]["runs"]
+
+        self.assertEqual([r["text"] for r in runs], ["Built ", "services", " portfolio"])
+        self.assertEqual(runs[2]["hyperlink"], "https://example.com")
+        self.assertNotIn("hyperlink", runs[0])
+
+    def test_text_only_fast_path(self):
+        """Test the plain text DOCX extractor"""
+        from Scanner.utils.conversion import extract_docx_text
+
+        text = extract_docx_text(self._docx())
+
+        self.assertEqual(text.splitlines(), ["Experience", "Built services portfolio", "Python", "Skill", "Django"])
+
+    def test_list_info_read_from_paragraph_properties(self):
+        """Test that list level and numbering come from the paragraph properties"""
+        from Scanner.utils.conversion import extract_all
+
+        data = extract_all(self._docx())
+
+        self.assertIsNone(data["paragraphs"][1]["list"])
+        self.assertEqual(data["paragraphs"][2]["list"], {"level": 1, "num_id": 3})
+
+
+class TestResumeUpdateFields(TestCase):
+    """Tests for Resume.update_fields and the setters built on it"""
+
+    def setUp(self):
+        from Scanner.models import Resume
+        self.user = User.objects.create_user(username="update_user", password="mypassword")
+        self.resume = Resume.objects.create(user=self.user, extracted_text={"skills": ["Python"]})
+
+    def test_setters_write_once_without_reading_back(self):
+        """Test that setters issue a single UPDATE and do not read the row back"""
+        with self.assertNumQueries(1):
+            self.resume.set_career_field("Software Engineering")
+        with self.assertNumQueries(1):
+            self.resume.set_extracted_text({"skills": ["Go"]})
+
+        self.assertEqual(self.resume.career_field, "Software Engineering")
+        self.assertEqual(self.resume.extracted_text, {"skills": ["Go"]})
+        # The bumped version is only known to the database; it is read on first access
+        with self.assertNumQueries(1):
+            self.assertEqual(self.resume.version, 1)
+
+    def test_expected_version_prevents_lost_updates(self):
+        """Test that a stale expected_version raises StaleResume and writes nothing"""
+        from Scanner.models import Resume, StaleResume
+        other = Resume.objects.get(pk=self.resume.pk)
+        other.set_extracted_text({"skills": ["Rust"]})
+
+        with self.assertRaises(StaleResume):
+            self.resume.set_recommendation_skills({"missing_technical_skills": ["Go"]}, expected_version=0)
+        self.assertIsNone(Resume.objects.get(pk=self.resume.pk).recommendation_skills)
+
+        with self.assertNumQueries(1):
+            self.resume.set_recommendation_skills({"missing_technical_skills": ["Go"]}, expected_version=1)
+            self.assertEqual(self.resume.version, 2)
+
+    def test_errors_are_raised(self):
+        """Test that setters raise instead of swallowing database errors"""
+        from Scanner.models import Resume
+        Resume.objects.filter(pk=self.resume.pk).delete()
+        with self.assertRaises(Resume.DoesNotExist):
+            self.resume.set_preferred_location("Boston")
+
+
+class TestResumeListings(TestCase):
+    """Tests that listing pages load resumes without their large JSON columns"""
+
+    def setUp(self):
+        from Scanner.models import Resume
+        from UserAuth.models import UserProfile
+        self.user = User.objects.create_user(username="list_user", password="mypassword", is_staff=True,
+                                             is_superuser=True)
+        UserProfile.objects.create(user=self.user)
+        self.client.login(username="list_user", password="mypassword")
+        for _ in range(3):
+            Resume.objects.create(user=self.user, career_field="Software Engineering",
+                                  extracted_text={"skills": ["Python"] * 100},
+                                  recommendation_skills={"summary": "x" * 1000})
+
+    def _resume_selects(self, url):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return [query["sql"] for query in queries if 'FROM "Scanner_resume"' in query["sql"]]
+
+    def test_user_account_lists_metadata_only(self):
+        """Test that the account page reads resumes without their JSON columns"""
+        from django.urls import reverse
+        selects = self._resume_selects(reverse("user-account", args=[self.user.pk]))
+        self.assertEqual(len(selects), 1)
+        self.assertNotIn("extracted_text", selects[0])
+        self.assertNotIn("recommendation_skills", selects[0])
+
+    def test_admin_change_list_defers_json_but_change_form_does_not(self):
+        """Test that only the admin change list defers the JSON columns"""
+        from Scanner.models import Resume
+        selects = self._resume_selects("/admin/Scanner/resume/")
+        self.assertTrue(selects)
+        self.assertFalse([sql for sql in selects if "extracted_text" in sql])
+
+        resume = Resume.objects.first()
+        selects = self._resume_selects(f"/admin/Scanner/resume/{resume.pk}/change/")
+        self.assertIn("extracted_text", selects[0])
+
+
+class TestResumeTaskQueue(TestCase):
+    """Tests for background resume extraction through the task queue"""
+
+    def setUp(self):
+        from Scanner.models import Resume
+        self.user = User.objects.create_user(username="task_user", password="mypassword")
+        self.client.login(username="task_user", password="mypassword")
+        self.resume = Resume.objects.create(user=self.user, resume_file="UserResumes/cv.pdf")
+        self.resume.set_raw_text("Jane Smith\nSKILLS\nPython")
+
+    def test_enqueue_dedupes_and_claim_takes_the_oldest(self):
+        """Test that enqueue dedupes pending tasks and claim takes the oldest"""
+        from Scanner.models import Resume, ResumeTask
+
+        first = ResumeTask.objects.enqueue(self.resume, ResumeTask.EXTRACT)
+        self.assertEqual(ResumeTask.objects.enqueue(self.resume, ResumeTask.EXTRACT), first)
+        other = ResumeTask.objects.enqueue(Resume.objects.create(user=self.user), ResumeTask.EXTRACT)
+        self.assertEqual(other.queue_position(), 2)
+
+        claimed = ResumeTask.objects.claim("test:0")
+        self.assertEqual((claimed.pk, claimed.status, claimed.attempts), (first.pk, ResumeTask.RUNNING, 1))
+        self.assertEqual(ResumeTask.objects.get(pk=other.pk).queue_position(), 1)
+        self.assertEqual(ResumeTask.objects.stats()["workers"], ["test:0"])
+
+    def test_stale_tasks_are_retried_then_failed(self):
+        """Test that stale tasks are requeued until they run out of attempts"""
+        from datetime import timedelta
+        from django.utils import timezone
+        from Scanner.models import ResumeTask
+
+        task = ResumeTask.objects.enqueue(self.resume, ResumeTask.EXTRACT)
+        ResumeTask.objects.claim("dead:0")
+        ResumeTask.objects.filter(pk=task.pk).update(started_at=timezone.now() - timedelta(seconds=600))
+
+        self.assertEqual(ResumeTask.objects.requeue_stale(300, max_attempts=2), (1, 0))
+        ResumeTask.objects.claim("dead:0")
+        ResumeTask.objects.filter(pk=task.pk).update(started_at=timezone.now() - timedelta(seconds=600))
+        self.assertEqual(ResumeTask.objects.requeue_stale(300, max_attempts=2), (0, 1))
+        self.assertEqual(ResumeTask.objects.get(pk=task.pk).status, ResumeTask.FAILED)
+
+    @override_settings(TASK_LEASE_SECONDS=0.01)
+    def test_single_threaded_worker_recovers_tasks_of_a_dead_worker(self):
+        """Test that a single-threaded worker requeues tasks left by a dead worker"""
+        from datetime import timedelta
+        from django.core.management import call_command
+        from django.utils import timezone
+        from Scanner.management.commands.run_task_worker import Command
+        from Scanner.models import Resume, ResumeTask
+
+        first = ResumeTask.objects.enqueue(self.resume, ResumeTask.EXTRACT)
+        orphan = ResumeTask.objects.enqueue(Resume.objects.create(user=self.user), ResumeTask.EXTRACT)
+
+        def extract(task):
+            if task.pk == first.pk:
+                # Meanwhile another worker claimed the second task and died
+                ResumeTask.objects.filter(pk=orphan.pk).update(
+                    status=ResumeTask.RUNNING, worker="dead:0", attempts=1,
+                    started_at=timezone.now() - timedelta(seconds=600))
+                time.sleep(0.02)
+
+        with patch.dict('Scanner.tasks.HANDLERS', {ResumeTask.EXTRACT: extract}), \
+                patch.object(Command, 'heartbeat'):
+            call_command("run_task_worker", "--once", "--concurrency", "1", stdout=StringIO())
+
+        orphan = ResumeTask.objects.get(pk=orphan.pk)
+        self.assertEqual((orphan.status, orphan.attempts), (ResumeTask.DONE, 2))
+
+    def test_heartbeat_keeps_long_running_tasks_leased(self):
+        """Test that the heartbeat renews the lease of running tasks"""
+        from datetime import timedelta
+        from django.utils import timezone
+        from Scanner.management.commands.run_task_worker import Command
+        from Scanner.models import ResumeTask
+
+        task = ResumeTask.objects.enqueue(self.resume, ResumeTask.EXTRACT)
+        ResumeTask.objects.claim("live:0")
+        ResumeTask.objects.filter(pk=task.pk).update(started_at=timezone.now() - timedelta(seconds=600))
+
+        command = Command()
+        command.lock, command.running, command.interval = threading.Lock(), {task.pk}, 0
+        command.finished = Mock(wait=Mock(side_effect=[False, True]))
+        with patch('Scanner.management.commands.run_task_worker.connection'):
+            command.heartbeat()
+
+        self.assertEqual(ResumeTask.objects.requeue_stale(300, max_attempts=3), (0, 0))
+        self.assertEqual(ResumeTask.objects.get(pk=task.pk).status, ResumeTask.RUNNING)
+
+    @patch('Scanner.views.extract_resume_basic_data_fast')
+    def test_detail_page_polls_until_the_worker_is_done(self, mock_claude):
+        """Test that the detail page waits for the worker instead of extracting inline"""
+        from django.core.management import call_command
+        from django.urls import reverse
+        from Scanner.models import ResumeTask
+
+        mock_claude.return_value = {"name": "Jane Smith", "skills": ["Python"]}
+        detail_url = reverse("resume_detail_page", args=["task_user", self.resume.pk])
+        status_url = reverse("resume_status", args=["task_user", self.resume.pk])
+
+        response = self.client.get(detail_url)
+        self.assertIsNotNone(response.context["task"])
+        mock_claude.assert_not_called()
+        self.assertEqual(self.client.get(status_url).json(), {"status": "queued", "queue_position": 1})
+
+        call_command("run_task_worker", "--once", "--concurrency", "1", stdout=StringIO())
+
+        self.assertEqual(self.client.get(status_url).json()["status"], ResumeTask.DONE)
+        response = self.client.get(detail_url)
+        self.assertEqual(response.context["resume_file"]["name"], "Jane Smith")
+
+    @patch('Scanner.views.extract_resume_basic_data_fast')
+    def test_failed_extraction_is_reported_once_and_discards_the_resume(self, mock_claude):
+        """Test that a failed extraction is reported once and the resume discarded"""
+        from django.core.management import call_command
+        from django.urls import reverse
+        from Scanner.models import Resume, ResumeTask
+        from UserAuth.models import UserProfile
+
+        profile = UserProfile.objects.create(user=self.user, resume_uploaded=1)
+        mock_claude.return_value = {"error": "bad output"}
+        ResumeTask.objects.enqueue(self.resume, ResumeTask.EXTRACT)
+        call_command("run_task_worker", "--once", "--concurrency", "1", stdout=StringIO())
+
+        task = ResumeTask.objects.latest_for(self.resume, ResumeTask.EXTRACT)
+        self.assertEqual(task.status, ResumeTask.FAILED)
+        self.assertIn("Failed to process PDF resume", task.error)
+
+        response = self.client.get(reverse("resume_detail_page", args=["task_user", self.resume.pk]))
+        self.assertRedirects(response, reverse("resume_upload_page", args=["task_user"]), fetch_redirect_response=False)
+        self.assertFalse(Resume.objects.filter(pk=self.resume.pk).exists())
+        profile.refresh_from_db()
+        self.assertEqual(profile.resume_uploaded, 0)
+
+    def test_status_endpoint_is_owner_only(self):
+        """Test that other users cannot read the task status"""
+        from django.urls import reverse
+
+        User.objects.create_user(username="other_user", password="mypassword")
+        self.client.login(username="other_user", password="mypassword")
+
+        response = self.client.get(reverse("resume_status", args=["other_user", self.resume.pk]))
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(EVENTS_POLL_SECONDS=0.01)
+class TestResumeEvents(TestCase):
+    """Tests for the Server-Sent Events pipeline stream"""
+
+    def setUp(self):
+        from Scanner.models import Resume
+        self.user = User.objects.create_user(username="events_user", password="mypassword")
+        self.resume = Resume.objects.create(user=self.user, extracted_text={"name": "Jane Smith", "skills": ["Python"]})
+        self.async_client.force_login(self.user)
+
+    async def _next_event(self, stream):
+        import asyncio
+        chunk = await asyncio.wait_for(anext(stream), timeout=5)
+        chunk = chunk.decode() if isinstance(chunk, bytes) else chunk
+        lines = dict(line.split(": ", 1) for line in chunk.strip().splitlines())
+        return lines.get("event"), json.loads(lines["data"]) if "data" in lines else None
+
+    async def test_stages_are_pushed_as_they_change(self):
+        """Test that pipeline stages are pushed as they change"""
+        import asyncio
+        from asgiref.sync import sync_to_async
+        from django.urls import reverse
+        from Scanner.events import broker
+        from Scanner.models import Resume
+
+        response = await self.async_client.get(reverse("resume_events", args=["events_user", self.resume.pk]))
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await self._next_event(stream), (None, None))  # retry interval
+        self.assertEqual(await self._next_event(stream), ("extraction", {"status": "done"}))
+        self.assertEqual(await self._next_event(stream), ("resume", {"name": "Jane Smith", "skills": ["Python"]}))
+        event, data = await self._next_event(stream)
+        self.assertEqual((event, data["status"]), ("recommendation", ""))
+
+        await sync_to_async(self.resume.set_recommendation_status)(Resume.RECOMMENDATION_ANALYZING)
+        event, data = await self._next_event(stream)
+        self.assertEqual((event, data["status"], data["progress"]), ("recommendation", "analyzing", 70))
+        self.assertEqual(await self._next_event(stream), ("jobs", {"jobs": []}))
+        self.assertEqual(broker.subscriber_count(), 1)
+
+        # A client disconnect cancels the request task waiting on the stream
+        waiting = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiting
+        self.assertEqual(broker.subscriber_count(), 0)
+
+    async def test_other_users_cannot_subscribe(self):
+        """Test that other users cannot subscribe to the stream"""
+        from django.urls import reverse
+
+        other = await User.objects.acreate(username="other_events_user")
+        await self.async_client.aforce_login(other)
+        response = await self.async_client.get(reverse("resume_events", args=["other_events_user", self.resume.pk]))
+        self.assertEqual(response.status_code, 404)
+
+    async def test_asgi_application_streams_without_django_handler(self):
+        """Test that the ASGI application streams without reaching Django's handler"""
+        import asyncio
+        from django.urls import reverse
+        from Scanner.events import EventStreamApplication, broker
+
+        path = reverse("resume_events", args=["events_user", self.resume.pk])
+        sent, disconnect = [], asyncio.Event()
+
+        async def not_django(scope, receive, send):
+            raise AssertionError("the stream must not reach Django's handler")
+
+        async def receive():
+            await disconnect.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+
+        def scope(cookie):
+            return {"type": "http", "method": "GET", "path": path, "query_string": b"", "root_path": "",
+                    "headers": [(b"host", b"testserver"), (b"cookie", cookie.encode())]}
+
+        application = EventStreamApplication(not_django)
+        await application(scope(""), receive, send)
+        self.assertEqual(sent[0]["status"], 404)
+
+        sent.clear()
+        session = self.async_client.cookies["sessionid"].value
+        running = asyncio.ensure_future(application(scope(f"sessionid={session}"), receive, send))
+        while len(sent) < 3:
+            await asyncio.sleep(0.01)
+        self.assertEqual(sent[0]["status"], 200)
+        self.assertTrue(sent[2]["body"].startswith(b"event: extraction"))
+
+        disconnect.set()
+        await asyncio.wait_for(running, timeout=5)
+        self.assertEqual(broker.subscriber_count(), 0)
@@ -3,15 +3,41 @@ import datetime
 import os
 import json
 import re
-from io import BytesIO
 from docx import Document
+from docx.opc.coreprops import CoreProperties
 from docx.oxml.ns import qn
+from docx.oxml.parser import parse_xml
 from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.styles import BabelFish
+from docx.text.run import Run
 from lxml import etree
 import logging
 
 logger = logging.getLogger(__name__)
 
+RELS_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+W_BODY = qn("w:body")
+W_P = qn("w:p")
+W_R = qn("w:r")
+W_TBL = qn("w:tbl")
+W_TR = qn("w:tr")
+W_TC = qn("w:tc")
+W_VAL = qn("w:val")
+W_HYPERLINK = qn("w:hyperlink")
+W_BOOKMARK_START = qn("w:bookmarkStart")
+R_ID = qn("r:id")
+
+# Run inner-content elements and their text equivalent (same mapping python-docx uses)
+RUN_TEXT_TAGS = {
+    qn("w:t"): None,
+    qn("w:tab"): "\t",
+    qn("w:ptab"): "\t",
+    qn("w:cr"): "\n",
+    qn("w:noBreakHyphen"): "-",
+    qn("w:br"): "\n",
+}
+
 
 def emu_to_px(emu, dpi=96):
     # 1 inch = 914400 EMU; px = inches * dpi
@@ -19,7 +45,19 @@ def emu_to_px(emu, dpi=96):
 
 
 def get_core_properties(doc):
-    core = doc.core_properties
+    return core_properties_to_dict(doc.core_properties)
+
+
+def get_core_properties_from_zip(docx_zip):
+    # docProps/core.xml is tiny; reuse python-docx's parsing without loading the whole package
+    try:
+        xml = docx_zip.read("docProps/core.xml")
+    except KeyError:
+        return {}
+    return core_properties_to_dict(CoreProperties(parse_xml(xml)))
+
+
+def core_properties_to_dict(core):
 
     def dt(v):
         if not v:
@@ -73,49 +111,85 @@ def get_app_properties(docx_zip):
         return {}
 
 
-def extract_paragraphs(doc):
+class ParagraphIndex:
+    """
+    Lookups extract_paragraphs needs, computed once per document instead of per run:
+    run element -> hyperlink target, paragraph -> list numbering, and style id ->
+    (style name, heading level). Keeps the converter linear in document size.
+    """
+
+    def __init__(self, doc):
+        rels = doc.part.rels
+        self.hyperlinks = {}
+        for hyperlink in doc.element.body.iter(W_HYPERLINK):
+            rel_id = hyperlink.get(R_ID)
+            if rel_id in rels:
+                target = rels[rel_id].target_ref
+                for r in hyperlink.iter(W_R):
+                    self.hyperlinks[r] = target
+
+        self.style_names = {}
+        self.default_styles = {}
+        for style in doc.styles.element.iterchildren(qn("w:style")):
+            style_type = style.get(qn("w:type"), "paragraph")
+            name = BabelFish.internal2ui(style.name_val) if style.name_val else None
+            self.style_names[(style_type, style.styleId)] = name
+            if style.default:
+                self.default_styles[style_type] = name
+        self.heading_levels = {}
+
+    def style_name(self, style_id, style_type):
+        if style_id is not None and (style_type, style_id) in self.style_names:
+            return self.style_names[(style_type, style_id)]
+        return self.default_styles.get(style_type)
+
+    def heading_level(self, style_name):
+        if style_name not in self.heading_levels:
+            match = re.match(r"Heading \d+", style_name or "")
+            self.heading_levels[style_name] = int(style_name.split()[-1]) if match else None
+        return self.heading_levels[style_name]
+
+    @staticmethod
+    def list_info(p_elm):
+        numPr = p_elm.pPr.numPr if p_elm.pPr is not None else None
+        if numPr is None:
+            return None
+        return {
+            "level": numPr.ilvl.val if numPr.ilvl is not None else 0,
+            "num_id": numPr.numId.val if numPr.numId is not None else None
+        }
+
+
+def extract_paragraphs(doc, index=None):
+    index = index or ParagraphIndex(doc)
     data = []
     for p in doc.paragraphs:
-        # Determine if this paragraph is part of a list
-        # Heuristic: inspect numPr
         p_elm = p._p
-        numPr = p_elm.find(qn('w:numPr'))
-        list_info = None
-        if numPr is not None:
-            ilvl = numPr.find(qn('w:ilvl'))
-            numId = numPr.find(qn('w:numId'))
-            list_info = {
-                "level": int(ilvl.get(qn('w:val'))) if ilvl is not None else 0,
-                "num_id": int(numId.get(qn('w:val'))) if numId is not None else None
-            }
         runs = []
-        for r in p.runs:
+        # Direct runs plus runs nested in hyperlinks, in document order
+        for r_elm in p_elm.iter(W_R):
+            if r_elm.getparent() is not p_elm and r_elm not in index.hyperlinks:
+                continue
+            r = Run(r_elm, p)
             r_info = {
                 "text": r.text,
                 "bold": r.bold,
                 "italic": r.italic,
                 "underline": r.underline,
-                "style": r.style.name if r.style else None
+                "style": index.style_name(r_elm.style, "character")
             }
-            # Hyperlink detection (search ancestor)
-            parent = r._element
-            hyperlink = None
-            while parent is not None:
-                if parent.tag == qn('w:hyperlink'):
-                    hyperlink = parent.get(qn('r:id'))
-                    break
-                parent = parent.getparent()
-            if hyperlink and hyperlink in p.part.rels:
-                target = p.part.rels[hyperlink].target_ref
-                r_info["hyperlink"] = target
+            if r_elm in index.hyperlinks:
+                r_info["hyperlink"] = index.hyperlinks[r_elm]
             runs.append(r_info)
+
+        style = index.style_name(p_elm.style, "paragraph")
+        heading_level = index.heading_level(style)
         data.append({
             "text": p.text,
-            "style": p.style.name if p.style else None,
-            "is_heading": bool(re.match(r"Heading \d+", p.style.name if p.style else "")),
-            "heading_level": int(p.style.name.split()[-1]) if p.style and re.match(r"Heading \d+",
-                                                                                   p.style.name) else None,
-            "list": list_info,
+            "style": style,
+            "is_heading": heading_level is not None,
+            "heading_level": heading_level,
+            "list": index.list_info(p_elm),
             "runs": runs
         })
     return data
@@ -238,19 +312,279 @@ def extract_hyperlinks_raw(doc):
     return links
 
 
+def read_relationships(docx_zip, rels_path="word/_rels/document.xml.rels"):
+    try:
+        tree = etree.fromstring(docx_zip.read(rels_path))
+    except KeyError:
+        return []
+    return [
+        {
+            "rel_id": rel.get("Id"),
+            "type": rel.get("Type"),
+            "target": rel.get("Target"),
+            "external": rel.get("TargetMode") == "External"
+        }
+        for rel in tree.iter(f"{{{RELS_NS}}}Relationship")
+    ]
+
+
+def read_style_names(docx_zip):
+    """
+    Map (style type, style id) to the UI style name, plus the default style name per type,
+    so paragraphs and runs can be labelled without python-docx's object model.
+    """
+    names, defaults = {}, {}
+    try:
+        tree = etree.fromstring(docx_zip.read("word/styles.xml"))
+    except KeyError:
+        return names, defaults
+
+    for style in tree.iter(qn("w:style")):
+        name_el = style.find(qn("w:name"))
+        name = BabelFish.internal2ui(name_el.get(W_VAL)) if name_el is not None else None
+        style_type = style.get(qn("w:type"), "paragraph")
+        names[(style_type, style.get(qn("w:styleId")))] = name
+        if style.get(qn("w:default")) in ("1", "true", "on"):
+            defaults[style_type] = name
+    return names, defaults
+
+
+def _on_off(rPr, tag):
+    # Tri-state like python-docx: None when not set, True/False when the element is present
+    if rPr is None:
+        return None
+    el = rPr.find(tag)
+    if el is None:
+        return None
+    return el.get(W_VAL) not in ("0", "false", "off")
+
+
+def _underline(rPr):
+    if rPr is None:
+        return None
+    el = rPr.find(qn("w:u"))
+    if el is None:
+        return None
+    val = el.get(W_VAL)
+    if val == "single":
+        return True
+    if val in (None, "none"):
+        return False
+    return val
+
+
+def _run_text(r):
+    parts = []
+    for child in r:
+        if child.tag not in RUN_TEXT_TAGS:
+            continue
+        if child.tag == qn("w:t"):
+            parts.append(child.text or "")
+        elif child.tag == qn("w:br") and child.get(qn("w:type"), "textWrapping") != "textWrapping":
+            continue
+        else:
+            parts.append(RUN_TEXT_TAGS[child.tag])
+    return "".join(parts)
+
+
+def _paragraph_text(p):
+    parts = []
+    for child in p:
+        if child.tag == W_R:
+            parts.append(_run_text(child))
+        elif child.tag == W_HYPERLINK:
+            parts.extend(_run_text(r) for r in child.iterchildren(W_R))
+    return "".join(parts)
+
+
+def iter_body_blocks(docx_zip):
+    """
+    Yield body-level w:p and w:tbl elements of word/document.xml as they close,
+    clearing each one (and its preceding siblings) once the caller has moved on.
+    """
+    with docx_zip.open("word/document.xml") as xml_stream:
+        for _, elem in etree.iterparse(xml_stream, events=("end",), tag=(W_P, W_TBL)):
+            parent = elem.getparent()
+            if parent is None or parent.tag != W_BODY:
+                continue  # paragraphs inside tables are handled with their table
+            yield elem
+            elem.clear()
+            while elem.getprevious() is not None:
+                del parent[0]
+
+
+def extract_docx_text(docx_file):
+    """
+    Text-only fast path: flatten body paragraphs and table rows into plain resume text
+    without styles, runs or relationships. Table cells are joined with " | " per row.
+    """
+    lines = []
+    with zipfile.ZipFile(docx_file) as z:
+        for elem in iter_body_blocks(z):
+            if elem.tag == W_P:
+                lines.append(_paragraph_text(elem))
+                continue
+            for tr in elem.iterchildren(W_TR):
+                cells = []
+                for tc in tr.iterchildren(W_TC):
+                    cell_text = " ".join(_paragraph_text(p) for p in tc.iterchildren(W_P)).strip()
+                    if cell_text:
+                        cells.append(cell_text)
+                if cells:
+                    lines.append(" | ".join(cells))
+    return "\n".join(lines)
+
+
+class StreamingDocxReader:
+    """
+    Single pass over word/document.xml with lxml iterparse.
+
+    Only body-level paragraphs and tables are materialised, one at a time; each one is
+    cleared (with its preceding siblings) as soon as it has been converted, so memory
+    stays flat regardless of document length. Produces the same shapes as
+    extract_paragraphs / extract_tables / extract_bookmarks. Unlike python-docx's
+    Paragraph.runs, runs nested in w:hyperlink are included and carry their target,
+    and list info is read from w:pPr/w:numPr.
+    """
+
+    def __init__(self, docx_zip):
+        self.docx_zip = docx_zip
+        self.style_names, self.default_styles = read_style_names(docx_zip)
+        self.hyperlink_targets = {
+            rel["rel_id"]: rel["target"]
+            for rel in read_relationships(docx_zip)
+            if rel["type"] == RT.HYPERLINK
+        }
+
+    def style_name(self, style_id, style_type):
+        if style_id is not None and (style_type, style_id) in self.style_names:
+            return self.style_names[(style_type, style_id)]
+        return self.default_styles.get(style_type)
+
+    def read(self):
+        paragraphs, tables, bookmarks = [], [], []
+        for elem in iter_body_blocks(self.docx_zip):
+            if elem.tag == W_P:
+                paragraph = self.paragraph(elem)
+                paragraphs.append(paragraph)
+                for b in elem.iter(W_BOOKMARK_START):
+                    name = b.get(qn("w:name"))
+                    if name:
+                        bookmarks.append({
+                            "id": b.get(qn("w:id")),
+                            "name": name,
+                            "paragraph_text": paragraph["text"]
+                        })
+            else:
+                tables.append(self.table(elem, len(tables)))
+        return {"paragraphs": paragraphs, "tables": tables, "bookmarks": bookmarks}
+
+    def run(self, r, hyperlink=None):
+        rPr = r.find(qn("w:rPr"))
+        rStyle = rPr.find(qn("w:rStyle")) if rPr is not None else None
+        r_info = {
+            "text": _run_text(r),
+            "bold": _on_off(rPr, qn("w:b")),
+            "italic": _on_off(rPr, qn("w:i")),
+            "underline": _underline(rPr),
+            "style": self.style_name(rStyle.get(W_VAL) if rStyle is not None else None, "character")
+        }
+        if hyperlink in self.hyperlink_targets:
+            r_info["hyperlink"] = self.hyperlink_targets[hyperlink]
+        return r_info
+
+    def paragraph(self, p):
+        pPr = p.find(qn("w:pPr"))
+        pStyle = pPr.find(qn("w:pStyle")) if pPr is not None else None
+        numPr = pPr.find(qn("w:numPr")) if pPr is not None else None
+
+        list_info = None
+        if numPr is not None:
+            ilvl = numPr.find(qn("w:ilvl"))
+            numId = numPr.find(qn("w:numId"))
+            list_info = {
+                "level": int(ilvl.get(W_VAL)) if ilvl is not None else 0,
+                "num_id": int(numId.get(W_VAL)) if numId is not None else None
+            }
+
+        runs = []
+        for child in p:
+            if child.tag == W_R:
+                runs.append(self.run(child))
+            elif child.tag == W_HYPERLINK:
+                rel_id = child.get(R_ID)
+                runs.extend(self.run(r, rel_id) for r in child.iterchildren(W_R))
+
+        style = self.style_name(pStyle.get(W_VAL) if pStyle is not None else None, "paragraph")
+        heading = re.match(r"Heading \d+", style or "")
+        return {
+            "text": _paragraph_text(p),
+            "style": style,
+            "is_heading": bool(heading),
+            "heading_level": int(style.split()[-1]) if heading else None,
+            "list": list_info,
+            "runs": runs
+        }
+
+    def table(self, tbl, index):
+        tinfo = {"index": index, "rows": []}
+        cells_above = {}
+        for tr in tbl.iterchildren(W_TR):
+            trPr = tr.find(qn("w:trPr"))
+            grid_before = trPr.find(qn("w:gridBefore")) if trPr is not None else None
+            offset = int(grid_before.get(W_VAL)) if grid_before is not None else 0
+
+            row_data, cells_here = [], {}
+            for tc in tr.iterchildren(W_TC):
+                tcPr = tc.find(qn("w:tcPr"))
+                grid_span, v_merge = 1, None
+                continues_above = False
+                if tcPr is not None:
+                    gridSpan_el = tcPr.find(qn("w:gridSpan"))
+                    vMerge_el = tcPr.find(qn("w:vMerge"))
+                    if gridSpan_el is not None:
+                        grid_span = int(gridSpan_el.get(W_VAL))
+                    if vMerge_el is not None:
+                        v_merge = vMerge_el.get(W_VAL)
+                        continues_above = v_merge in (None, "continue")
+
+                # Vertically merged continuation cells repeat the cell that starts the merge
+                cell = cells_above.get(offset) if continues_above else None
+                if cell is None:
+                    cell = {
+                        "text": "\n".join(_paragraph_text(p) for p in tc.iterchildren(W_P)),
+                        "grid_span": grid_span,
+                        "v_merge": v_merge
+                    }
+                cells_here[offset] = cell
+                row_data.extend([cell] * grid_span)
+                offset += grid_span
+
+            cells_above = cells_here
+            tinfo["rows"].append(row_data)
+        return tinfo
+
+
 def extract_all(docx_file, include_raw_xml=False):
-    doc = Document(docx_file)
     with zipfile.ZipFile(docx_file) as z:
+        body = StreamingDocxReader(z).read()
+        rels = read_relationships(z)
         data = {
-            "core_properties": get_core_properties(doc),
+            "core_properties": get_core_properties_from_zip(z),
             "app_properties": get_app_properties(z),
-            "paragraphs": extract_paragraphs(doc),
-            "tables": extract_tables(doc),
-            "images": extract_images(doc, ""),
-            "other_media": extract_media(doc),
-            "hyperlinks_raw": extract_hyperlinks_raw(doc),
+            "paragraphs": body["paragraphs"],
+            "tables": body["tables"],
+            "images": [],
+            "other_media": [
+                {"rel_id": rel["rel_id"], "type": rel["type"], "target": rel["target"]}
+                for rel in rels if rel["type"] != RT.IMAGE
+            ],
+            "hyperlinks_raw": [
+                {"rel_id": rel["rel_id"], "target": rel["target"]}
+                for rel in rels if rel["type"] == RT.HYPERLINK
+            ],
             "comments": extract_comments(z),
-            "bookmarks": extract_bookmarks(doc),
+            "bookmarks": body["bookmarks"],
             "footnotes": extract_notes(z, "footnotes"),
             "endnotes": extract_notes(z, "endnotes")
         }
@@ -271,11 +605,8 @@ def extract_text_from_docx(resume_model):
     try:
         file_field = resume_model.resume_file
         with file_field.open('rb') as docx_file:
-            # Create a BytesIO object from the file content
-            docx_content = BytesIO(docx_file.read())
-
-            # Extract all data from the DOCX
-            extracted_data = extract_all(docx_content, include_raw_xml=False)
+            # zipfile reads the members it needs straight from the file; no in-memory copy
+            extracted_data = extract_all(docx_file, include_raw_xml=False)
 
             # Get total text length for logging
             total_text = ""
@@ -6,10 +6,12 @@ import json
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 
-from .forms import ResumeForm
-from .models import Resume
+from .events import resume_event_stream
+from .forms import ResumeForm, SUPPORTED_RESUME_EXTENSIONS
+from .models import Resume, ResumeTask, ResumeText
+from .utils.conversion import extract_docx_text
 from UserAuth.models import UserProfile
 
 import PyPDF2
@@ -138,55 +140,115 @@ def validate_resume(extracted_text: str) -> bool:
     )
 
 
-def extract_text_from_pdf(resume_model):
-    """Extract text from PDF resume and run fast Claude analysis."""
-    logger.info(f"[EXTRACT PDF] Extracting text for resume ID {resume_model.id}")
+def iter_pdf_pages(pdf_file, char_budget=None):
+    """
+    Yield the text of each PDF page lazily, in order.
+    With a char_budget, stop after the page that brings the total to the budget,
+    so quick checks never pay for parsing the rest of the document.
+    """
+    pdf_reader = PyPDF2.PdfReader(pdf_file)
+    total = 0
+    for i, page in enumerate(pdf_reader.pages):
+        page_text = page.extract_text() or ""
+        logger.debug(f"[READ PDF] Page {i + 1} text length: {len(page_text)}")
+        yield page_text
+
+        total += len(page_text)
+        if char_budget is not None and total >= char_budget:
+            logger.debug(f"[READ PDF] Budget of {char_budget} chars reached after {i + 1} pages")
+            return
+
+
+def read_pdf_text(pdf_file, char_budget=None):
+    """Read the selectable text out of an open PDF file object, up to char_budget chars."""
+    full_text = "".join(iter_pdf_pages(pdf_file, char_budget=char_budget))
+    if char_budget is not None:
+        return full_text[:char_budget]
+    return full_text
+
+
+def read_resume_file_text(resume_model):
+    """Plain text of the uploaded file: PyPDF2 for PDFs, the text-only DOCX reader for Word files."""
+    file_extension = os.path.splitext(resume_model.resume_file.name.lower())[1]
+    with resume_model.resume_file.open('rb') as resume_file:
+        if file_extension == '.docx':
+            return extract_docx_text(resume_file)
+        return read_pdf_text(resume_file)
+
+
+def store_resume_text(resume_model):
+    """
+    Read the plain text out of the uploaded file once and persist it on the resume,
+    so later stages never have to reopen the file from storage. Returns the text.
+    """
+    logger.info(f"[STORE TEXT] Reading text for resume ID {resume_model.id}")
+    full_text = read_resume_file_text(resume_model)
+
+    resume_model.set_raw_text(full_text)
+    logger.info(f"[STORE TEXT] Stored {len(full_text)} chars for resume ID {resume_model.id}")
+    return full_text
+
+
+def get_cached_extraction(resume_model):
+    """Claude output already stored for a resume with identical text, or None"""
     try:
-        file_field = resume_model.resume_file
-        with file_field.open('rb') as pdf_file:
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            logger.debug(f"[EXTRACT PDF] PDF has {len(pdf_reader.pages)} pages")
+        return ResumeText.objects.find_extracted_data(resume_model)
+    except Exception as error:
+        # Cache lookups must never block a fresh extraction
+        logger.error(f"[EXTRACT TEXT] Cache lookup failed for resume ID {resume_model.id}: {error}")
+        return None
 
-            text = []
-            for i, page in enumerate(pdf_reader.pages):
-                page_text = page.extract_text() or ""
-                logger.debug(f"[EXTRACT PDF] Page {i + 1} text length: {len(page_text)}")
-                text.append(page_text)
 
-            full_text = "".join(text)
-            logger.info(f"[EXTRACT PDF] Total extracted text length: {len(full_text)}")
+def extract_text_from_document(resume_model, use_cache=True):
+    """Extract text from a PDF or DOCX resume and run fast Claude analysis."""
+    logger.info(f"[EXTRACT TEXT] Extracting text for resume ID {resume_model.id}")
+    try:
+        full_text = resume_model.get_raw_text()
+        if full_text is None:
+            # Uploaded before raw text was persisted; read the file once and keep it
+            logger.info("[EXTRACT TEXT] No stored raw text, reading the resume file")
+            full_text = store_resume_text(resume_model)
+
+        logger.info(f"[EXTRACT TEXT] Total extracted text length: {len(full_text)}")
 
-            # Debug: Show first 500 characters of extracted text
-            logger.info(f"[EXTRACT PDF] First 500 chars: {full_text[:500]}...")
+        # Debug: Show first 500 characters of extracted text
+        logger.info(f"[EXTRACT TEXT] First 500 chars: {full_text[:500]}...")
 
-            # Guard: scanned PDFs often yield empty text without OCR
-            if not full_text.strip():
-                logger.warning("[EXTRACT PDF] No selectable text; likely a scanned PDF.")
-                return -1
+        # Guard: scanned PDFs often yield empty text without OCR
+        if not full_text.strip():
+            logger.warning("[EXTRACT TEXT] No selectable text; likely a scanned PDF or an empty document.")
+            return -1
 
-            # Call fast Claude AI extraction with timeout
-            logger.info("[EXTRACT PDF] Sending to Claude AI for fast extraction...")
-            claude_result = extract_resume_basic_data_fast(full_text, timeout_seconds=20)
+        # Same text uploaded before (by anyone): reuse the result instead of calling Claude again
+        if use_cache:
+            cached = get_cached_extraction(resume_model)
+            if cached:
+                logger.info("[EXTRACT TEXT] Reusing extraction for identical resume text")
+                return cached
 
-            # Debug: Log Claude AI response
-            logger.info(f"[EXTRACT PDF] Claude AI response type: {type(claude_result)}")
+        # Call fast Claude AI extraction with timeout
+        logger.info("[EXTRACT TEXT] Sending to Claude AI for fast extraction...")
+        claude_result = extract_resume_basic_data_fast(full_text, timeout_seconds=20)
 
-            # Check for errors
-            if isinstance(claude_result, dict) and "error" in claude_result:
-                logger.error(f"[EXTRACT PDF] Claude AI error: {claude_result['error']}")
-                return -1
+        # Debug: Log Claude AI response
+        logger.info(f"[EXTRACT TEXT] Claude AI response type: {type(claude_result)}")
 
-            logger.info("[EXTRACT PDF] Claude AI extraction successful")
-            return claude_result
+        # Check for errors
+        if isinstance(claude_result, dict) and "error" in claude_result:
+            logger.error(f"[EXTRACT TEXT] Claude AI error: {claude_result['error']}")
+            return -1
+
+        logger.info("[EXTRACT TEXT] Claude AI extraction successful")
+        return claude_result
 
     except Exception as error:
-        logger.error(f"[EXTRACT PDF] Error extracting PDF text: {error}")
+        logger.error(f"[EXTRACT TEXT] Error extracting resume text: {error}")
         return -1
 
 
-def extract_text_from_resume(resume_model):
+def extract_text_from_resume(resume_model, use_cache=True):
     """
-    PDF-only extraction. Returns processed text (dict) or -1 on error.
+    PDF and DOCX extraction. Returns processed text (dict) or -1 on error.
     """
     logger.info(f"[EXTRACT RESUME] Starting extraction for resume ID {resume_model.id}")
     try:
@@ -194,11 +256,11 @@ def extract_text_from_resume(resume_model):
         file_extension = os.path.splitext(file_name)[1]
         logger.info(f"[EXTRACT RESUME] File extension: {file_extension}")
 
-        if file_extension != '.pdf':
-            logger.error(f"[EXTRACT RESUME] Unsupported file type for PDF-only mode: {file_extension}")
+        if file_extension not in SUPPORTED_RESUME_EXTENSIONS:
+            logger.error(f"[EXTRACT RESUME] Unsupported file type: {file_extension}")
             return -1
 
-        return extract_text_from_pdf(resume_model)
+        return extract_text_from_document(resume_model, use_cache=use_cache)
 
     except Exception as error:
         logger.error(f"[EXTRACT RESUME] Error extracting resume text: {error}")
@@ -242,8 +304,14 @@ def resume_file_upload(request, username):
         resume_form = ResumeForm(request.POST, request.FILES)
 
         if resume_form.is_valid():
+            # Turn uploads away while the extraction workers are far behind
+            if ResumeTask.objects.is_full():
+                logger.warning(f"[FILE UPLOAD] Task queue full, rejecting upload for user {username}")
+                messages.error(request, "We are processing a lot of resumes right now. Please try again in a few minutes.")
+                return render(request, "resume_upload_page.html", {"form": resume_form})
+
             try:
-                # Save the resume with all form data
+                # Save the resume with all form data (the form only accepts PDF and DOCX)
                 resume = resume_form.save(commit=False)
                 resume.user = request.user
                 resume.save()
@@ -253,24 +321,24 @@ def resume_file_upload(request, username):
                 logger.info(f"[FILE UPLOAD] Experience level: {resume.experience_level}")
                 logger.info(f"[FILE UPLOAD] Preferred Location: {resume.preferred_location}")
 
-                # Enforce PDF-only immediately
                 file_extension = os.path.splitext(resume.resume_file.name.lower())[1]
                 logger.info(f"[FILE UPLOAD] File type: {file_extension}")
 
-                if file_extension != '.pdf':
-                    logger.warning("[FILE UPLOAD] Non-PDF upload rejected in PDF-only mode")
-                    messages.error(request, "Only PDF resumes are supported. Please upload a .pdf file.")
-                    # Do not increment; delete the placeholder resume
-                    resume.delete()
-                    return redirect("resume_upload_page", request.user.username)
+                # Keep the plain text next to the resume; Claude extraction runs in the task worker
+                try:
+                    store_resume_text(resume)
+                except Exception as error:
+                    # Not fatal: the extraction task falls back to reading the file
+                    logger.error(f"[FILE UPLOAD] Could not store raw text for resume {resume.id}: {error}")
+
+                ResumeTask.objects.enqueue(resume, ResumeTask.EXTRACT)
 
-                # PDF accepted; processing happens later on detail page
-                messages.success(request, "PDF resume uploaded successfully!")
+                # Accepted; the detail page shows progress until extraction is done
+                messages.success(request, f"{file_extension[1:].upper()} resume uploaded successfully!")
 
                 # Increment user's upload count ONLY on success
                 user_profile.increment_resume_upload()
 
-                # Redirect to detail page where extraction will occur
                 return redirect("resume_detail_page", request.user.username, resume.id)
 
             except Exception as error:
@@ -297,6 +365,19 @@ def resume_file_upload(request, username):
     return render(request, "resume_upload_page.html", {"form": resume_form})
 
 
+def discard_failed_resume(request, resume_id):
+    """Give the upload back to the user and delete a resume whose extraction failed"""
+    try:
+        user_profile = UserProfile.objects.get(user=request.user)
+        if user_profile.resume_uploaded > 0:
+            user_profile.resume_uploaded -= 1
+            user_profile.save()
+        Resume.delete_resume_by_id(resume_id)
+        logger.info(f"[DETAIL PAGE] Deleted failed resume ID {resume_id}")
+    except Exception as e:
+        logger.error(f"[DETAIL PAGE] Failed to delete resume ID {resume_id}: {e}")
+
+
 @login_required()
 def resume_detail_page(request, username, resume_id):
     logger.info(f"[DETAIL PAGE] Resume detail request for resume_id={resume_id} by {username}")
@@ -307,71 +388,41 @@ def resume_detail_page(request, username, resume_id):
         return redirect("login")
 
     resume_obj = get_object_or_404(Resume, id=resume_id, user__username=username)
-
-    file_extension = os.path.splitext(resume_obj.resume_file.name.lower())[1]
-    logger.debug(f"[DETAIL PAGE] Resume file type: {file_extension}")
-
-    # If not already extracted, do it now with timeout
-    if not resume_obj.get_extracted_text():
-        try:
-            logger.info(f"[DETAIL PAGE] Extracting text for resume ID {resume_id}")
-            extracted_data = extract_text_from_resume(resume_obj)
-
-            if not extracted_data or extracted_data == -1:
-                logger.warning(f"[DETAIL PAGE] Resume extraction failed for {file_extension} file")
-                if file_extension == '.pdf':
-                    error_msg = (
-                        "Failed to process PDF resume. This could be due to a timeout or "
-                        "the PDF containing scanned images without selectable text."
-                    )
-                else:
-                    error_msg = "Only PDF files are supported."
-                messages.error(request, error_msg)
-
-                try:
-                    user_profile = UserProfile.objects.get(user=request.user)
-                    if user_profile.resume_uploaded > 0:
-                        user_profile.resume_uploaded -= 1
-                        user_profile.save()
-                    resume_obj.delete_resume_by_id(resume_id)
-                    logger.info(f"[DETAIL PAGE] Deleted invalid resume ID {resume_id}")
-                except Exception as e:
-                    logger.error(f"[DETAIL PAGE] Failed to delete resume ID {resume_id}: {e}")
-
-                return redirect("resume_upload_page", request.user.username)
-
-            # Check if extraction returned an error
-            if isinstance(extracted_data, dict) and "error" in extracted_data:
-                logger.error(f"[DETAIL PAGE] Extraction error: {extracted_data['error']}")
-
-                # Handle timeout specifically
-                if "timeout" in extracted_data["error"].lower():
-                    error_msg = "Resume processing timed out. Please try uploading again or contact support."
-                else:
-                    error_msg = f"Resume processing failed: {extracted_data['error']}"
-
-                messages.error(request, error_msg)
-
-                try:
-                    user_profile = UserProfile.objects.get(user=request.user)
-                    if user_profile.resume_uploaded > 0:
-                        user_profile.resume_uploaded -= 1
-                        user_profile.save()
-                    resume_obj.delete_resume_by_id(resume_id)
-                    logger.info(f"[DETAIL PAGE] Deleted failed resume ID {resume_id}")
-                except Exception as e:
-                    logger.error(f"[DETAIL PAGE] Failed to delete resume ID {resume_id}: {e}")
-
-                return redirect("resume_upload_page", request.user.username)
-
-            # Save processed data
-            resume_obj.set_extracted_text(extracted_data)
-            logger.info(f"[DETAIL PAGE] Successfully extracted and saved text for resume ID {resume_id}")
-
-        except Exception as e:
-            logger.error(f"[DETAIL PAGE] Exception while extracting PDF resume: {e}")
-            messages.error(request, f"Error processing PDF resume: {str(e)}")
+    has_data = bool(resume_obj.get_extracted_text())
+    task = ResumeTask.objects.latest_for(resume_obj, ResumeTask.EXTRACT)
+
+    # A failed task is reported once, then forgotten
+    if task is not None and task.status == ResumeTask.FAILED:
+        task_error = task.error
+        task.delete()
+        task = None
+        if not has_data:
+            logger.warning(f"[DETAIL PAGE] Extraction failed for resume ID {resume_id}")
+            messages.error(request, task_error or "Resume processing failed. Please try uploading again.")
+            discard_failed_resume(request, resume_id)
             return redirect("resume_upload_page", request.user.username)
+        logger.warning(f"[DETAIL PAGE] Reprocessing failed for resume ID {resume_id}, keeping previous data")
+        messages.warning(request, "Could not reprocess the resume. Showing the previous results.")
+
+    # Re-run the Claude extraction from the stored text without touching the file
+    elif has_data and request.GET.get('refresh') and (task is None or not task.is_active):
+        logger.info(f"[DETAIL PAGE] Queueing reprocessing for resume ID {resume_id}")
+        task = ResumeTask.objects.enqueue(resume_obj, ResumeTask.EXTRACT, use_cache=False)
+
+    # Uploaded before the task queue (or its task was pruned): queue the extraction now
+    elif not has_data and (task is None or not task.is_active):
+        logger.info(f"[DETAIL PAGE] Queueing extraction for resume ID {resume_id}")
+        task = ResumeTask.objects.enqueue(resume_obj, ResumeTask.EXTRACT)
+
+    if task is not None and task.is_active:
+        # Rendered right away; the page polls resume_status and reloads once the worker is done
+        return render(request, "resume_detail_page.html", {
+            "resume": resume_obj,
+            "username": username,
+            "resume_id": resume_obj.id,
+            "task": task,
+            "queue_position": task.queue_position(),
+        })
 
     # Parse JSON/dict into a dict for the template
     raw = resume_obj.get_extracted_text()
@@ -393,4 +444,58 @@ def resume_detail_page(request, username, resume_id):
         "resume": resume_obj,
         "username": username,
         "resume_id": resume_obj.id,
-    })
\ No newline at end of file
+    })
+
+
+@login_required()
+def resume_status(request, username, resume_id):
+    """
+    Extraction status for the detail page to poll. Reads only the task row and
+    whether extracted data exists, never the JSON columns themselves.
+    """
+    if request.user.username != username:
+        return JsonResponse({"error": "Not found"}, status=404)
+
+    resumes = Resume.objects.filter(pk=resume_id, user=request.user)
+    if not resumes.exists():
+        return JsonResponse({"error": "Not found"}, status=404)
+
+    task = (
+        ResumeTask.objects
+        .filter(resume_id=resume_id, kind=ResumeTask.EXTRACT)
+        .only("status", "created_at")
+        .order_by("-created_at", "-pk")
+        .first()
+    )
+    if task is not None:
+        status = task.status
+    elif resumes.filter(extracted_text__isnull=False).exists():
+        status = ResumeTask.DONE
+    else:
+        status = ResumeTask.QUEUED
+
+    return JsonResponse({
+        "status": status,
+        "queue_position": task.queue_position() if task is not None else None,
+    })
+
+
+@login_required()
+async def resume_events(request, username, resume_id):
+    """
+    Server-Sent Events for a resume's pipeline: extraction and analysis stages,
+    plus the first skills, matched jobs and missing skills as they become
+    available. Under ASGI, Scanner.events.EventStreamApplication answers this
+    URL before Django does; this view serves it everywhere else (runserver).
+    """
+    user = await request.auser()
+    if user.username != username:
+        return JsonResponse({"error": "Not found"}, status=404)
+    if not await Resume.objects.filter(pk=resume_id, user=user).aexists():
+        return JsonResponse({"error": "Not found"}, status=404)
+
+    response = StreamingHttpResponse(resume_event_stream(resume_id), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Stop nginx and similar proxies from buffering the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -57,6 +57,8 @@ urlpatterns = [
     path('resume_upload/<str:username>/', ScannerViews.resume_upload_page, name='resume_upload_page'),
     path('resume_file_upload/<str:username>', ScannerViews.resume_file_upload, name='resume_file_upload'),
     path('resume_detail/<str:username>/<int:resume_id>', ScannerViews.resume_detail_page, name='resume_detail_page'),
+    path('resume_status/<str:username>/<int:resume_id>', ScannerViews.resume_status, name='resume_status'),
+    path('resume_events/<str:username>/<int:resume_id>', ScannerViews.resume_events, name='resume_events'),
 
 
     path(
@@ -69,6 +71,11 @@ urlpatterns = [
         EvaluatorViews.recommendation_skills_page,
         name='recommendation_skills'
     ),
+    path(
+        'recommendation_progress/<str:username>/<int:resume_id>',
+        EvaluatorViews.recommendation_progress,
+        name='recommendation_progress'
+    ),
     
     path('password-reset/', UserAuthViews.PasswordResetRequestView.as_view()),
     path('password-recovery/', UserAuthViews.PasswordResetRequestView.as_view()),
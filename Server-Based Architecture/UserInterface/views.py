@@ -349,9 +349,10 @@ def user_account(request, user_id):
             logger.info(f"[USER ACCOUNT] Resume status: {message}")
         except Exception as error:
             logger.error(f"[USER ACCOUNT] Resume status error: {error}")
-        user_resumes = Resume.objects.filter(user_id=user_id)
+        # The list shows career field and upload date only; the JSON columns stay in the database
+        user_resumes = list(Resume.objects.metadata().filter(user_id=user_id))
 
-        real_resume_count = user_resumes.count()
+        real_resume_count = len(user_resumes)
         if user_profile.get_resume_uploaded() != real_resume_count:
             logger.info(f"[USER ACCOUNT] Syncing resume count: {real_resume_count}")
             user_profile.set_resume_uploaded(real_resume_count)
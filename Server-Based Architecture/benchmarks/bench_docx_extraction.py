@@ -0,0 +1,130 @@
+"""
+Compare the python-docx based DOCX extraction (with its precomputed ParagraphIndex)
+with the single-pass streaming reader.
+
+Generates a large resume-like DOCX (paragraphs, headings, lists, hyperlinks, tables),
+then reports wall time and peak traced memory for both paths and checks that they
+agree on paragraph text, styles and table contents.
+
+Run from "Server-Based Architecture":
+    python benchmarks/bench_docx_extraction.py --paragraphs 2000 --tables 20
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+import tracemalloc
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx import Document
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+
+from Scanner.utils.conversion import (
+    StreamingDocxReader,
+    extract_bookmarks,
+    extract_paragraphs,
+    extract_tables,
+)
+
+
+def add_hyperlink(paragraph, url, text):
+    rel_id = paragraph.part.relate_to(url, RT.HYPERLINK, is_external=True)
+    hyperlink = OxmlElement("w:hyperlink")
+    hyperlink.set(qn("r:id"), rel_id)
+    run = OxmlElement("w:r")
+    t = OxmlElement("w:t")
+    t.text = text
+    run.append(t)
+    hyperlink.append(run)
+    paragraph._p.append(hyperlink)
+
+
+def build_docx(paragraphs, tables):
+    doc = Document()
+    for i in range(paragraphs):
+        if i % 50 == 0:
+            doc.add_heading(f"Section {i // 50}", level=1 + (i // 50) % 3)
+        elif i % 7 == 0:
+            doc.add_paragraph(f"Shipped feature {i} using Python, Django and AWS", style="List Bullet")
+        else:
+            p = doc.add_paragraph(f"Experience line {i}: ")
+            p.add_run("built services").bold = True
+            p.add_run("\tand mentored engineers").italic = True
+            if i % 25 == 0:
+                add_hyperlink(p, f"https://example.com/project/{i}", " project link")
+        if tables and i % max(1, paragraphs // tables) == 0:
+            table = doc.add_table(rows=4, cols=3)
+            for r, row in enumerate(table.rows):
+                for c, cell in enumerate(row.cells):
+                    cell.text = f"r{r}c{c}"
+            table.cell(0, 0).merge(table.cell(0, 1))
+            table.cell(1, 2).merge(table.cell(3, 2))
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def legacy(docx_bytes):
+    doc = Document(io.BytesIO(docx_bytes))
+    return {
+        "paragraphs": extract_paragraphs(doc),
+        "tables": extract_tables(doc),
+        "bookmarks": extract_bookmarks(doc),
+    }
+
+
+def streaming(docx_bytes):
+    with zipfile.ZipFile(io.BytesIO(docx_bytes)) as z:
+        return StreamingDocxReader(z).read()
+
+
+def measure(fn, docx_bytes, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(docx_bytes)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    result = fn(docx_bytes)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, best, peak
+
+
+def check_equivalent(old, new):
+    assert old["paragraphs"] == new["paragraphs"]
+    assert old["tables"] == new["tables"]
+    assert old["bookmarks"] == new["bookmarks"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--paragraphs", type=int, default=1000)
+    parser.add_argument("--tables", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    docx_bytes = build_docx(args.paragraphs, args.tables)
+    print(f"DOCX: {len(docx_bytes) / 1024:.0f} KB, {args.paragraphs} paragraphs, {args.tables} tables")
+
+    old, old_time, old_peak = measure(legacy, docx_bytes, args.repeat)
+    new, new_time, new_peak = measure(streaming, docx_bytes, args.repeat)
+    check_equivalent(old, new)
+
+    print(f"{'extractor':<12}{'best time (s)':>16}{'peak memory (MB)':>20}")
+    print(f"{'python-docx':<12}{old_time:>16.3f}{old_peak / 1e6:>20.1f}")
+    print(f"{'streaming':<12}{new_time:>16.3f}{new_peak / 1e6:>20.1f}")
+    print(f"speedup x{old_time / new_time:.1f}, memory x{old_peak / new_peak:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Time the resume-to-job BM25 ranking used on the matched jobs page.
+
+Generates synthetic JSearch-style postings and a resume, then reports:
+  - python   BM25 scored with plain dicts and loops, as a reference
+  - cold     Evaluator.utils.job_ranking.rank_jobs from raw job dicts (tokenize + score)
+  - warm     rank_jobs against a prebuilt JobMatrix, as served from the per-process cache
+and checks that all three produce the same ordering.
+
+Run from "Server-Based Architecture":
+    python benchmarks/bench_job_ranking.py --jobs 500 --repeat 20
+"""
+
+import argparse
+import math
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Evaluator.utils.job_index import tokenize
+from Evaluator.utils.job_records import parse_jobs
+from Evaluator.utils.job_ranking import B, K1, JobMatrix, job_text, rank_jobs, resume_query
+
+SKILL_WORDS = [
+    "Python", "Django", "Flask", "AWS", "Docker", "Kubernetes", "SQL", "PostgreSQL", "React.js",
+    "TypeScript", "Java", "Spring Boot", "Terraform", "Kafka", "Apache Spark", "Pandas", "Git", "Linux",
+    "machine learning", "REST APIs", "CI/CD", "Agile", "Redis", "GraphQL",
+]
+FILLER = (
+    "We are looking for a motivated engineer to join our growing team and help us build "
+    "reliable services for millions of customers across the country while collaborating "
+    "closely with product design and operations partners"
+).split()
+TITLES = ["Software Engineer", "Backend Developer", "Data Engineer", "Frontend Developer",
+          "DevOps Engineer", "Machine Learning Engineer", "Full Stack Developer"]
+
+
+def make_jobs(count, rng):
+    jobs = []
+    for i in range(count):
+        skills = rng.sample(SKILL_WORDS, 6)
+        description = " ".join(rng.choices(FILLER, k=350) + rng.choices(skills, k=25))
+        jobs.append({
+            "job_id": str(i),
+            "job_title": rng.choice(TITLES),
+            "job_highlights": {
+                "Qualifications": [f"{rng.randint(1, 8)}+ years with {skill}" for skill in skills],
+                "Responsibilities": [" ".join(rng.choices(FILLER, k=15)) for _ in range(4)],
+            },
+            "job_description": description,
+        })
+    return jobs
+
+
+RESUME = {
+    "skills": ["Python", "Django", "PostgreSQL", "Docker", "AWS", "Git"],
+    "experience": [
+        {"title": "Backend Developer", "description": "Built REST APIs in Django on AWS with Celery and Redis"},
+        {"title": "Software Engineering Intern", "description": "Wrote data pipelines in Python and SQL"},
+    ],
+    "education": [{"degree": "BS Computer Science", "details": "Algorithms, databases, operating systems"}],
+}
+
+
+def python_bm25(resume_data, jobs):
+    """Reference BM25 with dicts and loops; returns job indexes best first"""
+    docs = [Counter(tokenize(job_text(job))) for job in parse_jobs(jobs)]
+    n_docs = len(docs)
+    df = Counter(term for doc in docs for term in doc)
+    avg_len = sum(sum(doc.values()) for doc in docs) / n_docs
+    query = resume_query(resume_data)
+    scores = []
+    for doc in docs:
+        doc_len = sum(doc.values())
+        score = 0.0
+        for term, weight in query.items():
+            tf = doc.get(term)
+            if not tf:
+                continue
+            idf = math.log1p((n_docs - df[term] + 0.5) / (df[term] + 0.5))
+            score += weight * idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * doc_len / avg_len))
+        scores.append(score)
+    return sorted(range(n_docs), key=lambda i: -scores[i])
+
+
+def timed(fn, repeat):
+    fn()  # warm up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return result, statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    jobs = make_jobs(args.jobs, random.Random(args.seed))
+    matrix = JobMatrix(jobs)
+
+    reference, python_ms = timed(lambda: python_bm25(RESUME, jobs), args.repeat)
+    cold, cold_ms = timed(lambda: rank_jobs(RESUME, jobs), args.repeat)
+    warm, warm_ms = timed(lambda: rank_jobs(RESUME, matrix), args.repeat)
+
+    top = min(50, len(jobs))
+    assert [entry["index"] for entry in cold][:top] == reference[:top], "cold ranking differs from reference"
+    assert [entry["index"] for entry in warm] == [entry["index"] for entry in cold], "warm ranking differs"
+
+    print(f"{len(jobs)} jobs, {len(matrix.vocabulary)} terms, median of {args.repeat} runs")
+    print(f"{'path':<8}{'ms':>10}")
+    for name, ms in (("python", python_ms), ("cold", cold_ms), ("warm", warm_ms)):
+        print(f"{name:<8}{ms:>10.2f}")
+    print(f"best match: {jobs[warm[0]['index']]['job_title']}  "
+          f"matched={warm[0]['matched_skills']} missing={warm[0]['missing_skills']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Memory and time of the slotted JobPosting records against the job dicts they replace.
+
+Generates synthetic JSearch-style postings and reports, per representation:
+  - dict      the JSearch-shaped dicts Job.to_api_dict handed to the analyzer
+  - plain     the same fields in a dataclass without __slots__
+  - slots     Evaluator.utils.job_records.JobPosting, as parse_jobs builds it
+the memory they keep alive (tracemalloc, strings shared with the source are
+not counted), the time to build them, and the time of the per-job reads the
+analyzer does (job text, qualification lines) with dict probing vs attribute
+access. Both reads are checked to produce the same output.
+
+Run from "Server-Based Architecture":
+    python benchmarks/bench_job_records.py --jobs 20000
+"""
+
+import argparse
+import dataclasses
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_job_ranking import make_jobs
+from Evaluator.utils.job_ranking import job_text
+from Evaluator.utils.job_records import JobPosting, parse_jobs
+
+PlainPosting = dataclasses.make_dataclass(
+    "PlainPosting", [(f.name, f.type) for f in dataclasses.fields(JobPosting)]
+)
+
+
+def to_api_dict(job, rng):
+    """The dict a Job row gave the analyzer: JSearch keys plus the details column"""
+    return {
+        **job,
+        "employer_name": f"Employer {rng.randint(1, 40)}",
+        "job_location": "Boston, MA",
+        "job_is_remote": rng.random() < 0.2,
+        "job_min_salary": 90000.0,
+        "job_max_salary": 130000.0,
+        "job_posted_at_datetime_utc": "2025-10-09T08:53:20+00:00",
+        "job_employment_type": "FULLTIME",
+        "job_salary_period": "YEAR",
+        "job_apply_link": f"https://careers.example.com/jobs/{job['job_id']}",
+        "job_google_link": f"https://www.google.com/search?q=jobs#vhid={job['job_id']}",
+    }
+
+
+def copy_dict(job):
+    return {**job, "job_highlights": {k: list(v) for k, v in job["job_highlights"].items()}}
+
+
+def to_plain(job):
+    posting = JobPosting.from_api(job)
+    return PlainPosting(**{f.name: getattr(posting, f.name) for f in dataclasses.fields(JobPosting)})
+
+
+def dict_job_text(job):
+    """job_text as it read dicts before job_records.py"""
+    parts = [job.get("job_title") or ""]
+    highlights = job.get("job_highlights")
+    if isinstance(highlights, dict):
+        for items in highlights.values():
+            if isinstance(items, list):
+                parts.extend(str(item) for item in items)
+    parts.append(job.get("job_description") or "")
+    return " ".join(parts)
+
+
+def dict_qualifications(jobs):
+    """The highlights half of job_qualification_lines before job_records.py"""
+    lines = []
+    for i, job in enumerate(jobs):
+        if 'job_highlights' in job and isinstance(job['job_highlights'], dict):
+            qualifications = job['job_highlights'].get('Qualifications', [])
+            if isinstance(qualifications, list):
+                lines.extend((i, str(qual)) for qual in qualifications)
+    return lines
+
+
+def record_qualifications(postings):
+    return [(i, qual) for i, posting in enumerate(postings) for qual in posting.qualifications]
+
+
+def retained_kib(build):
+    """Memory still allocated by build()'s result once it returns, in KiB"""
+    tracemalloc.start()
+    try:
+        result = build()
+        current = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return current / 1024
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return result, statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    source = [to_api_dict(job, rng) for job in make_jobs(args.jobs, rng)]
+
+    builders = {
+        "dict": lambda: [copy_dict(job) for job in source],
+        "plain": lambda: [to_plain(job) for job in source],
+        "slots": lambda: parse_jobs(source),
+    }
+    print(f"{args.jobs} jobs, median of {args.repeat} runs")
+    print(f"{'':<8}{'KiB':>10}{'B/job':>8}{'build ms':>10}")
+    built = {}
+    for name, build in builders.items():
+        kib = retained_kib(build)
+        built[name], build_ms = timed(build, args.repeat)
+        print(f"{name:<8}{kib:>10.0f}{kib * 1024 / args.jobs:>8.0f}{build_ms:>10.1f}")
+
+    dicts, postings = built["dict"], built["slots"]
+    text_before, text_before_ms = timed(lambda: [dict_job_text(job) for job in dicts], args.repeat)
+    text_after, text_after_ms = timed(lambda: [job_text(job) for job in postings], args.repeat)
+    quals_before, quals_before_ms = timed(lambda: dict_qualifications(dicts), args.repeat)
+    quals_after, quals_after_ms = timed(lambda: record_qualifications(postings), args.repeat)
+    assert text_after == text_before, "job_text differs between dicts and records"
+    assert quals_after == quals_before, "qualification lines differ between dicts and records"
+
+    print(f"\n{'read':<16}{'dict ms':>10}{'slots ms':>10}")
+    print(f"{'job_text':<16}{text_before_ms:>10.1f}{text_after_ms:>10.1f}")
+    print(f"{'qualifications':<16}{quals_before_ms:>10.1f}{quals_after_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Stored size, S3 transfer time and Lambda memory of the compact job storage.
+
+Generates synthetic postings shaped like full JSearch results (apply options,
+ONET codes, coordinates, ...) and compares, before and after:
+  - lambda   the jobs/<user>/resume-<n>/ object: json.dumps(indent=2) vs lambda5/job_store.py
+  - django   the JobSearchCache payload: JSONField text vs the jobs_packed column
+For each it reports the stored size, the transfer time at --mbps, encode and
+decode time, and the peak Python memory of what lambda4 (return every job)
+and lambda6 (read the first 10) do with the object.
+
+Run from "Server-Based Architecture" with the usual Django environment variables:
+    python benchmarks/bench_job_storage.py --jobs 50 --mbps 80
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.join(os.path.dirname(BASE_DIR), "Serverless-Based Architecture", "Lambda Functions", "lambda5"))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Core.settings")
+
+import django
+
+django.setup()
+
+import job_store
+
+from bench_job_ranking import FILLER, SKILL_WORDS, TITLES
+from Evaluator.models import Job
+from Evaluator.utils.job_payload import iter_packed_jobs, pack_jobs
+
+PROMPT_JOBS = 10
+
+
+def make_raw_jobs(count, rng):
+    """Postings with the full set of keys a JSearch /search result carries"""
+    jobs = []
+    for i in range(count):
+        skills = rng.sample(SKILL_WORDS, 6)
+        city = rng.choice(["Boston", "Austin", "Seattle", "Denver", "Chicago"])
+        link = f"https://careers.example.com/jobs/{i}?utm_source=google_jobs_apply&utm_campaign=" + "x" * 60
+        jobs.append({
+            "job_id": f"{rng.getrandbits(64):x}==",
+            "employer_name": f"Employer {i % 37}",
+            "employer_logo": f"https://encrypted-tbn0.gstatic.com/images?q=tbn:{rng.getrandbits(96):x}",
+            "employer_website": f"https://employer{i % 37}.example.com",
+            "employer_company_type": "Computer Services",
+            "employer_linkedin": None,
+            "job_publisher": rng.choice(["LinkedIn", "Indeed", "Glassdoor", "ZipRecruiter"]),
+            "job_employment_type": "FULLTIME",
+            "job_employment_types": ["FULLTIME"],
+            "job_employment_type_text": "Full-time",
+            "job_title": rng.choice(TITLES),
+            "job_apply_link": link,
+            "job_apply_is_direct": False,
+            "job_apply_quality_score": round(rng.random(), 4),
+            "apply_options": [
+                {"publisher": publisher, "apply_link": link + f"&via={publisher}", "is_direct": False}
+                for publisher in ("LinkedIn", "Indeed", "Glassdoor", "ZipRecruiter")
+            ],
+            "job_description": " ".join(rng.choices(FILLER, k=450) + rng.choices(skills, k=30)),
+            "job_is_remote": rng.random() < 0.2,
+            "job_posted_human_readable": "3 days ago",
+            "job_posted_at": "3 days ago",
+            "job_posted_at_timestamp": 1760000000 + i,
+            "job_posted_at_datetime_utc": "2025-10-09T08:53:20.000Z",
+            "job_location": f"{city}, MA",
+            "job_city": city,
+            "job_state": "Massachusetts",
+            "job_country": "US",
+            "job_latitude": 42.3 + rng.random(),
+            "job_longitude": -71.0 - rng.random(),
+            "job_benefits": ["health_insurance", "paid_time_off", "dental_coverage"],
+            "job_google_link": "https://www.google.com/search?q=jobs&gl=us&hl=en&udm=8#vhid=" + "y" * 80,
+            "job_offer_expiration_datetime_utc": "2025-11-09T00:00:00.000Z",
+            "job_offer_expiration_timestamp": 1762646400,
+            "job_required_experience": {"no_experience_required": False, "required_experience_in_months": 36,
+                                        "experience_mentioned": True, "experience_preferred": False},
+            "job_required_skills": None,
+            "job_required_education": {"postgraduate_degree": False, "professional_certification": False,
+                                       "high_school": False, "associates_degree": False, "bachelors_degree": True,
+                                       "degree_mentioned": True, "degree_preferred": False,
+                                       "professional_certification_mentioned": False},
+            "job_experience_in_place_of_education": False,
+            "job_min_salary": 90000 + 1000 * (i % 30),
+            "job_max_salary": 130000 + 1000 * (i % 30),
+            "job_salary_currency": "USD",
+            "job_salary_period": "YEAR",
+            "job_highlights": {
+                "Qualifications": [f"{rng.randint(1, 8)}+ years with {skill}" for skill in skills],
+                "Responsibilities": [" ".join(rng.choices(FILLER, k=15)) for _ in range(6)],
+                "Benefits": ["Health insurance", "401(k) matching", "Paid time off"],
+            },
+            "job_job_title": None,
+            "job_posting_language": "en",
+            "job_onet_soc": "15113200",
+            "job_onet_job_zone": "4",
+            "job_occupational_categories": ["Software Developers"],
+            "job_naics_code": "541511",
+            "job_naics_name": "Custom Computer Programming Services",
+        })
+    return jobs
+
+
+def timed(fn, repeat):
+    fn()  # warm up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return result, statistics.median(samples)
+
+
+def peak_kib(fn):
+    """Peak Python allocation while fn runs, in KiB"""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def transfer_ms(size, mbps):
+    return size * 8 / (mbps * 1_000_000) * 1000
+
+
+def report(name, rows, mbps):
+    print(f"\n{name}")
+    print(f"{'':<10}{'bytes':>10}{'xfer ms':>10}{'enc ms':>9}{'dec ms':>9}{'all KiB':>10}{'top10 KiB':>11}")
+    for label, size, encode_ms, decode_ms, all_kib, top_kib in rows:
+        print(f"{label:<10}{size:>10}{transfer_ms(size, mbps):>10.2f}{encode_ms:>9.2f}{decode_ms:>9.2f}"
+              f"{all_kib:>10.0f}{top_kib:>11.0f}")
+    print(f"{'ratio':<10}{rows[0][1] / rows[1][1]:>10.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--mbps", type=float, default=80.0, help="assumed S3 throughput from Lambda, Mbit/s")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    jobs = make_raw_jobs(args.jobs, random.Random(args.seed))
+    header = {"search_params": {"career_field": "Software Engineering", "experience_level": "entry",
+                                "location": "Boston, MA"}, "fetched_at": "2025-10-12T10:00:00", "count": len(jobs)}
+
+    # Lambda: per-resume jobs object
+    legacy, legacy_encode = timed(lambda: json.dumps({"jobs": jobs, **header}, indent=2).encode("utf-8"), args.repeat)
+    compact, compact_encode = timed(lambda: job_store.encode_jobs(header, jobs), args.repeat)
+    _, legacy_decode = timed(lambda: json.loads(legacy), args.repeat)
+    _, compact_decode = timed(lambda: job_store.decode_jobs(compact), args.repeat)
+    assert job_store.decode_jobs(compact)["jobs"] == [job_store.compact_job(job) for job in jobs]
+    assert json.loads(job_store.jobs_response_body(compact)) == job_store.decode_jobs(compact)
+    report("lambda jobs object", [
+        ("before", len(legacy), legacy_encode, legacy_decode,
+         peak_kib(lambda: json.dumps(json.loads(legacy.decode("utf-8")))),
+         peak_kib(lambda: json.loads(legacy.decode("utf-8"))["jobs"][:PROMPT_JOBS])),
+        ("after", len(compact), compact_encode, compact_decode,
+         peak_kib(lambda: job_store.jobs_response_body(compact)),
+         peak_kib(lambda: job_store.decode_jobs(compact, limit=PROMPT_JOBS))),
+    ], args.mbps)
+
+    # Django: JobSearchCache row
+    field_text, field_encode = timed(lambda: json.dumps(jobs).encode("utf-8"), args.repeat)
+    packed, packed_encode = timed(lambda: pack_jobs(jobs, Job.API_KEYS), args.repeat)
+    _, field_decode = timed(lambda: json.loads(field_text), args.repeat)
+    _, packed_decode = timed(lambda: list(iter_packed_jobs(packed)), args.repeat)
+    report("django JobSearchCache", [
+        ("before", len(field_text), field_encode, field_decode,
+         peak_kib(lambda: json.loads(field_text)),
+         peak_kib(lambda: json.loads(field_text)[:PROMPT_JOBS])),
+        ("after", len(packed), packed_encode, packed_decode,
+         peak_kib(lambda: list(iter_packed_jobs(packed))),
+         peak_kib(lambda: [job for job, _ in zip(iter_packed_jobs(packed), range(PROMPT_JOBS))])),
+    ], args.mbps)
+    print(f"\n{len(jobs)} jobs, median of {args.repeat} runs, transfer at {args.mbps:g} Mbit/s")
+
+
+if __name__ == "__main__":
+    main()
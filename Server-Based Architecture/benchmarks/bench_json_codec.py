@@ -0,0 +1,120 @@
+"""
+Serialization time of Evaluator.utils.json_codec against the standard library json module.
+
+Builds payloads the size of what the app actually stores and sends:
+  - resume        Resume.extracted_text (parsed resume)
+  - recommend     Resume.recommendation_skills (gap analysis result)
+  - job row       Job.highlights + Job.details for one posting
+  - jobs body     50 compact jobs, the lambda4 response / JobSearchCache payload
+  - jobs x500     a large job search, to show how it scales
+and reports, per payload, the encoded size and the median time of
+json.dumps/json.loads (as models.JSONField and cors_response used them) and
+json_codec.dumps/loads (FastJSONField and lambda5/json_codec.py). Each
+decoded value is checked against the original.
+
+Run from "Server-Based Architecture":
+    python benchmarks/bench_json_codec.py --repeat 200
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_job_ranking import FILLER, SKILL_WORDS, make_jobs
+from Evaluator.utils import json_codec
+
+
+def sentence(rng, words):
+    return " ".join(rng.choices(FILLER, k=words)).capitalize()
+
+
+def make_resume(rng):
+    return {
+        "name": "Jordan Example",
+        "email": "jordan@example.com",
+        "skills": rng.sample(SKILL_WORDS, 18),
+        "experience": [
+            {"title": rng.choice(["Backend Developer", "Software Engineer", "Data Engineer"]),
+             "company": f"Company {i}", "start_date": "2021-06", "end_date": "2023-08",
+             "description": " ".join(sentence(rng, 18) + "." for _ in range(5))}
+            for i in range(5)
+        ],
+        "education": [{"degree": "BS Computer Science", "institution": "State University",
+                       "graduation_date": "2021-05", "details": sentence(rng, 12)}],
+        "certifications": ["AWS Certified Developer – Associate", "Scrum Master"],
+        "projects": [{"name": f"Project {i}", "description": sentence(rng, 25)} for i in range(4)],
+    }
+
+
+def make_recommendations(rng):
+    return {
+        "missing_technical_skills": rng.sample(SKILL_WORDS, 8),
+        **{key: [sentence(rng, 14) for _ in range(5)] for key in (
+            "missing_education", "missing_certifications", "missing_experience",
+            "missing_soft_skills", "recommended_actions")},
+        "skill_demand": [{"skill": skill, "jobs": rng.randint(1, 50), "share": round(rng.random(), 2),
+                          "on_resume": rng.random() < 0.5} for skill in rng.sample(SKILL_WORDS, 16)],
+    }
+
+
+def make_job_row(job, i):
+    return {
+        "highlights": job["job_highlights"],
+        "details": {"employer_logo": f"https://logo.example.com/{i}.png", "job_publisher": "LinkedIn",
+                    "job_employment_type": "FULLTIME", "job_apply_link": f"https://careers.example.com/{i}",
+                    "job_google_link": f"https://www.google.com/search?q=jobs#vhid={i}",
+                    "job_posted_at": "3 days ago", "job_salary_period": "YEAR",
+                    "job_benefits": ["health_insurance", "paid_time_off"], "job_country": "US"},
+    }
+
+
+def timed_us(fn, repeat):
+    fn()  # warm up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    jobs = make_jobs(500, rng)
+    payloads = {
+        "resume": make_resume(rng),
+        "recommend": make_recommendations(rng),
+        "job row": make_job_row(jobs[0], 0),
+        "jobs body": {"search_params": {"career_field": "Software Engineering"}, "count": 50, "jobs": jobs[:50]},
+        "jobs x500": {"search_params": {"career_field": "Software Engineering"}, "count": 500, "jobs": jobs},
+    }
+
+    print(f"backend: {json_codec.BACKEND}, median of {args.repeat} runs, times in microseconds")
+    print(f"{'payload':<11}{'bytes':>9}{'json dumps':>12}{'codec':>9}{'json loads':>12}{'codec':>9}{'speedup':>9}")
+    for name, value in payloads.items():
+        text = json.dumps(value)
+        encoded = json_codec.dumps_bytes(value)
+        assert json_codec.loads(encoded) == value == json.loads(text), f"{name} does not round-trip"
+
+        json_dumps = timed_us(lambda: json.dumps(value), args.repeat)
+        codec_dumps = timed_us(lambda: json_codec.dumps(value), args.repeat)
+        json_loads = timed_us(lambda: json.loads(text), args.repeat)
+        codec_loads = timed_us(lambda: json_codec.loads(encoded), args.repeat)
+        speedup = (json_dumps + json_loads) / (codec_dumps + codec_loads)
+        print(f"{name:<11}{len(encoded):>9}{json_dumps:>12.1f}{codec_dumps:>9.1f}"
+              f"{json_loads:>12.1f}{codec_loads:>9.1f}{speedup:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Render time of the jobs and recommendation pages with the fragment cache.
+
+Creates a resume with --jobs matched jobs and a skills recommendation, then
+requests each page through the Django test client three ways:
+  - cold        fragment cache cleared before every request
+  - fragment    cached fragment, only the surrounding page is rendered
+  - 304         the browser already has the page (If-None-Match)
+and reports the median time per request of each, plus the render time the
+fragment cache saved according to page_cache.stats().
+
+Uses a throwaway test database, like manage.py test. Run from
+"Server-Based Architecture" with the usual Django environment variables:
+    python benchmarks/bench_page_cache.py --jobs 100 --requests 50
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Core.settings")
+
+import django
+
+django.setup()
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment
+from django.urls import reverse
+
+from Evaluator.utils import page_cache
+from Scanner.models import Resume
+from UserAuth.models import UserProfile
+
+
+def job(number):
+    return {
+        "job_id": f"bench-{number}",
+        "job_title": f"Software Engineer {number}",
+        "employer_name": f"Employer {number % 17}",
+        "job_city": "Boston",
+        "job_state": "MA",
+        "job_country": "US",
+        "job_description": "Python Django PostgreSQL REST APIs AWS Docker " * 40,
+        "job_highlights": {"Qualifications": ["Python", "Django", "SQL"] * 5},
+        "job_apply_link": f"https://example.com/jobs/{number}",
+    }
+
+
+def setup_resume(job_count):
+    user = User.objects.create_user(username="cache_bench", password="cache-bench-password")
+    UserProfile.objects.create(user=user)
+    resume = Resume.objects.create(
+        user=user,
+        career_field="Software Engineering",
+        extracted_text={"name": "Bench User", "skills": ["Python", "Django", "SQL", "Docker"]},
+    )
+    resume.set_jobs_matched([job(number) for number in range(job_count)])
+    resume.set_recommendation_skills({
+        "missing_technical_skills": [f"Skill {number}" for number in range(30)],
+        "missing_soft_skills": ["Communication", "Leadership"],
+        "recommended_certifications": ["AWS Certified Developer"],
+        "summary": "Strong backend profile. " * 20,
+    })
+    client = Client()
+    client.force_login(user)
+    return client, resume
+
+
+def timed(client, url, requests, clear=False, etag=None):
+    samples = []
+    headers = {"HTTP_IF_NONE_MATCH": etag} if etag else {}
+    for _ in range(requests):
+        if clear:
+            cache.clear()
+        start = time.perf_counter()
+        response = client.get(url, **headers)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), response
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    setup_test_environment()  # lets the test client's host through ALLOWED_HOSTS
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        client, resume = setup_resume(args.jobs)
+        pages = {
+            "jobs": reverse("jobs_matched_from_resume_file", args=["cache_bench", resume.pk]),
+            "recommendations": reverse("recommendation_skills", args=["cache_bench", resume.pk]),
+        }
+        print(f"{'page':<17}{'cold ms':>9}{'fragment ms':>13}{'304 ms':>9}")
+        for name, url in pages.items():
+            cold, _ = timed(client, url, args.requests, clear=True)
+            warm, response = timed(client, url, args.requests)
+            not_modified, last = timed(client, url, args.requests, etag=response["ETag"])
+            assert response.status_code == 200 and last.status_code == 304, (response.status_code, last.status_code)
+            print(f"{name:<17}{cold:>9.1f}{warm:>13.1f}{not_modified:>9.1f}")
+
+        print()
+        for name, stats in page_cache.stats().items():
+            print(f"{name}: {stats['hits']} hits, {stats['misses']} misses, "
+                  f"{stats['average_render_seconds'] * 1000:.1f} ms per render, "
+                  f"{stats['saved_seconds'] * 1000:.0f} ms saved")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
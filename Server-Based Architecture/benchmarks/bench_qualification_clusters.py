@@ -0,0 +1,114 @@
+"""
+Measure how much near-duplicate collapsing shrinks the qualification list sent to the model.
+
+Generates postings whose qualifications are rewordings of a fixed set of
+requirements (the way JSearch postings phrase the same degree or soft skill
+differently) and reports, for the exact-match de-duplication used before and
+for Evaluator.utils.qualification_clusters.collapse_qualifications:
+  - lines     qualification lines left
+  - chars     their total length, as they would appear in the prompt
+  - ms        time to produce them
+Collapsed lines are checked for purity (never two requirements in one line),
+and requirements still spread over several lines are counted.
+
+Run from "Server-Based Architecture":
+    python benchmarks/bench_qualification_clusters.py --jobs 50
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Evaluator.utils.qualification_clusters import collapse_qualifications, format_collapsed
+
+# Each requirement with the wordings postings use for it
+REQUIREMENTS = {
+    "bachelor": [
+        "Bachelor's degree in Computer Science", "BS degree in Computer Science or related field",
+        "Bachelor's degree in computer science or a related field", "BS in Computer Science required",
+        "Bachelors degree in Computer Science, Engineering or related field",
+    ],
+    "master": ["Master's degree in Computer Science preferred", "MS in Computer Science a plus",
+               "Master's degree in computer science or related field"],
+    "communication": [
+        "Excellent verbal and written communication skills", "Strong written and verbal communication skills",
+        "Strong communication skills", "Excellent communication skills, written and verbal",
+    ],
+    "teamwork": ["Ability to work in a team environment", "Ability to work well in a team",
+                 "Works well in a collaborative team environment"],
+    "independent": ["Ability to work independently", "Able to work independently with minimal supervision",
+                    "Ability to work independently and manage time"],
+    "problem": ["Strong problem-solving skills", "Excellent problem solving skills",
+                "Strong analytical and problem-solving skills"],
+    "authorization": ["Must be authorized to work in the United States",
+                      "Must be legally authorized to work in the United States"],
+    "clearance": ["Active Secret clearance required", "Must hold an active Secret security clearance"],
+    "travel": ["Willingness to travel up to 25%", "Ability to travel up to 25% of the time"],
+    "onsite": ["Must be able to work onsite 3 days a week", "Ability to work onsite three days per week"],
+}
+
+
+def make_job_lines(count, rng):
+    job_lines = []
+    for job in range(count):
+        for requirement in rng.sample(list(REQUIREMENTS), rng.randint(3, 7)):
+            wording = rng.choice(REQUIREMENTS[requirement])
+            # Case and trailing punctuation vary too
+            wording = wording.lower() if rng.random() < 0.1 else wording
+            job_lines.append((job, wording + rng.choice(["", ".", ""]), requirement))
+    return job_lines
+
+
+def exact_dedupe(job_lines):
+    """The de-duplication used before: exact lower-case matches only"""
+    seen, unique = set(), []
+    for _, line in job_lines:
+        key = line.lower().strip()
+        if key not in seen:
+            seen.add(key)
+            unique.append(line.strip())
+    return unique
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    generated = make_job_lines(args.jobs, random.Random(args.seed))
+    job_lines = [(job, line) for job, line, _ in generated]
+    requirement_of = {line.lower().strip(" ."): requirement for _, line, requirement in generated}
+
+    start = time.perf_counter()
+    before = exact_dedupe(job_lines)
+    before_ms = (time.perf_counter() - start) * 1000
+
+    collapse_qualifications(job_lines)  # warm up numpy/scipy
+    start = time.perf_counter()
+    collapsed = collapse_qualifications(job_lines, total_jobs=args.jobs)
+    after_ms = (time.perf_counter() - start) * 1000
+    after = [format_collapsed(entry) for entry in collapsed]
+
+    # Purity: a collapsed line must only fold in wordings of one requirement
+    impure = [entry for entry in collapsed
+              if len({requirement_of[w.lower()] for w in entry["wordings"]}) > 1]
+    split = len(collapsed) - len({requirement_of[entry["text"].lower()] for entry in collapsed})
+
+    print(f"{args.jobs} postings, {len(job_lines)} qualification lines, {len(REQUIREMENTS)} distinct requirements")
+    print(f"{'':<10}{'lines':>8}{'chars':>9}{'ms':>8}")
+    print(f"{'before':<10}{len(before):>8}{sum(map(len, before)):>9}{before_ms:>8.2f}")
+    print(f"{'after':<10}{len(after):>8}{sum(map(len, after)):>9}{after_ms:>8.2f}")
+    print(f"shrink: {sum(map(len, before)) / sum(map(len, after)):.1f}x characters; "
+          f"{len(impure)} line(s) mixing requirements, {split} extra line(s) for a requirement already listed")
+    for line in after[:5]:
+        print(f"  - {line}")
+    assert not impure, f"different requirements merged: {[entry['wordings'] for entry in impure]}"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Time the description half of extract_job_qualifications on long postings.
+
+Generates synthetic JSearch-style descriptions and reports:
+  - python   the previous loop: re-split and re-lowercase the description for each of the 12 keywords
+  - cold     Evaluator.utils.job_qualifications.description_qualifications (lower once, str.find per keyword)
+  - warm     cached_description_qualifications, as repeated analyses of the same jobs hit it
+and checks that all three return the same sentences.
+
+Run from "Server-Based Architecture":
+    python benchmarks/bench_qualification_extraction.py --jobs 200 --sentences 120
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Evaluator.utils import job_qualifications
+from Evaluator.utils.job_qualifications import (
+    QUALIFICATION_KEYWORDS,
+    cached_description_qualifications,
+    description_qualifications,
+)
+
+FILLER = (
+    "Our team builds reliable services for customers across the country and works closely "
+    "with product design and operations partners on a fast moving roadmap"
+).split()
+QUALIFICATION_SENTENCES = [
+    "Bachelor's degree in Computer Science or a related field",
+    "Master's degree preferred but not required",
+    "AWS Certified Solutions Architect certification is a plus",
+    "3+ years of professional experience building web services",
+    "Working knowledge of SQL and relational databases",
+    "Proficiency in Python or Go",
+    "Skilled in debugging distributed systems",
+    "Familiar with CI/CD pipelines and infrastructure as code",
+    "Expertise in performance tuning",
+]
+
+
+def make_descriptions(count, sentences, rng):
+    descriptions = []
+    for _ in range(count):
+        parts = [" ".join(rng.choices(FILLER, k=rng.randint(10, 25))).capitalize() for _ in range(sentences)]
+        # Qualifications sit in the back half, as in most postings
+        for sentence in rng.sample(QUALIFICATION_SENTENCES, rng.randint(2, len(QUALIFICATION_SENTENCES))):
+            parts.insert(rng.randint(sentences // 2, len(parts)), sentence)
+        descriptions.append(". ".join(parts) + ".")
+    return descriptions
+
+
+def python_qualifications(description):
+    """The loop extract_job_qualifications used before job_qualifications.py"""
+    found = []
+    description_lower = description.lower()
+    for keyword in QUALIFICATION_KEYWORDS:
+        if keyword in description_lower:
+            for sentence in description.split('.'):
+                if keyword in sentence.lower() and len(sentence.strip()) > 10:
+                    found.append(sentence.strip())
+                    break
+    return found
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return result, statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--sentences", type=int, default=120, help="filler sentences per description")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    descriptions = make_descriptions(args.jobs, args.sentences, random.Random(args.seed))
+    job_ids = [f"job-{i}" for i in range(len(descriptions))]
+
+    reference, python_ms = timed(lambda: [python_qualifications(d) for d in descriptions], args.repeat)
+    cold, cold_ms = timed(lambda: [description_qualifications(d) for d in descriptions], args.repeat)
+    warm, warm_ms = timed(
+        lambda: [cached_description_qualifications(i, d) for i, d in zip(job_ids, descriptions)], args.repeat
+    )
+    assert cold == reference, "find-based extraction differs from the previous loop"
+    assert warm == reference, "cached extraction differs from the previous loop"
+    assert len(job_qualifications._cache) == len(descriptions)
+
+    average_chars = sum(map(len, descriptions)) / len(descriptions)
+    print(f"{len(descriptions)} descriptions, {average_chars:,.0f} chars on average, median of {args.repeat} runs")
+    print(f"{'path':<8}{'ms':>10}{'us/job':>10}")
+    for name, ms in (("python", python_ms), ("cold", cold_ms), ("warm", warm_ms)):
+        print(f"{name:<8}{ms:>10.2f}{ms * 1000 / len(descriptions):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Cost of listing resumes with and without their large JSON columns.
+
+Fills a throwaway test database with --users accounts of --resumes resumes
+each, every resume carrying extracted data, a legacy jobs_matched payload of
+--jobs postings and a skills recommendation of realistic size. Then compares
+  - query       loading one user's resumes the old way (every column) and with
+                Resume.objects.metadata(), median time and bytes of JSON read
+  - admin       the Resume change list of --users * --resumes rows
+  - account     the user_account page through the Django test client
+
+Run from "Server-Based Architecture" with the usual Django environment
+variables:
+    python benchmarks/bench_resume_listing.py --users 200 --resumes 5 --jobs 50
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Core.settings")
+
+import django
+
+django.setup()
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment
+from django.urls import reverse
+
+from Evaluator.utils import json_codec
+from Scanner.models import Resume
+from UserAuth.models import UserProfile
+
+
+def job(number):
+    return {
+        "job_id": f"bench-{number}",
+        "job_title": f"Software Engineer {number}",
+        "employer_name": f"Employer {number % 17}",
+        "job_city": "Boston",
+        "job_description": "Python Django PostgreSQL REST APIs AWS Docker " * 60,
+        "job_highlights": {"Qualifications": ["Python", "Django", "SQL"] * 5},
+    }
+
+
+def resume_payloads(job_count):
+    return {
+        "extracted_text": {
+            "name": "Bench User",
+            "skills": [f"Skill {number}" for number in range(60)],
+            "experience": [{"title": "Engineer", "description": "Built services. " * 40}] * 5,
+        },
+        "jobs_matched": [job(number) for number in range(job_count)],
+        "recommendation_skills": {
+            "missing_technical_skills": [f"Skill {number}" for number in range(30)],
+            "summary": "Strong backend profile. " * 40,
+        },
+    }
+
+
+def populate(users, resumes, job_count):
+    payloads = resume_payloads(job_count)
+    accounts = User.objects.bulk_create(
+        User(username=f"listing_{number}", is_staff=True, is_superuser=True) for number in range(users)
+    )
+    UserProfile.objects.bulk_create(UserProfile(user=user, resume_uploaded=resumes) for user in accounts)
+    Resume.objects.bulk_create(
+        Resume(user=user, career_field="Software Engineering", **payloads)
+        for user in accounts for _ in range(resumes)
+    )
+    return accounts[0], sum(len(json_codec.dumps(value)) for value in payloads.values())
+
+
+def median_ms(action, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        action()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--resumes", type=int, default=5, help="resumes per user")
+    parser.add_argument("--jobs", type=int, default=50, help="legacy jobs_matched postings per resume")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_test_environment()  # lets the test client's host through ALLOWED_HOSTS
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        user, json_bytes = populate(args.users, args.resumes, args.jobs)
+        client = Client()
+        client.force_login(user)
+        total = args.users * args.resumes
+        print(f"{total} resumes, {json_bytes / 1024:.0f} KiB of JSON each\n")
+
+        full = median_ms(lambda: list(Resume.objects.filter(user_id=user.pk)), args.repeat)
+        light = median_ms(lambda: list(Resume.objects.metadata().filter(user_id=user.pk)), args.repeat)
+        print(f"{'':<28}{'all columns':>13}{'metadata':>10}")
+        print(f"{'one user (query, ms)':<28}{full:>13.2f}{light:>10.2f}")
+        print(f"{'one user (JSON read, KiB)':<28}{args.resumes * json_bytes / 1024:>13.0f}{0:>10}")
+
+        full = median_ms(lambda: list(Resume.objects.select_related("user")[:100]), args.repeat)
+        light = median_ms(lambda: list(Resume.objects.metadata().select_related("user")[:100]), args.repeat)
+        print(f"{'100 admin rows (query, ms)':<28}{full:>13.2f}{light:>10.2f}")
+
+        admin = median_ms(lambda: client.get("/admin/Scanner/resume/"), args.repeat)
+        account = median_ms(lambda: client.get(reverse("user-account", args=[user.pk])), args.repeat)
+        print(f"\nadmin change list: {admin:.1f} ms, user_account page: {account:.1f} ms")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Per-format throughput of the resume text readers used at upload time.
+
+Builds synthetic PDF and DOCX resumes of the same content and reports documents/s
+and MB/s for:
+  - pdf        Scanner.views.read_pdf_text (PyPDF2)
+  - docx-text  Scanner.utils.conversion.extract_docx_text (text-only fast path)
+  - docx-full  Scanner.utils.conversion.extract_all (full structure, for comparison)
+
+Run from "Server-Based Architecture" with the usual Django environment variables:
+    python benchmarks/bench_resume_text_throughput.py --lines 300 --seconds 3
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Core.settings")
+
+import django
+
+django.setup()
+
+from docx import Document
+
+from Scanner.utils.conversion import extract_all, extract_docx_text
+from Scanner.views import read_pdf_text
+
+LINES_PER_PAGE = 45
+
+
+def resume_lines(count):
+    sections = ["EXPERIENCE", "EDUCATION", "SKILLS", "PROJECTS"]
+    lines = []
+    for i in range(count):
+        if i % 40 == 0:
+            lines.append(sections[(i // 40) % len(sections)])
+        else:
+            lines.append(f"Built feature {i} with Python, Django and PostgreSQL for 10k users")
+    return lines
+
+
+def build_pdf(lines):
+    """Minimal uncompressed PDF, one Helvetica text line per resume line."""
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)]
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in pages:
+        stream = "BT /F1 10 Tf 14 TL 50 780 Td " + " ".join(
+            "(" + line.replace("(", "").replace(")", "") + ") '" for line in page
+        ) + " ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        content_id = len(objects)
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1"))
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode("latin-1"))
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1"))
+    return out.getvalue()
+
+
+def build_docx(lines):
+    doc = Document()
+    for line in lines:
+        if line.isupper():
+            doc.add_heading(line, level=2)
+        else:
+            doc.add_paragraph(line, style="List Bullet")
+    table = doc.add_table(rows=5, cols=3)
+    for row in table.rows:
+        for c, cell in enumerate(row.cells):
+            cell.text = ["Python", "Django", "AWS"][c]
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def throughput(fn, payload, seconds):
+    fn(io.BytesIO(payload))  # warm up
+    runs, start = 0, time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        fn(io.BytesIO(payload))
+        runs += 1
+    elapsed = time.perf_counter() - start
+    return runs / elapsed, runs * len(payload) / elapsed / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=300)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    lines = resume_lines(args.lines)
+    pdf_bytes, docx_bytes = build_pdf(lines), build_docx(lines)
+
+    cases = [
+        ("pdf", read_pdf_text, pdf_bytes),
+        ("docx-text", extract_docx_text, docx_bytes),
+        ("docx-full", extract_all, docx_bytes),
+    ]
+    print(f"{args.lines} resume lines; PDF {len(pdf_bytes) / 1024:.0f} KB, DOCX {len(docx_bytes) / 1024:.0f} KB")
+    print(f"{'reader':<12}{'docs/s':>12}{'MB/s':>10}")
+    for name, fn, payload in cases:
+        docs_per_second, mb_per_second = throughput(fn, payload, args.seconds)
+        print(f"{name:<12}{docs_per_second:>12.1f}{mb_per_second:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
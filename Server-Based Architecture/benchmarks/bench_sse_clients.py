@@ -0,0 +1,190 @@
+"""
+Concurrent Server-Sent Events clients held open by one ASGI worker.
+
+Drives Core.asgi.application in-process on a single event loop, the way one
+uvicorn worker runs it, with --clients concurrent requests to the
+resume_events stream spread over --resumes resumes. Once every client has its
+initial state, each recommendation stage is written to all resumes at once
+and the time until every client has received it is measured. Reports:
+  - connect     time until every stream delivered its initial state
+  - per stage   delivery latency (p50 / p95 / max) across all clients
+  - poller      ticks and database reads of the shared poller, against the
+                one request per second per client that polling costs
+  - process     threads alive and resident memory while the clients wait
+Then disconnects everyone and checks no subscription is left behind.
+
+Uses a throwaway test database, like manage.py test. Run from
+"Server-Based Architecture" with the usual Django environment variables:
+    python benchmarks/bench_sse_clients.py --clients 1000 --resumes 100
+"""
+
+import argparse
+import asyncio
+import os
+import resource
+import statistics
+import sys
+import threading
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Core.settings")
+
+import django
+
+django.setup()
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from Core.asgi import application
+from Scanner.events import broker
+from Scanner.models import Resume
+from UserAuth.models import UserProfile
+
+STAGES = [
+    Resume.RECOMMENDATION_QUEUED,
+    Resume.RECOMMENDATION_FETCHING_JOBS,
+    Resume.RECOMMENDATION_ANALYZING,
+    Resume.RECOMMENDATION_DONE,
+]
+
+
+def rss_mib():
+    """Peak resident set size of this process so far"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class StreamClient:
+    """One EventSource connection, speaking ASGI to the application directly"""
+
+    def __init__(self, path, cookie, number):
+        self.scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+            "method": "GET", "scheme": "https", "path": path, "raw_path": path.encode(),
+            "query_string": b"", "root_path": "",
+            "headers": [
+                (b"host", b"localhost"), (b"accept", b"text/event-stream"),
+                (b"cookie", cookie.encode()), (b"x-forwarded-proto", b"https"),
+            ],
+            "client": ("127.0.0.1", 10000 + number), "server": ("localhost", 443),
+        }
+        self.status = None
+        self.received = {}  # recommendation status -> perf_counter when it arrived
+        self.requested = False
+        self.disconnected = asyncio.Event()
+
+    async def receive(self):
+        if not self.requested:
+            self.requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await self.disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message):
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+            return
+        body = message.get("body", b"").decode()
+        now = time.perf_counter()
+        for block in body.split("\n\n"):
+            if block.startswith("event: recommendation"):
+                status = block.split('"status":"', 1)[1].split('"', 1)[0]
+                self.received.setdefault(status, now)
+
+    async def run(self):
+        await application(self.scope, self.receive, self.send)
+
+
+def setup_resumes(count):
+    user = User.objects.create_user(username="sse_bench", password="sse-bench-password")
+    UserProfile.objects.create(user=user)
+    resumes = Resume.objects.bulk_create(
+        Resume(user=user, extracted_text={"name": "Bench User", "skills": ["Python"]}) for _ in range(count)
+    )
+    client = Client()
+    client.force_login(user)
+    return user, [resume.pk for resume in resumes], f"sessionid={client.cookies['sessionid'].value}"
+
+
+def set_stage(stage):
+    Resume.objects.update(recommendation_status=stage, recommendation_updated_at=timezone.now())
+
+
+async def wait_for(predicate, timeout):
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("clients did not receive the event in time")
+        await asyncio.sleep(0.005)
+
+
+def percentiles(samples_ms):
+    ordered = sorted(samples_ms)
+    return statistics.median(ordered), ordered[int(len(ordered) * 0.95) - 1], ordered[-1]
+
+
+async def run(args, resume_ids, cookie):
+    clients = [
+        StreamClient(reverse("resume_events", args=["sse_bench", resume_ids[i % len(resume_ids)]]), cookie, i)
+        for i in range(args.clients)
+    ]
+    threads_before, rss_before = threading.active_count(), rss_mib()
+
+    start = time.perf_counter()
+    tasks = [asyncio.create_task(client.run()) for client in clients]
+    await wait_for(lambda: all("" in client.received for client in clients), args.timeout)
+    connect_s = time.perf_counter() - start
+    statuses = {client.status for client in clients}
+    print(f"{args.clients} clients on {len(resume_ids)} resumes connected in {connect_s:.2f}s "
+          f"(HTTP {', '.join(map(str, sorted(statuses)))}), {broker.subscriber_count()} subscriptions")
+
+    ticks_before, poll_start = broker.ticks, time.perf_counter()
+    print(f"\n{'stage':<15}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}")
+    for stage in STAGES:
+        written = time.perf_counter()
+        await sync_to_async(set_stage)(stage)
+        await wait_for(lambda: all(stage in client.received for client in clients), args.timeout)
+        p50, p95, worst = percentiles([(client.received[stage] - written) * 1000 for client in clients])
+        print(f"{stage:<15}{p50:>9.0f}{p95:>9.0f}{worst:>9.0f}")
+
+    # Hold the connections idle for a while to see what waiting clients cost
+    await asyncio.sleep(args.idle)
+    elapsed = time.perf_counter() - poll_start
+    ticks = broker.ticks - ticks_before
+    print(f"\npoller: {ticks} ticks in {elapsed:.1f}s ({2 * ticks / elapsed:.1f} state queries/s); "
+          f"polling clients would send {args.clients / settings.EVENTS_POLL_SECONDS:.0f} requests/s")
+    print(f"process: {threading.active_count()} threads (was {threads_before}), "
+          f"peak RSS {rss_mib():.0f} MiB (was {rss_before:.0f} MiB)")
+
+    for client in clients:
+        client.disconnected.set()
+    await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), args.timeout)
+    await wait_for(lambda: broker.subscriber_count() == 0, args.timeout)
+    print(f"disconnected: {broker.subscriber_count()} subscriptions left")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--resumes", type=int, default=100)
+    parser.add_argument("--idle", type=float, default=5.0, help="seconds to hold the idle connections")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        _, resume_ids, cookie = setup_resumes(args.resumes)
+        asyncio.run(run(args, resume_ids, cookie))
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
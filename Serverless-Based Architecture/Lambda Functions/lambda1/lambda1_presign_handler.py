@@ -0,0 +1,172 @@
+import json
+import re
+import time
+import boto3
+from datetime import datetime
+
+# AWS Clients
+s3_client = boto3.client('s3')
+dynamodb = boto3.resource('dynamodb')
+
+# Configuration
+TABLE_NAME = 'resume-analyzer-users-resume'
+BUCKET_NAME = 'resume-analyzer-user-data'
+UPLOAD_URL_EXPIRES_SECONDS = 300
+# A pending item whose file never arrived frees its slot after this; the slack covers a
+# slow upload started just before the URL expired. Also the table's TTL attribute.
+PENDING_UPLOAD_EXPIRES_SECONDS = UPLOAD_URL_EXPIRES_SECONDS + 600
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+table = dynamodb.Table(TABLE_NAME)
+
+
+class BadRequest(Exception):
+    """Raised for request input the caller has to fix; answered with a 400"""
+
+
+def is_abandoned(item, now=None):
+    """True for a pending upload whose file never arrived before it expired"""
+    expires_at = item.get('upload_expires_at')
+    if item.get('status') != 'pending_upload' or expires_at is None:
+        return False
+    return int(expires_at) <= (now if now is not None else time.time())
+
+
+def parse_file_size(value):
+    """The declared size in bytes, or BadRequest when it is missing, not a number or too big"""
+    try:
+        file_size = int(value)
+    except (TypeError, ValueError):
+        raise BadRequest('file_size must be the size of the file in bytes.')
+    if file_size <= 0:
+        raise BadRequest('file_size must be the size of the file in bytes.')
+    if file_size > MAX_UPLOAD_BYTES:
+        raise BadRequest('File size must be less than 10MB.')
+    return file_size
+
+
+def sanitize_file_name(file_name):
+    """Keep S3 keys predictable: letters, digits, dot, dash and underscore only"""
+    base = (file_name or 'resume.pdf').rsplit('/', 1)[-1]
+    base = re.sub(r'[^A-Za-z0-9._-]', '_', base)[:100]
+    if not base.lower().endswith('.pdf'):
+        base += '.pdf'
+    return base
+
+
+def get_next_resume_number(user_id):
+    """Get the next resume number for user (pending uploads count towards the limit)"""
+    response = table.query(
+        KeyConditionExpression='user_id = :uid',
+        ExpressionAttributeValues={':uid': user_id}
+    )
+
+    now = time.time()
+    items = [
+        item for item in response.get('Items', [])
+        if item.get('status') != 'rejected' and not is_abandoned(item, now)
+    ]
+
+    if len(items) >= 5:
+        raise Exception("Resume limit reached (5/5)")
+
+    if not items:
+        return 1
+
+    max_number = max([item.get('resume_number', 0) for item in items])
+    return max_number + 1
+
+
+def lambda_handler(event, context):
+    """
+    Step 1 of the upload flow: hand the browser a presigned POST form and record
+    a pending DynamoDB item. The PDF goes straight to S3 (the form's policy caps
+    its size) and the S3 event triggers lambda1_process_upload_handler for
+    validation and processing. A pending item expires if no file arrives.
+    """
+    if event.get('httpMethod') == 'OPTIONS':
+        return cors_response(200, {'message': 'OK'})
+
+    try:
+        claims = event.get('requestContext', {}).get('authorizer', {}).get('claims', {})
+        user_id = claims.get('sub')
+        user_email = claims.get('email')
+
+        if not user_id or not user_email:
+            return cors_response(401, {'error': 'Unauthorized'})
+
+        body = json.loads(event.get('body') or '{}')
+        filename = sanitize_file_name(body.get('file_name'))
+        file_size = parse_file_size(body.get('file_size'))
+
+        resume_number = get_next_resume_number(user_id)
+        print(f"Assigning resume number: {resume_number}")
+
+        ts = int(datetime.utcnow().timestamp())
+        resume_id = f"{user_id}-{resume_number}-{ts}"
+        pdf_key = f"{user_id}/resume-{resume_number}/{filename}"
+
+        # Record the pending upload; the storage event handler completes it
+        table.put_item(Item={
+            'user_id': user_id,
+            'resume_id': resume_id,
+            'resume_number': int(resume_number),
+            'user_email': user_email,
+            'file_name': filename,
+            'upload_date': datetime.utcnow().isoformat(),
+            'status': 'pending_upload',
+            'progress': 0,
+            'file_size': file_size,
+            'upload_expires_at': ts + PENDING_UPLOAD_EXPIRES_SECONDS,
+            'pdf_s3_path': f's3://{BUCKET_NAME}/{pdf_key}',
+            'career_field': body.get('career_field', ''),
+            'experience_level': body.get('experience_level', ''),
+            'preferred_location': body.get('preferred_location', ''),
+        })
+        print(f"Saved pending upload to DynamoDB: {resume_id}")
+
+        # A presigned PUT cannot bound the body; the POST policy makes S3 refuse anything over the limit
+        upload = s3_client.generate_presigned_post(
+            Bucket=BUCKET_NAME,
+            Key=pdf_key,
+            Fields={'Content-Type': 'application/pdf'},
+            Conditions=[
+                {'Content-Type': 'application/pdf'},
+                ['content-length-range', 1, MAX_UPLOAD_BYTES],
+            ],
+            ExpiresIn=UPLOAD_URL_EXPIRES_SECONDS
+        )
+
+        return cors_response(200, {
+            'success': True,
+            'data': {
+                'resume_id': resume_id,
+                'resume_number': resume_number,
+                'upload_url': upload['url'],
+                'upload_fields': upload['fields'],
+                'upload_method': 'POST',
+                'content_type': 'application/pdf',
+                'expires_in': UPLOAD_URL_EXPIRES_SECONDS,
+                'status': 'pending_upload'
+            }
+        })
+
+    except BadRequest as e:
+        return cors_response(400, {'error': str(e)})
+
+    except Exception as e:
+        import traceback
+        print(f"ERROR: {str(e)}")
+        traceback.print_exc()
+        return cors_response(500, {'error': str(e)})
+
+
+def cors_response(status_code, body):
+    return {
+        'statusCode': status_code,
+        'headers': {
+            'Access-Control-Allow-Origin': '*',
+            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+            'Access-Control-Allow-Methods': 'POST,OPTIONS'
+        },
+        'body': json.dumps(body)
+    }
@@ -0,0 +1,144 @@
+import time
+import boto3
+from datetime import datetime
+from urllib.parse import unquote_plus
+
+from lambda1_presign_handler import is_abandoned
+from lambda1_upload_handler import (
+    VALIDATION_CHAR_BUDGET,
+    extract_text_from_pdf,
+    validate_resume_with_claude,
+    trigger_async_processing,
+)
+
+# AWS Clients
+s3_client = boto3.client('s3')
+dynamodb = boto3.resource('dynamodb')
+
+# Configuration
+TABLE_NAME = 'resume-analyzer-users-resume'
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+table = dynamodb.Table(TABLE_NAME)
+
+
+def parse_upload_key(key):
+    """Split '<user_id>/resume-<n>/<file name>' into (user_id, resume_number)"""
+    parts = key.split('/')
+    if len(parts) != 3 or not parts[1].startswith('resume-'):
+        return None, None
+    try:
+        return parts[0], int(parts[1][len('resume-'):])
+    except ValueError:
+        return None, None
+
+
+def find_pending_item(user_id, resume_number):
+    """Find the pending DynamoDB item recorded by lambda1_presign_handler"""
+    response = table.query(
+        KeyConditionExpression='user_id = :uid',
+        ExpressionAttributeValues={':uid': user_id}
+    )
+    now = time.time()
+    for item in response.get('Items', []):
+        if int(item.get('resume_number', 0)) != resume_number or item.get('status') != 'pending_upload':
+            continue
+        # An expired item has already given its slot (and maybe its number) to a newer upload
+        if is_abandoned(item, now):
+            continue
+        return item
+    return None
+
+
+def set_status(item, status, progress, error=None, keep_expiry=True):
+    update_expression = 'SET #status = :status, progress = :progress, status_updated_at = :time'
+    values = {
+        ':status': status,
+        ':progress': progress,
+        ':time': datetime.utcnow().isoformat()
+    }
+    if error:
+        update_expression += ', upload_error = :error'
+        values[':error'] = error
+    if not keep_expiry:
+        # The file arrived: the item is a resume now and must outlive the table's TTL
+        update_expression += ' REMOVE upload_expires_at'
+
+    table.update_item(
+        Key={'user_id': item['user_id'], 'resume_id': item['resume_id']},
+        UpdateExpression=update_expression,
+        ExpressionAttributeNames={'#status': 'status'},
+        ExpressionAttributeValues=values
+    )
+
+
+def reject_upload(bucket, key, item, error):
+    """Drop the object and leave the item as 'rejected' so the slot is freed"""
+    print(f"Rejecting upload {key}: {error}")
+    s3_client.delete_object(Bucket=bucket, Key=key)
+    set_status(item, 'rejected', 0, error)
+
+
+def process_uploaded_object(bucket, key, size):
+    user_id, resume_number = parse_upload_key(key)
+    if not user_id:
+        print(f"Ignoring object outside the upload layout: {key}")
+        return 'ignored'
+
+    item = find_pending_item(user_id, resume_number)
+    if not item:
+        print(f"No pending upload for {key}; already processed or never requested")
+        return 'ignored'
+
+    if size > MAX_UPLOAD_BYTES:
+        reject_upload(bucket, key, item, 'File size must be less than 10MB.')
+        return 'rejected'
+
+    set_status(item, 'validating', 2, keep_expiry=False)
+
+    # One read straight from S3: no base64 body, no second copy, no re-upload
+    pdf_bytes = s3_client.get_object(Bucket=bucket, Key=key)['Body'].read()
+
+    resume_text = extract_text_from_pdf(pdf_bytes, char_budget=VALIDATION_CHAR_BUDGET)
+    if not resume_text:
+        reject_upload(bucket, key, item,
+                      'Could not extract text from PDF. Please ensure your resume is readable.')
+        return 'rejected'
+
+    if not validate_resume_with_claude(resume_text):
+        reject_upload(bucket, key, item,
+                      'This does not appear to be a valid resume. Please upload a document '
+                      'with your work experience, education, or skills.')
+        return 'rejected'
+
+    set_status(item, 'uploaded', 5)
+    print(f" Upload validated: {item['resume_id']}")
+
+    trigger_async_processing(
+        item['resume_id'], user_id, resume_number,
+        item.get('career_field', ''), item.get('experience_level', ''), item.get('preferred_location', '')
+    )
+    return 'uploaded'
+
+
+def lambda_handler(event, context):
+    """
+    Step 2 of the upload flow, triggered by s3:ObjectCreated:Post on *.pdf.
+    Validates the object in place and starts the same async processing as the
+    old base64 upload handler.
+    """
+    results = []
+    for record in event.get('Records', []):
+        s3_info = record.get('s3', {})
+        bucket = s3_info.get('bucket', {}).get('name')
+        key = unquote_plus(s3_info.get('object', {}).get('key', ''))
+        size = int(s3_info.get('object', {}).get('size', 0))
+
+        try:
+            results.append({'key': key, 'result': process_uploaded_object(bucket, key, size)})
+        except Exception as e:
+            import traceback
+            print(f"ERROR processing {key}: {str(e)}")
+            traceback.print_exc()
+            results.append({'key': key, 'result': 'error', 'error': str(e)})
+
+    return {'processed': results}
@@ -28,15 +28,29 @@ def get_claude_api_key():
     )
     return response['Parameter']['Value']
 
-def extract_text_from_pdf(pdf_bytes):
+# Claude only ever sees the first VALIDATION_CHAR_BUDGET characters of the resume
+VALIDATION_CHAR_BUDGET = 3000
+
+def iter_pdf_pages(pdf_bytes, char_budget=None):
+    """Yield page text lazily, stopping once char_budget characters have been read"""
+    reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+    total = 0
+    for page in reader.pages:
+        page_text = page.extract_text() or ""
+        yield page_text
+
+        total += len(page_text) + 1
+        if char_budget is not None and total >= char_budget:
+            return
+
+def extract_text_from_pdf(pdf_bytes, char_budget=None):
     """Extract text from PDF bytes for validatio only"""
     try:
-        pdf_file = io.BytesIO(pdf_bytes)
-        reader = PyPDF2.PdfReader(pdf_file)
         text = ""
-        for page in reader.pages:
-            page_text = page.extract_text() or ""
+        for page_text in iter_pdf_pages(pdf_bytes, char_budget=char_budget):
             text += page_text + "\n"
+        if char_budget is not None:
+            text = text[:char_budget]
         return text.strip()
     except Exception as e:
         print(f"[WARNING] PDF extraction error: {e}")
@@ -54,7 +68,7 @@ A valid resume should contain:
 - Work experience OR education OR skills
 
 Resume text:
-\"\"\"{resume_text[:3000]}\"\"\"
+\"\"\"{resume_text[:VALIDATION_CHAR_BUDGET]}\"\"\"
 
 Answer (YES or NO):"""
 
@@ -166,7 +180,7 @@ def lambda_handler(event, context):
 
         # VALIDATION ONLY - Extract text
         print("Extracting text for validation...")
-        resume_text = extract_text_from_pdf(file_bytes)
+        resume_text = extract_text_from_pdf(file_bytes, char_budget=VALIDATION_CHAR_BUDGET)
         
         if not resume_text:
             return cors_response(400, {
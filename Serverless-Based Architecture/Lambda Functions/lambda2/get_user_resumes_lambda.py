@@ -1,8 +1,11 @@
-import json
+import time
 import boto3
 from boto3.dynamodb.conditions import Key
 from decimal import Decimal
 
+# Packaged from lambda5
+from json_codec import json_response
+
 # AWS Clients only necessary ones
 dynamodb = boto3.resource('dynamodb')
 table = dynamodb.Table('resume-analyzer-users-resume')
@@ -26,6 +29,12 @@ def convert_decimals(obj):
     return obj
 
 
+def is_abandoned(item, now):
+    """Pending upload whose file never arrived (see lambda1_presign_handler)"""
+    expires_at = item.get('upload_expires_at')
+    return item.get('status') == 'pending_upload' and expires_at is not None and int(expires_at) <= now
+
+
 def lambda_handler(event, context):
     """Get all resumes OR single resume metadata for a user"""
     
@@ -72,7 +81,11 @@ def lambda_handler(event, context):
             
             # Convert Decimals and format metadata
             resumes = []
+            now = time.time()
             for item in items:
+                # Uploads that failed validation or never arrived are not shown to the user
+                if item.get('status') == 'rejected' or is_abandoned(item, now):
+                    continue
                 resume_metadata = {
                     'resume_id': item.get('resume_id'),
                     'resume_number': decimal_to_int(item.get('resume_number', 0)),
@@ -111,15 +124,14 @@ def lambda_handler(event, context):
         })
 
 
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+    'Access-Control-Allow-Methods': 'GET,OPTIONS',
+    'Content-Type': 'application/json'
+}
+
+
 def cors_response(status_code, body):
     """Return response with CORS headers"""
-    return {
-        'statusCode': status_code,
-        'headers': {
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-            'Access-Control-Allow-Methods': 'GET,OPTIONS',
-            'Content-Type': 'application/json'
-        },
-        'body': json.dumps(body)
-    }
\ No newline at end of file
+    return json_response(status_code, body, CORS_HEADERS)
\ No newline at end of file
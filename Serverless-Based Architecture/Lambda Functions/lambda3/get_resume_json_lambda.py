@@ -1,6 +1,8 @@
-import json
 import boto3
 
+# Packaged from lambda5
+from json_codec import json_response
+
 s3_client = boto3.client('s3')
 dynamodb = boto3.resource('dynamodb')
 table = dynamodb.Table('resume-analyzer-users-resume')
@@ -39,11 +41,9 @@ def lambda_handler(event, context):
         s3_key = json_s3_path.replace(f's3://{BUCKET_NAME}/', '')
         print(f"Fetching from S3: {s3_key}")
         
-        # Get JSON from S3
+        # The stored JSON is the response body; it is not parsed and re-serialized
         s3_response = s3_client.get_object(Bucket=BUCKET_NAME, Key=s3_key)
-        json_content = s3_response['Body'].read().decode('utf-8')
-        
-        return cors_response(200, json.loads(json_content))
+        return cors_response(200, s3_response['Body'].read())
         
     except Exception as e:
         print(f"ERROR: {str(e)}")
@@ -51,14 +51,13 @@ def lambda_handler(event, context):
         traceback.print_exc()
         return cors_response(500, {'error': str(e)})
 
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+    'Access-Control-Allow-Methods': 'GET,OPTIONS',
+    'Content-Type': 'application/json'
+}
+
+
 def cors_response(status_code, body):
-    return {
-        'statusCode': status_code,
-        'headers': {
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-            'Access-Control-Allow-Methods': 'GET,OPTIONS',
-            'Content-Type': 'application/json'
-        },
-        'body': json.dumps(body)
-    }
\ No newline at end of file
+    return json_response(status_code, body, CORS_HEADERS)
\ No newline at end of file
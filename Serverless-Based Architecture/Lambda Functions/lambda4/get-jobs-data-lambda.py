@@ -1,6 +1,9 @@
-import json
 import boto3
 
+# Packaged from lambda5 so both sides agree on the stored jobs format
+from job_store import jobs_response_body
+from json_codec import dumps, json_response
+
 lambda_client = boto3.client('lambda', region_name='us-east-1')
 s3_client = boto3.client('s3')
 dynamodb = boto3.resource('dynamodb')
@@ -29,7 +32,7 @@ def trigger_recommendations_async(user_id, resume_id):
         lambda_client.invoke(
             FunctionName='recommendations-handler',
             InvocationType='Event',
-            Payload=json.dumps(payload)
+            Payload=dumps(payload)
         )
         
         print(f" Async recommendations triggered sucessfully")
@@ -69,9 +72,9 @@ def lambda_handler(event, context):
         s3_path = item['jobs_s3_path'].replace('s3://', '')
         bucket, key = s3_path.split('/', 1)
         
-        # Get jobs from S3
+        # Get jobs from S3; the stored job lines are passed through without being parsed
         obj = s3_client.get_object(Bucket=bucket, Key=key)
-        jobs_data = json.loads(obj['Body'].read().decode('utf-8'))
+        jobs_body = jobs_response_body(obj['Body'].read())
         # Trigger async recommendations generation
         if 'recommendations_s3_path' not in item or not item.get('recommendations_s3_path'):
             # Only trigger if recommendations don't exist yet
@@ -79,7 +82,7 @@ def lambda_handler(event, context):
         else:
             print(f"ℹ Recommendations already exist, skipping generation")
 
-        return cors_response(200, jobs_data)
+        return cors_response(200, jobs_body)
         
     except Exception as e:
         print(f"ERROR: {str(e)}")
@@ -87,14 +90,13 @@ def lambda_handler(event, context):
         traceback.print_exc()
         return cors_response(500, {'error': str(e)})
 
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+    'Access-Control-Allow-Methods': 'GET,OPTIONS',
+    'Content-Type': 'application/json'
+}
+
+
 def cors_response(status_code, body):
-    return {
-        'statusCode': status_code,
-        'headers': {
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-            'Access-Control-Allow-Methods': 'GET,OPTIONS',
-            'Content-Type': 'application/json'
-        },
-        'body': json.dumps(body)
-    }
\ No newline at end of file
+    return json_response(status_code, body, CORS_HEADERS)
\ No newline at end of file
@@ -1,15 +1,32 @@
-import json
+import hashlib
 import boto3
 import requests
-from datetime import datetime
+from datetime import datetime, timedelta
+
+from job_search_client import JobSearchClient
+from job_store import CONTENT_ENCODING, CONTENT_TYPE, decode_jobs, encode_jobs
+from json_codec import dumps, json_response, loads
 
 s3_client = boto3.client('s3')
 dynamodb = boto3.resource('dynamodb')
 ssm_client = boto3.client('ssm', region_name='us-east-1')
+lambda_client = boto3.client('lambda', region_name='us-east-1')
 table = dynamodb.Table('resume-analyzer-users-resume')
 
 BUCKET_NAME = 'resume-analyzer-user-data'
 
+# Shared job cache: one S3 object per normalized query, reused across users
+JOB_CACHE_PREFIX = 'job-cache'
+JOB_CACHE_FRESH_FOR = timedelta(hours=6)
+JOB_CACHE_STALE_FOR = timedelta(hours=24)
+JOB_CACHE_REFRESH_LOCK = timedelta(minutes=2)
+
+# Pages fetched concurrently per query, under one deadline well inside the function timeout
+JOB_SEARCH_PAGES = 5
+JOB_SEARCH_PAGE_SIZE = 10
+JOB_SEARCH_DEADLINE_SECONDS = 8.0
+DEFAULT_LOCATION = 'United States'
+
 def get_rapid_api_key():
     """Get RapidAPI key from Parameter Store"""
     try:
@@ -22,15 +39,179 @@ def get_rapid_api_key():
         print(f"Error getting API key: {e}")
         return None
 
+# Pooled across warm invocations of this container; key fetched on first use
+job_search_client = JobSearchClient(api_key=get_rapid_api_key)
+
+
+def normalize_query(career_field, experience_level, location):
+    """Same normalization as the Django JobSearchCache so both sides agree on keys"""
+    def clean(value):
+        return ' '.join(str(value or '').lower().split())
+    return clean(career_field), clean(experience_level), clean(location) or clean(DEFAULT_LOCATION)
+
+
+def job_cache_key(career_field, experience_level, location):
+    normalized = normalize_query(career_field, experience_level, location)
+    query_hash = hashlib.sha256('|'.join(normalized).encode('utf-8')).hexdigest()
+    return f"{JOB_CACHE_PREFIX}/{query_hash}.jsonl.gz"
+
+
+def read_job_cache(cache_key):
+    """Cached entry for a query, or None"""
+    try:
+        obj = s3_client.get_object(Bucket=BUCKET_NAME, Key=cache_key)
+    except s3_client.exceptions.NoSuchKey:
+        return None
+    return decode_jobs(obj['Body'].read())
+
+
+def cache_state(entry):
+    """'fresh', 'stale' (serve and refresh) or 'expired' (refetch before serving)"""
+    if not entry:
+        return 'miss'
+    age = datetime.utcnow() - datetime.fromisoformat(entry['fetched_at'])
+    if age < JOB_CACHE_FRESH_FOR:
+        return 'fresh'
+    if age < JOB_CACHE_FRESH_FOR + JOB_CACHE_STALE_FOR:
+        return 'stale'
+    return 'expired'
+
+
+def write_job_cache(cache_key, career_field, experience_level, location, jobs, partial=False):
+    # Partial results are dated as already stale so the next lookup refreshes them
+    fetched_at = datetime.utcnow() - (JOB_CACHE_FRESH_FOR if partial else timedelta(0))
+    s3_client.put_object(
+        Bucket=BUCKET_NAME,
+        Key=cache_key,
+        Body=encode_jobs({
+            'query': list(normalize_query(career_field, experience_level, location)),
+            'fetched_at': fetched_at.isoformat(),
+            'count': len(jobs),
+            'partial': partial
+        }, jobs),
+        ContentType=CONTENT_TYPE,
+        ContentEncoding=CONTENT_ENCODING
+    )
+
+
+def claim_refresh(cache_key):
+    """
+    Create the '.refreshing' marker only if it does not exist (S3 conditional write),
+    so a popular stale query triggers a single refresh. Markers older than the lock
+    window are treated as abandoned.
+    """
+    marker_key = cache_key + '.refreshing'
+    try:
+        s3_client.put_object(Bucket=BUCKET_NAME, Key=marker_key, Body=b'', IfNoneMatch='*')
+        return True
+    except s3_client.exceptions.ClientError as e:
+        if e.response.get('Error', {}).get('Code') != 'PreconditionFailed':
+            raise
+    marker = s3_client.head_object(Bucket=BUCKET_NAME, Key=marker_key)
+    if datetime.utcnow() - marker['LastModified'].replace(tzinfo=None) > JOB_CACHE_REFRESH_LOCK:
+        s3_client.delete_object(Bucket=BUCKET_NAME, Key=marker_key)
+        return claim_refresh(cache_key)
+    return False
+
+
+def trigger_cache_refresh(context, career_field, experience_level, location):
+    """Re-invoke this function asynchronously to refresh a stale cache entry"""
+    try:
+        lambda_client.invoke(
+            FunctionName=context.function_name,
+            InvocationType='Event',
+            Payload=dumps({'refreshJobCache': {
+                'careerField': career_field,
+                'experienceLevel': experience_level,
+                'location': location
+            }})
+        )
+    except Exception as e:
+        print(f"Failed to trigger job cache refresh (non-critical): {e}")
+
+
+def fetch_jobs_from_rapidapi(career_field, experience_level, location):
+    """(jobs, partial): pages fetched concurrently, merged and de-duplicated by job_id"""
+    if not job_search_client.api_key:
+        raise Exception('API key not found')
+    try:
+        jobs, report = job_search_client.search_pages(
+            query=f"{experience_level} {career_field}",
+            location=location,
+            pages=JOB_SEARCH_PAGES,
+            size=JOB_SEARCH_PAGE_SIZE,
+            deadline_seconds=JOB_SEARCH_DEADLINE_SECONDS
+        )
+    finally:
+        print(f"[JOB SEARCH] {job_search_client.latency_summary()}")
+    print(f"[JOB SEARCH] {len(jobs)} jobs, pages ok={report['pages_ok']} "
+          f"late={report['pages_late']} failed={report['pages_failed']}")
+    return jobs, report['partial']
+
+
+def refresh_job_cache(career_field, experience_level, location):
+    """Fetch a query from RapidAPI into the shared cache. Returns the jobs."""
+    cache_key = job_cache_key(career_field, experience_level, location)
+    try:
+        jobs, partial = fetch_jobs_from_rapidapi(career_field, experience_level, location)
+        if jobs:
+            write_job_cache(cache_key, career_field, experience_level, location, jobs, partial)
+        return jobs
+    finally:
+        s3_client.delete_object(Bucket=BUCKET_NAME, Key=cache_key + '.refreshing')
+
+
+def get_cached_jobs(context, career_field, experience_level, location):
+    """
+    Jobs for a query and the cache outcome ('fresh', 'stale', 'miss' or 'expired').
+    Fresh entries are served directly, stale ones are served while one async
+    refresh runs, misses call RapidAPI and fill the cache.
+    """
+    cache_key = job_cache_key(career_field, experience_level, location)
+    entry = read_job_cache(cache_key)
+    state = cache_state(entry)
+    # One structured line per lookup; hit rate and saved calls come from a CloudWatch metric filter
+    print(f"[JOB CACHE] result={state} api_call_saved={state in ('fresh', 'stale')} key={cache_key}")
+
+    if state == 'fresh':
+        return entry['jobs'], state
+
+    if state == 'stale':
+        if claim_refresh(cache_key):
+            trigger_cache_refresh(context, career_field, experience_level, location)
+        return entry['jobs'], state
+
+    try:
+        jobs, partial = fetch_jobs_from_rapidapi(career_field, experience_level, location)
+    except Exception:
+        if entry:
+            print("RapidAPI failed; serving expired job cache snapshot")
+            return entry['jobs'], state
+        raise
+
+    if jobs:
+        write_job_cache(cache_key, career_field, experience_level, location, jobs, partial)
+    elif entry:
+        return entry['jobs'], state
+    return jobs, state
+
+
 def lambda_handler(event, context):
     if event.get('httpMethod') == 'OPTIONS':
         return cors_response(200, {'message': 'OK'})
+
+    # Async self-invocation from get_cached_jobs for a stale entry
+    if 'refreshJobCache' in event:
+        query = event['refreshJobCache']
+        jobs = refresh_job_cache(query['careerField'], query['experienceLevel'], query['location'])
+        print(f"Refreshed job cache with {len(jobs)} jobs")
+        return {'refreshed': len(jobs)}
     
     try:
         user_id = event['requestContext']['authorizer']['claims']['sub']
         
         # Get parameters from request
-        body = json.loads(event.get('body', '{}'))
+        body = loads(event.get('body', '{}'))
         resume_id = body.get('resumeId')
         career_field = body.get('careerField')
         experience_level = body.get('experienceLevel')
@@ -42,44 +223,20 @@ def lambda_handler(event, context):
         
         print(f"Finding jobs for: {career_field} - {experience_level} - {location}")
         
-        # Get RapidAPI key
-        api_key = get_rapid_api_key()
-        if not api_key:
-            return cors_response(500, {'error': 'API key not found'})
-        
-        # Call RapidAPI JSearch
-        url = "https://jsearch.p.rapidapi.com/search"
-        querystring = {
-            "query": f"{experience_level} {career_field}",
-            "page": "1",
-            "num_pages": "1",
-            "size": "10",
-            "remote_jobs_only": "false",
-            "location": location
-        }
-        
-        headers = {
-            "x-rapidapi-key": api_key,
-            "x-rapidapi-host": "jsearch.p.rapidapi.com"
-        }
-        
-        response = requests.get(url, headers=headers, params=querystring, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
-        jobs = data.get('data', [])
+        # Shared cache first; RapidAPI only on a miss
+        jobs, cache_result = get_cached_jobs(context, career_field, experience_level, location)
         
         if not jobs:
             return cors_response(200, {
                 'success': True,
                 'message': 'No jobs found',
-                'jobs': []
+                'jobs': [],
+                'cache': cache_result
             })
         
-        # Save jobs to S3
-        s3_key = f"jobs/{user_id}/resume-{resume_number}/jobs.json"
-        jobs_data = {
-            'jobs': jobs,
+        # Save jobs to S3 as gzipped JSON lines with only the fields the pages read
+        s3_key = f"jobs/{user_id}/resume-{resume_number}/jobs.jsonl.gz"
+        jobs_header = {
             'search_params': {
                 'career_field': career_field,
                 'experience_level': experience_level,
@@ -92,8 +249,9 @@ def lambda_handler(event, context):
         s3_client.put_object(
             Bucket=BUCKET_NAME,
             Key=s3_key,
-            Body=json.dumps(jobs_data, indent=2),
-            ContentType='application/json'
+            Body=encode_jobs(jobs_header, jobs),
+            ContentType=CONTENT_TYPE,
+            ContentEncoding=CONTENT_ENCODING
         )
         
         print(f"Saved {len(jobs)} jobs to S3: {s3_key}")
@@ -118,7 +276,8 @@ def lambda_handler(event, context):
             'success': True,
             'message': f'Found {len(jobs)} jobs',
             'jobs_count': len(jobs),
-            'jobs_s3_path': f's3://{BUCKET_NAME}/{s3_key}'
+            'jobs_s3_path': f's3://{BUCKET_NAME}/{s3_key}',
+            'cache': cache_result
         })
         
     except requests.RequestException as e:
@@ -130,14 +289,13 @@ def lambda_handler(event, context):
         traceback.print_exc()
         return cors_response(500, {'error': str(e)})
 
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+    'Access-Control-Allow-Methods': 'POST,OPTIONS',
+    'Content-Type': 'application/json'
+}
+
+
 def cors_response(status_code, body):
-    return {
-        'statusCode': status_code,
-        'headers': {
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-            'Access-Control-Allow-Methods': 'POST,OPTIONS',
-            'Content-Type': 'application/json'
-        },
-        'body': json.dumps(body)
-    }
\ No newline at end of file
+    return json_response(status_code, body, CORS_HEADERS)
\ No newline at end of file
@@ -0,0 +1,65 @@
+import gzip
+import io
+from itertools import islice
+
+from json_codec import dumps, loads
+
+# JSearch keys read by jobs.js (the job cards) and lambda6 (the recommendation prompt).
+# Everything else in the raw payload (apply_options, ONET codes, coordinates, ...) is dropped.
+JOB_FIELDS = (
+    'job_id', 'job_title', 'employer_name', 'employer_logo', 'employer_website',
+    'job_publisher', 'job_employment_type', 'job_employment_types', 'job_apply_link',
+    'job_google_link', 'job_description', 'job_is_remote', 'job_posted_at',
+    'job_city', 'job_state', 'job_country', 'job_min_salary', 'job_max_salary',
+    'job_salary', 'job_salary_period', 'job_benefits', 'job_highlights',
+)
+
+GZIP_MAGIC = b'\x1f\x8b'
+GZIP_LEVEL = 6
+CONTENT_TYPE = 'application/x-ndjson'
+CONTENT_ENCODING = 'gzip'
+
+
+def compact_job(job):
+    """Only the keys a consumer reads, with empty values left out"""
+    return {key: job[key] for key in JOB_FIELDS if job.get(key) not in (None, '', [], {})}
+
+
+def encode_jobs(header, jobs):
+    """
+    Gzipped JSON lines: the header object on the first line, then one minified
+    job per line, so readers can stop after the jobs they need.
+    """
+    lines = [dumps(header)]
+    lines.extend(dumps(compact_job(job)) for job in jobs)
+    return gzip.compress('\n'.join(lines).encode('utf-8'), compresslevel=GZIP_LEVEL)
+
+
+def decode_jobs(body, limit=None):
+    """
+    Header fields plus 'jobs' from a stored object. Decompression streams, so
+    only the first `limit` jobs are inflated and parsed; 'count' still reports
+    the full number. Reads the old indented JSON objects too.
+    """
+    if not body.startswith(GZIP_MAGIC):
+        data = loads(body)
+        if limit is not None:
+            data['jobs'] = data.get('jobs', [])[:limit]
+        return data
+    with gzip.GzipFile(fileobj=io.BytesIO(body)) as lines:
+        data = loads(next(lines))
+        data['jobs'] = [loads(line) for line in islice(lines, limit)]
+    return data
+
+
+def jobs_response_body(body):
+    """
+    The stored object as the JSON text of {**header, "jobs": [...]}, built by
+    splicing the stored job lines together instead of parsing and re-dumping them.
+    """
+    if not body.startswith(GZIP_MAGIC):
+        return body.decode('utf-8')
+    header_line, *job_lines = gzip.decompress(body).decode('utf-8').split('\n')
+    header = header_line[:-1]
+    separator = ',' if header != '{' else ''
+    return f'{header}{separator}"jobs":[{",".join(job_lines)}]}}'
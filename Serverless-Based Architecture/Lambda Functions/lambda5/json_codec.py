@@ -0,0 +1,42 @@
+import json
+
+# orjson ships in the dependencies layer; without it the standard library writes the same minified JSON
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = 'orjson' if orjson is not None else 'json'
+
+
+def dumps(value):
+    """Minified JSON text, non-ASCII characters left as they are"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value).decode('utf-8')
+        except TypeError:
+            pass  # integers over 64 bits and other values only the standard library encodes
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
+
+def loads(data):
+    """Parse JSON from text or bytes, so S3 bodies need not be decoded first"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_response(status_code, body, headers):
+    """
+    API Gateway proxy response. The body is serialized once, here; str or bytes
+    bodies are JSON text that is already encoded and are sent as they are.
+    """
+    if isinstance(body, bytes):
+        body = body.decode('utf-8')
+    elif not isinstance(body, str):
+        body = dumps(body)
+    return {
+        'statusCode': status_code,
+        'headers': dict(headers),
+        'body': body
+    }
@@ -2,6 +2,10 @@ import json
 import boto3
 from datetime import datetime
 
+# Packaged from lambda5 so both sides agree on the stored jobs format
+from job_store import decode_jobs
+from json_codec import dumps, json_response, loads
+
 s3_client = boto3.client('s3')
 dynamodb = boto3.resource('dynamodb')
 ssm_client = boto3.client('ssm', region_name='us-east-1')
@@ -9,6 +13,9 @@ table = dynamodb.Table('resume-analyzer-users-resume')
 
 BUCKET_NAME = 'resume-analyzer-user-data'
 
+# Jobs summarized in the prompt; only these are decoded from the stored jobs
+PROMPT_JOBS = 10
+
 def get_claude_api_key():
     """Get Claude API key from Parameter Store"""
     try:
@@ -26,7 +33,7 @@ def create_recommendation_prompt(resume_data, jobs_data):
     """Create prompt for Claude to analyze skills gap"""
     
     jobs_summary = []
-    for job in jobs_data.get('jobs', [])[:10]:  # Analyze top 10 jobs
+    for job in jobs_data.get('jobs', [])[:PROMPT_JOBS]:
         jobs_summary.append({
             'title': job.get('job_title', 'N/A'),
             'company': job.get('employer_name', 'N/A'),
@@ -116,7 +123,7 @@ def analyze_with_claude(resume_data, jobs_data):
             # Add metadata
             recommendations['analysis_metadata'] = {
                 'timestamp': datetime.utcnow().isoformat(),
-                'jobs_analyzed': len(jobs_data.get('jobs', [])),
+                'jobs_analyzed': jobs_data.get('count', len(jobs_data.get('jobs', []))),
                 'method': 'claude_ai_analysis'
             }
             
@@ -171,7 +178,7 @@ def lambda_handler(event, context):
             rec_bucket, rec_key = rec_s3_path.split('/', 1)
             
             rec_obj = s3_client.get_object(Bucket=rec_bucket, Key=rec_key)
-            recommendations = json.loads(rec_obj['Body'].read().decode('utf-8'))
+            recommendations = loads(rec_obj['Body'].read())
             
             print(f" Retrieved existing recommendations from S3")
             
@@ -206,14 +213,14 @@ def lambda_handler(event, context):
         
         # Get resume data
         resume_obj = s3_client.get_object(Bucket=resume_bucket, Key=resume_key)
-        resume_data = json.loads(resume_obj['Body'].read().decode('utf-8'))
+        resume_data = loads(resume_obj['Body'].read())
         
         # Get jobs data
         jobs_obj = s3_client.get_object(Bucket=jobs_bucket, Key=jobs_key)
-        jobs_data = json.loads(jobs_obj['Body'].read().decode('utf-8'))
+        jobs_data = decode_jobs(jobs_obj['Body'].read(), limit=PROMPT_JOBS)
         
         print(f" Loaded resume with {len(resume_data.get('skills', []))} skills")
-        print(f" Loaded {len(jobs_data.get('jobs', []))} jobs")
+        print(f" Loaded {len(jobs_data['jobs'])} of {jobs_data.get('count', len(jobs_data['jobs']))} jobs")
         
         # Analyze with Claude
         recommendations = analyze_with_claude(resume_data, jobs_data)
@@ -228,7 +235,7 @@ def lambda_handler(event, context):
         s3_client.put_object(
             Bucket=BUCKET_NAME,
             Key=recommendations_key,
-            Body=json.dumps(recommendations, indent=2),
+            Body=dumps(recommendations),
             ContentType='application/json'
         )
         
@@ -266,14 +273,13 @@ def lambda_handler(event, context):
         traceback.print_exc()
         return cors_response(500, {'error': str(e)})
 
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+    'Access-Control-Allow-Methods': 'GET,OPTIONS',
+    'Content-Type': 'application/json'
+}
+
+
 def cors_response(status_code, body):
-    return {
-        'statusCode': status_code,
-        'headers': {
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-            'Access-Control-Allow-Methods': 'GET,OPTIONS',
-            'Content-Type': 'application/json'
-        },
-        'body': json.dumps(body)
-    }
\ No newline at end of file
+    return json_response(status_code, body, CORS_HEADERS)
\ No newline at end of file
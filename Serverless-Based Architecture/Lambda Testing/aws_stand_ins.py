@@ -0,0 +1,119 @@
+"""
+In-memory stand-ins for the S3 client and DynamoDB table used by the Lambda
+functions, so handlers can be exercised locally without AWS.
+Only the calls the handlers actually make are implemented.
+"""
+
+import importlib
+import io
+import os
+import sys
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+LAMBDA_FUNCTIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Lambda Functions')
+
+
+def load_lambda_module(lambda_dir, module_name, packaged_with=()):
+    """
+    Import a handler module with the AWS/third-party SDKs replaced by mocks.
+    packaged_with names other Lambda directories whose modules ship in the same zip.
+    """
+    for directory in (lambda_dir, *packaged_with):
+        path = os.path.join(LAMBDA_FUNCTIONS_DIR, directory)
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    sdk_mocks = {
+        name: MagicMock()
+        for name in ('boto3', 'boto3.dynamodb', 'boto3.dynamodb.conditions', 'PyPDF2', 'anthropic', 'requests')
+    }
+    with patch.dict(sys.modules, sdk_mocks):
+        sys.modules.pop(module_name, None)
+        return importlib.import_module(module_name)
+
+
+class FakeClientError(Exception):
+    def __init__(self, code):
+        super().__init__(code)
+        self.response = {'Error': {'Code': code}}
+
+
+class FakeS3Exceptions:
+    ClientError = FakeClientError
+
+    class NoSuchKey(FakeClientError):
+        def __init__(self):
+            super().__init__('NoSuchKey')
+
+
+class FakeS3Client:
+    exceptions = FakeS3Exceptions
+
+    def __init__(self):
+        self.objects = {}
+
+    def put_object(self, Bucket, Key, Body, IfNoneMatch=None, **kwargs):
+        if IfNoneMatch == '*' and (Bucket, Key) in self.objects:
+            raise FakeClientError('PreconditionFailed')
+        if isinstance(Body, str):
+            Body = Body.encode('utf-8')
+        self.objects[(Bucket, Key)] = {
+            'Body': Body, 'LastModified': datetime.now(timezone.utc), **kwargs
+        }
+        return {}
+
+    def head_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise FakeClientError('404')
+        return {k: v for k, v in self.objects[(Bucket, Key)].items() if k != 'Body'}
+
+    def get_object(self, Bucket, Key, **kwargs):
+        if (Bucket, Key) not in self.objects:
+            raise FakeS3Exceptions.NoSuchKey()
+        stored = self.objects[(Bucket, Key)]
+        response = dict(stored)
+        response['Body'] = io.BytesIO(stored['Body'])
+        response['ContentLength'] = len(stored['Body'])
+        return response
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop((Bucket, Key), None)
+        return {}
+
+    def generate_presigned_url(self, ClientMethod, Params, ExpiresIn=3600):
+        return f"https://{Params['Bucket']}.s3.local/{Params['Key']}?method={ClientMethod}&expires={ExpiresIn}"
+
+    def generate_presigned_post(self, Bucket, Key, Fields=None, Conditions=None, ExpiresIn=3600):
+        self.last_post_conditions = Conditions or []
+        return {'url': f"https://{Bucket}.s3.local/", 'fields': {**(Fields or {}), 'key': Key}}
+
+
+class FakeTable:
+    def __init__(self):
+        self.items = {}
+
+    def put_item(self, Item):
+        self.items[(Item['user_id'], Item['resume_id'])] = dict(Item)
+        return {}
+
+    def get_item(self, Key):
+        item = self.items.get((Key['user_id'], Key['resume_id']))
+        return {'Item': dict(item)} if item else {}
+
+    def query(self, KeyConditionExpression, ExpressionAttributeValues, **kwargs):
+        user_id = ExpressionAttributeValues[':uid']
+        return {'Items': [dict(item) for (uid, _), item in self.items.items() if uid == user_id]}
+
+    def update_item(self, Key, UpdateExpression, ExpressionAttributeValues,
+                    ExpressionAttributeNames=None, **kwargs):
+        """Supports the plain 'SET a = :a, #b = :b [REMOVE c, d]' expressions the handlers use"""
+        names = ExpressionAttributeNames or {}
+        item = self.items.setdefault((Key['user_id'], Key['resume_id']), dict(Key))
+        set_clause, _, remove_clause = UpdateExpression.strip().partition(' REMOVE ')
+        for attribute in filter(None, (part.strip() for part in remove_clause.split(','))):
+            item.pop(names.get(attribute, attribute), None)
+        assignments = set_clause[len('SET '):].split(',')
+        for assignment in assignments:
+            attribute, placeholder = [part.strip() for part in assignment.split('=')]
+            item[names.get(attribute, attribute)] = ExpressionAttributeValues[placeholder]
+        return {}
@@ -46,6 +46,8 @@ from test_messaging import (
     TestFeedbackFormatting
 )
 from test_error_handling import TestErrorHandling
+from test_upload_flow import TestPresignedUploadFlow
+from test_job_search import TestJobCache, TestJobStore, TestJsonCodec
 
 
 def create_test_suite():
@@ -86,7 +88,15 @@ def create_test_suite():
         TestFeedbackFormatting,
         
         # Error handling tests
-        TestErrorHandling
+        TestErrorHandling,
+
+        # Upload flow tests
+        TestPresignedUploadFlow,
+
+        # Job search tests
+        TestJobCache,
+        TestJobStore,
+        TestJsonCodec
     ]
     
     for test_class in test_classes:
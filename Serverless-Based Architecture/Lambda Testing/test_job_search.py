@@ -0,0 +1,204 @@
+import unittest
+import json
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+from aws_stand_ins import FakeS3Client, FakeTable, load_lambda_module
+
+
+BUCKET = 'resume-analyzer-user-data'
+JOBS = [{'job_id': '1', 'job_title': 'Software Engineer'}]
+
+
+class TestJobCache(unittest.TestCase):
+    """Test the shared job search cache in lambda5 against local stand-ins"""
+
+    def setUp(self):
+        self.jobs = load_lambda_module('lambda5', 'get_jobs_lambda')
+        self.s3 = FakeS3Client()
+        self.jobs.s3_client = self.s3
+        self.jobs.table = FakeTable()
+        self.jobs.lambda_client = MagicMock()
+        self.context = MagicMock(function_name='get-jobs-handler')
+
+    def _event(self, user_id):
+        return {
+            'httpMethod': 'POST',
+            'requestContext': {'authorizer': {'claims': {'sub': user_id}}},
+            'body': json.dumps({
+                'resumeId': f'{user_id}-1', 'resumeNumber': 1,
+                'careerField': 'Software Engineering', 'experienceLevel': 'Entry',
+                'location': 'Boston, MA'
+            })
+        }
+
+    def _age_cache(self, delta):
+        key = self.jobs.job_cache_key('Software Engineering', 'Entry', 'Boston, MA')
+        entry = self.jobs.read_job_cache(key)
+        entry['fetched_at'] = (datetime.utcnow() - delta).isoformat()
+        jobs = entry.pop('jobs')
+        self.s3.objects[(BUCKET, key)]['Body'] = self.jobs.encode_jobs(entry, jobs)
+
+    def test_cache_key_is_normalized(self):
+        self.assertEqual(
+            self.jobs.job_cache_key('Software  Engineering', 'ENTRY', ''),
+            self.jobs.job_cache_key('software engineering', 'entry', 'United States')
+        )
+
+    def test_second_user_is_served_from_cache(self):
+        with patch.object(self.jobs, 'fetch_jobs_from_rapidapi', return_value=(JOBS, False)) as fetch:
+            first = json.loads(self.jobs.lambda_handler(self._event('user-1'), self.context)['body'])
+            second = json.loads(self.jobs.lambda_handler(self._event('user-2'), self.context)['body'])
+
+        fetch.assert_called_once()
+        self.assertEqual((first['cache'], second['cache']), ('miss', 'fresh'))
+        self.assertEqual(second['jobs_count'], 1)
+        self.assertIn((BUCKET, 'jobs/user-2/resume-1/jobs.jsonl.gz'), self.s3.objects)
+
+    def test_stale_entry_triggers_a_single_refresh(self):
+        with patch.object(self.jobs, 'fetch_jobs_from_rapidapi', return_value=(JOBS, False)) as fetch:
+            self.jobs.lambda_handler(self._event('user-1'), self.context)
+            self._age_cache(self.jobs.JOB_CACHE_FRESH_FOR + timedelta(minutes=1))
+
+            results = [json.loads(self.jobs.lambda_handler(self._event(u), self.context)['body'])['cache']
+                       for u in ('user-2', 'user-3')]
+
+        self.assertEqual(results, ['stale', 'stale'])
+        fetch.assert_called_once()
+        self.jobs.lambda_client.invoke.assert_called_once()
+
+    def test_partial_result_is_cached_as_stale(self):
+        with patch.object(self.jobs, 'fetch_jobs_from_rapidapi', return_value=(JOBS, True)):
+            body = json.loads(self.jobs.lambda_handler(self._event('user-1'), self.context)['body'])
+
+        key = self.jobs.job_cache_key('Software Engineering', 'Entry', 'Boston, MA')
+        self.assertEqual(body['jobs_count'], 1)
+        self.assertEqual(self.jobs.cache_state(self.jobs.read_job_cache(key)), 'stale')
+
+    def test_refresh_event_rewrites_cache_and_releases_lock(self):
+        key = self.jobs.job_cache_key('Software Engineering', 'Entry', 'Boston, MA')
+        self.assertTrue(self.jobs.claim_refresh(key))
+        self.assertFalse(self.jobs.claim_refresh(key))
+
+        with patch.object(self.jobs, 'fetch_jobs_from_rapidapi', return_value=(JOBS, False)):
+            result = self.jobs.lambda_handler({'refreshJobCache': {
+                'careerField': 'Software Engineering', 'experienceLevel': 'Entry', 'location': 'Boston, MA'
+            }}, self.context)
+
+        self.assertEqual(result, {'refreshed': 1})
+        self.assertNotIn((BUCKET, key + '.refreshing'), self.s3.objects)
+        self.assertEqual(self.jobs.cache_state(self.jobs.read_job_cache(key)), 'fresh')
+
+
+class TestJobStore(unittest.TestCase):
+    """Test the compact gzipped jobs format written by lambda5 and read by lambda4/lambda6"""
+
+    RAW_JOB = {
+        'job_id': '7', 'job_title': 'Data Engineer', 'employer_name': 'Acme',
+        'job_highlights': {'Qualifications': ['SQL']}, 'job_description': 'Build pipelines',
+        'apply_options': [{'publisher': 'LinkedIn', 'apply_link': 'https://example.com'}],
+        'job_onet_soc': '15113200', 'job_latitude': 42.36, 'job_salary': None, 'job_benefits': [],
+    }
+
+    def setUp(self):
+        self.store = load_lambda_module('lambda5', 'job_store')
+        self.get_jobs_data = load_lambda_module('lambda4', 'get-jobs-data-lambda', packaged_with=('lambda5',))
+        self.s3 = FakeS3Client()
+        self.table = FakeTable()
+        self.get_jobs_data.s3_client = self.s3
+        self.get_jobs_data.table = self.table
+        self.get_jobs_data.lambda_client = MagicMock()
+
+    def _store(self, key, body):
+        self.s3.put_object(Bucket=BUCKET, Key=key, Body=body)
+        self.table.put_item({'user_id': 'user-1', 'resume_id': 'r1', 'jobs_s3_path': f's3://{BUCKET}/{key}',
+                             'recommendations_s3_path': 's3://elsewhere'})
+
+    def _get_jobs_data(self):
+        return self.get_jobs_data.lambda_handler({
+            'httpMethod': 'GET', 'queryStringParameters': {'resumeId': 'r1'},
+            'requestContext': {'authorizer': {'claims': {'sub': 'user-1'}}}
+        }, MagicMock())
+
+    def test_only_read_fields_are_stored(self):
+        body = self.store.encode_jobs({'count': 1}, [self.RAW_JOB])
+
+        self.assertEqual(body[:2], self.store.GZIP_MAGIC)
+        job = self.store.decode_jobs(body)['jobs'][0]
+        self.assertEqual(set(job), {'job_id', 'job_title', 'employer_name', 'job_highlights', 'job_description'})
+
+    def test_decode_stops_after_limit_but_keeps_count(self):
+        jobs = [dict(self.RAW_JOB, job_id=str(i)) for i in range(25)]
+        data = self.store.decode_jobs(self.store.encode_jobs({'count': 25}, jobs), limit=10)
+
+        self.assertEqual(len(data['jobs']), 10)
+        self.assertEqual(data['count'], 25)
+
+    def test_get_jobs_data_splices_stored_jobs(self):
+        header = {'search_params': {'career_field': 'Data'}, 'count': 2}
+        self._store('jobs/user-1/resume-1/jobs.jsonl.gz',
+                    self.store.encode_jobs(header, [self.RAW_JOB, dict(self.RAW_JOB, job_id='8')]))
+
+        response = self._get_jobs_data()
+
+        self.assertEqual(response['statusCode'], 200)
+        data = json.loads(response['body'])
+        self.assertEqual(data['search_params'], {'career_field': 'Data'})
+        self.assertEqual([job['job_id'] for job in data['jobs']], ['7', '8'])
+        self.assertNotIn('apply_options', data['jobs'][0])
+
+    def test_get_jobs_data_serves_legacy_json(self):
+        legacy = {'jobs': [self.RAW_JOB], 'search_params': {}, 'count': 1}
+        self._store('jobs/user-1/resume-1/jobs.json', json.dumps(legacy, indent=2))
+
+        data = json.loads(self._get_jobs_data()['body'])
+
+        self.assertEqual(data, legacy)
+
+
+class TestJsonCodec(unittest.TestCase):
+    """Test the shared JSON codec (lambda5/json_codec.py) and the responses built with it"""
+
+    VALUE = {'title': 'Café Engineer', 'skills': ['SQL', 'Python'], 'count': 2, 'remote': None}
+
+    def setUp(self):
+        self.codec = load_lambda_module('lambda5', 'json_codec')
+
+    def test_standard_library_fallback_writes_the_same_text(self):
+        fast = self.codec.dumps(self.VALUE)
+        with patch.object(self.codec, 'orjson', None):
+            fallback = self.codec.dumps(self.VALUE)
+
+        self.assertEqual(fast, fallback)
+        self.assertEqual(self.codec.loads(fast.encode('utf-8')), self.VALUE)
+
+    def test_response_serializes_once_and_passes_encoded_bodies_through(self):
+        headers = {'Content-Type': 'application/json'}
+
+        encoded = self.codec.json_response(200, b'{"stored": true}', headers)
+        built = self.codec.json_response(200, self.VALUE, headers)
+
+        self.assertEqual(encoded['body'], '{"stored": true}')
+        self.assertEqual(json.loads(built['body']), self.VALUE)
+        self.assertIsNot(built['headers'], headers)
+
+    def test_get_resume_json_returns_the_stored_object(self):
+        get_resume_json = load_lambda_module('lambda3', 'get_resume_json_lambda', packaged_with=('lambda5',))
+        get_resume_json.s3_client = FakeS3Client()
+        get_resume_json.table = FakeTable()
+        stored = json.dumps({'name': 'Ada', 'skills': ['Python']}, indent=2)
+        get_resume_json.s3_client.put_object(Bucket=BUCKET, Key='resumes/user-1/r1.json', Body=stored)
+        get_resume_json.table.put_item({'user_id': 'user-1', 'resume_id': 'r1',
+                                        'json_s3_path': f's3://{BUCKET}/resumes/user-1/r1.json'})
+
+        response = get_resume_json.lambda_handler({
+            'httpMethod': 'GET', 'queryStringParameters': {'resumeId': 'r1'},
+            'requestContext': {'authorizer': {'claims': {'sub': 'user-1'}}}
+        }, MagicMock())
+
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(response['body'], stored)
+
+
+if __name__ == '__main__':
+    unittest.main()
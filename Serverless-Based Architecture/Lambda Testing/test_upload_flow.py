@@ -0,0 +1,132 @@
+import unittest
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+from aws_stand_ins import FakeS3Client, FakeTable, load_lambda_module
+
+
+BUCKET = 'resume-analyzer-user-data'
+
+
+def s3_event(key, size):
+    return {'Records': [{'s3': {'bucket': {'name': BUCKET}, 'object': {'key': key, 'size': size}}}]}
+
+
+class TestPresignedUploadFlow(unittest.TestCase):
+    """Test the presigned POST + storage event upload flow against local stand-ins"""
+
+    def setUp(self):
+        self.presign = load_lambda_module('lambda1', 'lambda1_presign_handler')
+        self.process = load_lambda_module('lambda1', 'lambda1_process_upload_handler')
+
+        self.s3 = FakeS3Client()
+        self.table = FakeTable()
+        for module in (self.presign, self.process):
+            module.s3_client = self.s3
+            module.table = self.table
+
+        self.event = {
+            'httpMethod': 'POST',
+            'requestContext': {'authorizer': {'claims': {'sub': 'user-1', 'email': 'user@example.com'}}},
+            'body': json.dumps({
+                'file_name': 'My Resume (final).pdf',
+                'file_size': 2048,
+                'career_field': 'Software Engineering',
+                'experience_level': 'Entry',
+                'preferred_location': 'Boston, MA'
+            })
+        }
+
+    def _request_upload(self):
+        response = self.presign.lambda_handler(self.event, None)
+        self.assertEqual(response['statusCode'], 200)
+        return json.loads(response['body'])['data']
+
+    def test_presign_records_pending_item(self):
+        data = self._request_upload()
+
+        item = self.table.get_item(Key={'user_id': 'user-1', 'resume_id': data['resume_id']})['Item']
+        self.assertEqual(item['status'], 'pending_upload')
+        self.assertEqual(item['pdf_s3_path'], f's3://{BUCKET}/user-1/resume-1/My_Resume__final_.pdf')
+        self.assertGreater(item['upload_expires_at'], time.time())
+        self.assertEqual(data['upload_method'], 'POST')
+        self.assertEqual(data['upload_fields']['key'], 'user-1/resume-1/My_Resume__final_.pdf')
+        self.assertIn(['content-length-range', 1, self.presign.MAX_UPLOAD_BYTES], self.s3.last_post_conditions)
+
+    def test_presign_rejects_oversized_file(self):
+        self.event['body'] = json.dumps({'file_name': 'big.pdf', 'file_size': 11 * 1024 * 1024})
+        response = self.presign.lambda_handler(self.event, None)
+        self.assertEqual(response['statusCode'], 400)
+
+    def test_presign_rejects_missing_or_non_numeric_size(self):
+        for size in (None, 'big', '', -1):
+            self.event['body'] = json.dumps({'file_name': 'resume.pdf', 'file_size': size})
+            response = self.presign.lambda_handler(self.event, None)
+            self.assertEqual(response['statusCode'], 400, size)
+        self.assertEqual(self.table.items, {})
+
+    def test_abandoned_uploads_free_their_slot_and_are_not_listed(self):
+        for _ in range(5):
+            self._request_upload()
+        self.assertEqual(self.presign.lambda_handler(self.event, None)['statusCode'], 500)
+
+        # Nobody uploaded anything and the pending items expired
+        for item in self.table.items.values():
+            item['upload_expires_at'] = int(time.time()) - 1
+        data = self._request_upload()
+        self.assertEqual(data['resume_number'], 1)
+
+        listing = load_lambda_module('lambda2', 'get_user_resumes_lambda', packaged_with=('lambda5',))
+        # Key('user_id').eq(...) is a mock here, so hand the stand-in's rows over directly
+        listing.table = MagicMock()
+        listing.table.query.return_value = self.table.query(
+            KeyConditionExpression=None, ExpressionAttributeValues={':uid': 'user-1'})
+        response = listing.lambda_handler({'requestContext': self.event['requestContext']}, None)
+        resumes = json.loads(response['body'])['resumes']
+        self.assertEqual([resume['resume_id'] for resume in resumes], [data['resume_id']])
+
+        # The new upload claims resume-1 and must not complete an expired item with the same number
+        self.assertEqual(self.process.find_pending_item('user-1', 1)['resume_id'], data['resume_id'])
+
+    def test_valid_upload_is_processed(self):
+        data = self._request_upload()
+        key = 'user-1/resume-1/My_Resume__final_.pdf'
+        self.s3.put_object(Bucket=BUCKET, Key=key, Body=b'%PDF-1.4 fake')
+
+        with patch.object(self.process, 'extract_text_from_pdf', return_value='John Doe resume') as extract, \
+                patch.object(self.process, 'validate_resume_with_claude', return_value=True), \
+                patch.object(self.process, 'trigger_async_processing') as trigger:
+            result = self.process.lambda_handler(s3_event(key, 13), None)
+
+        self.assertEqual(result['processed'][0]['result'], 'uploaded')
+        extract.assert_called_once_with(b'%PDF-1.4 fake', char_budget=self.process.VALIDATION_CHAR_BUDGET)
+        trigger.assert_called_once()
+        item = self.table.get_item(Key={'user_id': 'user-1', 'resume_id': data['resume_id']})['Item']
+        self.assertEqual(item['status'], 'uploaded')
+        self.assertNotIn('upload_expires_at', item)
+
+    def test_invalid_resume_is_rejected_and_deleted(self):
+        data = self._request_upload()
+        key = 'user-1/resume-1/My_Resume__final_.pdf'
+        self.s3.put_object(Bucket=BUCKET, Key=key, Body=b'%PDF-1.4 fake')
+
+        with patch.object(self.process, 'extract_text_from_pdf', return_value='grocery list'), \
+                patch.object(self.process, 'validate_resume_with_claude', return_value=False), \
+                patch.object(self.process, 'trigger_async_processing') as trigger:
+            result = self.process.lambda_handler(s3_event(key, 13), None)
+
+        self.assertEqual(result['processed'][0]['result'], 'rejected')
+        trigger.assert_not_called()
+        self.assertNotIn((BUCKET, key), self.s3.objects)
+        item = self.table.get_item(Key={'user_id': 'user-1', 'resume_id': data['resume_id']})['Item']
+        self.assertEqual(item['status'], 'rejected')
+        self.assertIn('valid resume', item['upload_error'])
+
+    def test_object_without_pending_item_is_ignored(self):
+        result = self.process.lambda_handler(s3_event('user-2/resume-1/resume.pdf', 10), None)
+        self.assertEqual(result['processed'][0]['result'], 'ignored')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -175,6 +175,13 @@ async function loadResumeData(resumeId) {
         console.log('json_s3_path:', metadata.json_s3_path);
         console.log('status:', metadata.status);
         
+        if (metadata.status === 'rejected') {
+            console.error(' Resume upload was rejected:', metadata.upload_error);
+            showError(metadata.upload_error || 'This upload was rejected. Please upload a valid PDF resume.');
+            console.groupEnd();
+            return;
+        }
+
         if (!metadata.json_s3_path || metadata.status !== 'completed') {
             console.error(' Resume analysis not completed');
             showError('Resume analysis not completed yet. Please try again later.');
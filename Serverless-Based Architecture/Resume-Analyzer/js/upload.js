@@ -413,114 +413,97 @@ function initializeUpload() {
             return false;
         }
 
-        console.log(' Reading file as base64...');
-        const reader = new FileReader();
-        
-        reader.onload = async function(e) {
-            console.group(' FILE READ COMPLETE');
-            console.log('File read event:', e);
-            
-            const base64Data = e.target.result.split(',')[1];
-            console.log('Base64 data length:', base64Data.length);
-            console.log('Base64 preview:', base64Data.substring(0, 50) + '...');
-            
-            const requestBody = {
-                file_data: base64Data,
-                file_name: file.name,
-                career_field: careerField.value,
-                experience_level: experienceLevel.value,
-                preferred_location: preferredLocation.value
-            };
-            console.log('Request body prepared:', {
-                file_name: requestBody.file_name,
-                career_field: requestBody.career_field,
-                experience_level: requestBody.experience_level,
-                preferred_location: requestBody.preferred_location,
-                file_data_length: requestBody.file_data.length
-            });
-            
-            uploadProgress.style.display = 'block';
-            uploadBtn.innerHTML = '<i class="fas fa-spinner fa-spin me-2"></i>Analyzing Resume...';
-            uploadBtn.disabled = true;
-            console.log(' UI updated - showing progress');
-
-            simulateProgress();
-            console.log(' Progress simulation started');
-
-            try {
-                const token = localStorage.getItem('idToken');
-                console.log('Token retrieved:', token ? `${token.substring(0, 20)}...` : 'NULL');
-
-                if (!token) {
-                    throw new Error('Not authenticated. Please log in.');
-                }
-
-                const API_ENDPOINT = 'https://q03yktvl4a.execute-api.us-east-1.amazonaws.com/prod/upload';
-                console.log(' API endpoint:', API_ENDPOINT);
-                console.log(' Sending POST request...');
-                console.log('Request headers:', {
-                    'Authorization': `Bearer ${token.substring(0, 20)}...`,
+        const requestBody = {
+            file_name: file.name,
+            file_size: file.size,
+            career_field: careerField.value,
+            experience_level: experienceLevel.value,
+            preferred_location: preferredLocation.value
+        };
+        console.log('Request body prepared:', requestBody);
+
+        uploadProgress.style.display = 'block';
+        uploadBtn.innerHTML = '<i class="fas fa-spinner fa-spin me-2"></i>Analyzing Resume...';
+        uploadBtn.disabled = true;
+        console.log(' UI updated - showing progress');
+
+        simulateProgress();
+        console.log(' Progress simulation started');
+
+        try {
+            const token = localStorage.getItem('idToken');
+            console.log('Token retrieved:', token ? `${token.substring(0, 20)}...` : 'NULL');
+
+            if (!token) {
+                throw new Error('Not authenticated. Please log in.');
+            }
+
+            // Step 1: ask for a presigned upload URL (small JSON request, no file data)
+            const API_ENDPOINT = 'https://q03yktvl4a.execute-api.us-east-1.amazonaws.com/prod/upload-url';
+            console.log(' API endpoint:', API_ENDPOINT);
+
+            const response = await fetch(API_ENDPOINT, {
+                method: 'POST',
+                headers: {
+                    'Authorization': `Bearer ${token}`,
                     'Content-Type': 'application/json'
-                });
-
-                const response = await fetch(API_ENDPOINT, {
-                    method: 'POST',
-                    headers: {
-                        'Authorization': `Bearer ${token}`,
-                        'Content-Type': 'application/json'
-                    },
-                    body: JSON.stringify(requestBody)
-                });
-
-                console.log('Response received');
-                console.log('Response status:', response.status);
-                console.log('Response ok:', response.ok);
-                console.log('Response headers:', Object.fromEntries(response.headers.entries()));
-
-                if (!response.ok) {
-                    const errorText = await response.text();
-                    console.error(' Response not OK:', errorText);
-                    throw new Error(`Upload failed: ${response.status} ${response.statusText}`);
-                }
-
-                const data = await response.json();
-                console.log(' Response data:', data);
-
-                progressBar.style.width = '100%';
-                progressText.textContent = 'Upload complete!';
-                console.log(' Progress bar complete');
-
-                setTimeout(() => {
-                    console.log(' Redirecting to parsed resume page');
-                    const redirectUrl = `parsed-resume.html?id=${data.data.resume_id}`;
-                    console.log('Redirect URL:', redirectUrl);
-                    window.location.href = redirectUrl;
-                }, 1000);
-
-            } catch (error) {
-                console.error(' ERROR IN UPLOAD:', error);
-                console.error('Error stack:', error.stack);
-                
-                progressBar.style.width = '100%';
-                progressBar.classList.remove('bg-primary');
-                progressBar.classList.add('bg-danger');
-                progressText.textContent = 'Upload failed: ' + error.message;
-                console.log(' Error displayed to user');
-
-                uploadBtn.innerHTML = '<i class="fas fa-cloud-upload-alt me-2"></i>Upload Resume';
-                uploadBtn.disabled = false;
-                console.log(' Button reset');
+                },
+                body: JSON.stringify(requestBody)
+            });
+
+            console.log('Response status:', response.status);
+
+            if (!response.ok) {
+                const errorText = await response.text();
+                console.error(' Response not OK:', errorText);
+                throw new Error(`Upload failed: ${response.status} ${response.statusText}`);
             }
-            
-            console.groupEnd();
-        };
 
-        reader.onerror = function(error) {
-            console.error(' FILE READ ERROR:', error);
-        };
+            const data = await response.json();
+            console.log(' Response data:', data);
+
+            // Step 2: send the PDF straight to S3; validation runs from the storage event.
+            // The signed form fields go first and the file last, as S3 requires.
+            console.log(' Uploading file directly to storage...');
+            const uploadForm = new FormData();
+            Object.entries(data.data.upload_fields).forEach(([name, value]) => uploadForm.append(name, value));
+            uploadForm.append('file', file);
+            const uploadResponse = await fetch(data.data.upload_url, {
+                method: data.data.upload_method,
+                body: uploadForm
+            });
+
+            if (!uploadResponse.ok) {
+                console.error(' Storage upload failed:', uploadResponse.status);
+                throw new Error(`Upload failed: ${uploadResponse.status} ${uploadResponse.statusText}`);
+            }
+
+            progressBar.style.width = '100%';
+            progressText.textContent = 'Upload complete!';
+            console.log(' Progress bar complete');
+
+            setTimeout(() => {
+                console.log(' Redirecting to parsed resume page');
+                const redirectUrl = `parsed-resume.html?id=${data.data.resume_id}`;
+                console.log('Redirect URL:', redirectUrl);
+                window.location.href = redirectUrl;
+            }, 1000);
+
+        } catch (error) {
+            console.error(' ERROR IN UPLOAD:', error);
+            console.error('Error stack:', error.stack);
+
+            progressBar.style.width = '100%';
+            progressBar.classList.remove('bg-primary');
+            progressBar.classList.add('bg-danger');
+            progressText.textContent = 'Upload failed: ' + error.message;
+            console.log(' Error displayed to user');
+
+            uploadBtn.innerHTML = '<i class="fas fa-cloud-upload-alt me-2"></i>Upload Resume';
+            uploadBtn.disabled = false;
+            console.log(' Button reset');
+        }
 
-        reader.readAsDataURL(file);
-        console.log(' Started reading file as data URL');
         console.groupEnd();
         return false;
     });